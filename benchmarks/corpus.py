@@ -0,0 +1,255 @@
+"""
+시드 고정 한국어 레시피 데이터 생성기
+
+실제 공공 레시피 CSV와 비슷한 형식이 섞이도록 생성한다.
+- 요리 이름: 수식어 + 주재료 + 요리 종류 (일부 이름 중복)
+- 재료: "[재료] 돼지고기 300g| 김치 1/4포기 [양념] 소금 약간" 형식
+- 조리시간/인분: "30분이내", "2시간이상", "1시간 30분", "6인분이상", 빈 값 등
+"""
+
+import random
+
+MODIFIERS = [
+    "",
+    "",
+    "",
+    "매콤한",
+    "초간단",
+    "얼큰한",
+    "달콤한",
+    "바삭한",
+    "건강한",
+    "엄마표",
+    "자취생",
+    "백종원",
+    "고소한",
+    "담백한",
+    "10분",
+    "다이어트",
+]
+MAIN_INGREDIENTS = [
+    "김치",
+    "돼지고기",
+    "소고기",
+    "닭고기",
+    "계란",
+    "두부",
+    "감자",
+    "고구마",
+    "애호박",
+    "양배추",
+    "버섯",
+    "어묵",
+    "참치",
+    "스팸",
+    "새우",
+    "오징어",
+    "고등어",
+    "콩나물",
+    "시금치",
+    "떡",
+    "당면",
+    "베이컨",
+    "치즈",
+    "명란",
+]
+DISHES = [
+    "찌개",
+    "볶음",
+    "볶음밥",
+    "국",
+    "조림",
+    "전",
+    "무침",
+    "덮밥",
+    "샐러드",
+    "찜",
+    "구이",
+    "튀김",
+    "파스타",
+    "김밥",
+    "떡볶이",
+    "말이",
+    "전골",
+    "죽",
+]
+SUB_INGREDIENTS = [
+    "양파",
+    "대파",
+    "마늘",
+    "당근",
+    "청양고추",
+    "홍고추",
+    "깻잎",
+    "부추",
+    "쪽파",
+    "밥",
+    "우유",
+    "버터",
+    "설탕",
+    "참기름",
+    "들기름",
+    "간장",
+    "고추장",
+    "된장",
+    "고춧가루",
+    "굴소스",
+    "식초",
+    "물엿",
+    "후추",
+    "소금",
+    "깨소금",
+    "식용유",
+    "물",
+    "멸치육수",
+]
+QUANTITIES = [
+    "1개",
+    "2개",
+    "1/2개",
+    "100g",
+    "200g",
+    "300g",
+    "1/4포기",
+    "1모",
+    "1/2모",
+    "1큰술",
+    "2큰술",
+    "1/2큰술",
+    "1작은술",
+    "약간",
+    "조금",
+    "1컵",
+    "200ml",
+    "500ml",
+    "한줌",
+    "2쪽",
+    "1대",
+    "",
+]
+TIMES = [
+    "5분이내",
+    "10분이내",
+    "15분이내",
+    "20분이내",
+    "30분이내",
+    "60분이내",
+    "90분이내",
+    "2시간이내",
+    "2시간이상",
+    "1시간 30분",
+    "40분",
+    "25",
+    "",
+    None,
+]
+TIME_WEIGHTS = [4, 12, 12, 10, 20, 14, 5, 4, 2, 3, 3, 2, 5, 4]
+SERVINGS = ["1인분", "2인분", "3인분", "4인분", "5인분", "6인분이상", "2", "", None]
+SERVING_WEIGHTS = [12, 30, 14, 22, 4, 6, 2, 5, 5]
+INSTRUCTIONS_RATIO = 0.2
+IMAGE_RATIO = 0.7
+DUPLICATE_NAME_RATIO = 0.1
+
+
+def _ingredients(rng, main):
+    """'|'로 구분된 재료 문자열 (가끔 [양념] 구분 표시 포함)"""
+    items = [f"{main} {rng.choice(QUANTITIES)}".strip()]
+    items += [
+        f"{name} {rng.choice(QUANTITIES)}".strip()
+        for name in rng.sample(SUB_INGREDIENTS, rng.randint(3, 9))
+    ]
+    if len(items) > 4 and rng.random() < 0.4:
+        split = rng.randint(2, len(items) - 1)
+        return (
+            "[재료] " + "| ".join(items[:split]) + " [양념] " + "| ".join(items[split:])
+        )
+    return "[재료] " + "| ".join(items)
+
+
+def _instructions(rng, main, dish):
+    steps = [
+        f"{main}을(를) 먹기 좋은 크기로 손질합니다.",
+        "양념 재료를 한데 섞어 양념장을 만듭니다.",
+        f"팬에 기름을 두르고 {main}을(를) 익힙니다.",
+        "양념장을 넣고 중불에서 골고루 섞어줍니다.",
+        f"그릇에 담아 {dish}을(를) 완성합니다.",
+    ]
+    return "\n".join(f"{i}. {step}" for i, step in enumerate(steps, 1))
+
+
+def generate_rows(count, seed=42):
+    """
+    레시피 행(dict)을 count개 생성 (같은 seed면 항상 같은 결과)
+    - 메모리를 아끼기 위해 제너레이터로 반환
+    """
+    rng = random.Random(seed)
+    names = []
+    for index in range(count):
+        main = rng.choice(MAIN_INGREDIENTS)
+        dish = rng.choice(DISHES)
+        if names and rng.random() < DUPLICATE_NAME_RATIO:
+            name = rng.choice(names)
+        else:
+            name = " ".join(
+                part for part in (rng.choice(MODIFIERS), f"{main}{dish}") if part
+            )
+            if rng.random() < 0.3:
+                name = f"{name} {index}"  # 같은 요리의 변형 레시피
+            if len(names) < 10000:
+                names.append(name)
+
+        yield {
+            "CKG_NM": name,
+            "CKG_MTRL_CN": _ingredients(rng, main),
+            "CKG_TIME_NM": rng.choices(TIMES, TIME_WEIGHTS)[0],
+            "CKG_INBUN_NM": rng.choices(SERVINGS, SERVING_WEIGHTS)[0],
+            "RCP_IMG_URL": (
+                f"https://example.com/recipes/{index}.jpg"
+                if rng.random() < IMAGE_RATIO
+                else ""
+            ),
+            "CKG_METHOD_CN": (
+                _instructions(rng, main, dish)
+                if rng.random() < INSTRUCTIONS_RATIO
+                else None
+            ),
+        }
+
+
+def _save_batch(recipes):
+    from django.db.models import Max
+
+    from recipe.indexing import index_recipes
+    from recipe.models import Recipe
+
+    for recipe in recipes:
+        recipe.normalize_fields()
+    last_id = Recipe.objects.aggregate(last=Max("id"))["last"] or 0
+    Recipe.objects.bulk_create(recipes)
+
+    # MySQL은 bulk_create 후 PK를 돌려주지 않음 - 적재 중 다른 쓰기가 없으므로 순서대로 매칭
+    if recipes[0].pk is None:
+        ids = Recipe.objects.filter(id__gt=last_id).order_by("id")
+        for recipe, recipe_id in zip(recipes, ids.values_list("id", flat=True)):
+            recipe.pk = recipe_id
+    index_recipes(recipes)
+
+
+def load_corpus(count, seed=42, batch_size=5000, log=print):
+    """생성한 레시피를 배치로 저장하고 검색 색인까지 생성 - 저장한 수 반환"""
+    from recipe.models import Recipe
+
+    batch = []
+    total = 0
+    for row in generate_rows(count, seed):
+        batch.append(Recipe(**row))
+        if len(batch) >= batch_size:
+            _save_batch(batch)
+            total += len(batch)
+            batch = []
+            log(f"{total}/{count}개 레시피 적재")
+
+    if batch:
+        _save_batch(batch)
+        total += len(batch)
+    return total
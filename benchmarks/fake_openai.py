@@ -0,0 +1,276 @@
+"""
+로컬 가짜 OpenAI 호환 서버 (부하 테스트용, 외부 네트워크 불필요)
+
+    python -m benchmarks.fake_openai --port 8001 --latency lognormal:0.8:0.4 --error-rate 0.02
+    OPENAI_BASE_URL=http://127.0.0.1:8001/v1 python manage.py runserver
+
+- POST /v1/chat/completions: 일반/스트리밍(stream=true, SSE) 응답
+- 응답 내용은 프롬프트에 맞는 레시피 형식 (benchmarks.replies)
+- 지연 시간 분포, 스트리밍 토큰 간격, 오류(5xx)/요청 한도(429) 비율 설정 가능
+"""
+
+import argparse
+import math
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .replies import canned_reply, split_tokens
+
+
+def parse_latency(spec):
+    """
+    지연 시간 분포 문자열을 샘플러로 변환 (초 단위)
+    - "0.5": 고정, "uniform:0.2:1.5", "normal:0.8:0.2", "lognormal:0.8:0.4" (평균, 표준편차)
+    """
+    kind, _, params = spec.partition(":")
+    if not params:
+        value = float(kind)
+        return lambda rng: value
+
+    values = [float(value) for value in params.split(":")]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        # 평균/표준편차가 주어진 값이 되도록 로그 공간 파라미터 계산
+        mean, stddev = values
+        sigma2 = math.log(1 + (stddev / mean) ** 2)
+        mu = math.log(mean) - sigma2 / 2
+        return lambda rng: rng.lognormvariate(mu, sigma2**0.5)
+    raise ValueError(f"알 수 없는 지연 시간 분포: {spec}")
+
+
+class FakeOpenAIState:
+    """서버 설정과 요청 통계 (여러 요청 스레드에서 공유)"""
+
+    def __init__(self, latency, token_delay, error_rate, rate_limit_rate, seed):
+        self.latency = latency
+        self.token_delay = token_delay
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "streams": 0, "errors": 0, "rate_limited": 0}
+
+    def draw(self):
+        """이번 요청의 (지연 시간, 결과 종류: ok/error/rate_limit)"""
+        with self.lock:
+            self.stats["requests"] += 1
+            delay = self.latency(self.rng)
+            roll = self.rng.random()
+            if roll < self.rate_limit_rate:
+                self.stats["rate_limited"] += 1
+                return delay, "rate_limit"
+            if roll < self.rate_limit_rate + self.error_rate:
+                self.stats["errors"] += 1
+                return delay, "error"
+            return delay, "ok"
+
+    def count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "FakeOpenAI/1.0"
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/") in ("/v1/models", "/models"):
+            self._send_json(
+                200, {"object": "list", "data": [{"id": "fake", "object": "model"}]}
+            )
+        elif self.path.rstrip("/") == "/stats":
+            with self.state.lock:
+                self._send_json(200, dict(self.state.stats))
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "invalid json"}})
+            return
+
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+
+        delay, outcome = self.state.draw()
+        time.sleep(delay)
+        if outcome == "rate_limit":
+            self._send_json(
+                429,
+                {"error": {"message": "Rate limit reached", "type": "requests"}},
+                headers={"Retry-After": "1"},
+            )
+            return
+        if outcome == "error":
+            self._send_json(
+                500, {"error": {"message": "Internal error", "type": "server_error"}}
+            )
+            return
+
+        messages = request.get("messages") or [{"content": ""}]
+        params = {
+            key: value
+            for key, value in request.items()
+            if key not in ("messages", "model", "stream")
+        }
+        content = canned_reply(messages, params)
+        model = request.get("model", "fake")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+
+        if request.get("stream"):
+            self.state.count("streams")
+            self._stream(completion_id, model, content)
+            return
+
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 2
+        completion_tokens = len(split_tokens(content))
+        self._send_json(
+            200,
+            {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            },
+        )
+
+    def _stream(self, completion_id, model, content):
+        """SSE 스트리밍 응답 (chunked 전송, 토큰마다 token_delay 간격)"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def chunk(delta, finish_reason=None):
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                ],
+            }
+            return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+        def write(text):
+            data = text.encode("utf-8")
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        try:
+            write(chunk({"role": "assistant", "content": ""}))
+            for token in split_tokens(content):
+                time.sleep(self.state.token_delay)
+                write(chunk({"content": token}))
+            write(chunk({}, finish_reason="stop"))
+            write("data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # 클라이언트가 스트림 도중 연결을 끊음
+            pass
+
+
+def create_server(
+    host="127.0.0.1",
+    port=8001,
+    latency="0.5",
+    token_delay=0.02,
+    error_rate=0.0,
+    rate_limit_rate=0.0,
+    seed=None,
+    verbose=False,
+):
+    """가짜 OpenAI 서버 생성 (serve_forever는 호출 측에서 실행)"""
+    server = ThreadingHTTPServer((host, port), FakeOpenAIHandler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    server.state = FakeOpenAIState(
+        parse_latency(latency), token_delay, error_rate, rate_limit_rate, seed
+    )
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 가짜 OpenAI 호환 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument(
+        "--latency",
+        default="0.5",
+        help="응답 지연 분포 (초): 0.5 | uniform:a:b | normal:평균:표준편차 | lognormal:평균:표준편차",
+    )
+    parser.add_argument(
+        "--token-delay", type=float, default=0.02, help="스트리밍 토큰 간격 (초)"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 비율")
+    parser.add_argument(
+        "--rate-limit-rate", type=float, default=0.0, help="429 응답 비율"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--verbose", action="store_true", help="요청 로그 출력")
+    args = parser.parse_args(argv)
+
+    server = create_server(
+        args.host,
+        args.port,
+        args.latency,
+        args.token_delay,
+        args.error_rate,
+        args.rate_limit_rate,
+        args.seed,
+        args.verbose,
+    )
+    print(f"가짜 OpenAI 서버: http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+동시 접속 부하 생성기 (asyncio + httpx)
+
+    python -m benchmarks.fake_openai --port 8001 &
+    OPENAI_BASE_URL=http://127.0.0.1:8001/v1 python manage.py runserver 8000 &
+    python -m benchmarks.loadgen --base-url http://127.0.0.1:8000 --rps 50 --duration 60 \\
+        --mix chatbot=4,recommend=3,detail=2,instructions=1 --recipe-ids 1-10000
+
+- 목표 RPS로 요청을 일정 간격으로 보냄 (응답을 기다리지 않는 open-loop)
+- 지연 시간은 예정된 전송 시각부터 측정 (서버가 밀려 대기한 시간 포함)
+- 요청 종류별/전체 p50/p95/p99, 처리량, 오류율을 JSON으로 출력
+- runserver, WSGI(gunicorn), ASGI(uvicorn) 어느 서버에도 사용 가능
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from .run import CHAT_MESSAGES, SERVING_SIZES, TIME_FILTERS, percentile
+
+REQUEST_KINDS = (
+    "chatbot",
+    "recommend",
+    "detail",
+    "instructions",
+    "instructions_stream",
+)
+
+
+def parse_mix(value):
+    """'chatbot=4,recommend=3' 형식을 {종류: 가중치}로 변환"""
+    mix = {}
+    for part in value.split(","):
+        kind, _, weight = part.strip().partition("=")
+        if kind not in REQUEST_KINDS:
+            raise argparse.ArgumentTypeError(f"알 수 없는 요청 종류: {kind}")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def parse_id_range(value):
+    low, _, high = value.partition("-")
+    return int(low), int(high or low)
+
+
+def build_request(kind, rng, args):
+    """요청 종류별 (method, path, params, json) 생성"""
+    if kind == "chatbot":
+        body = {
+            "message": rng.choice(CHAT_MESSAGES),
+            "session_id": f"load-{rng.randint(1, args.sessions)}",
+            "time_filters": rng.sample(TIME_FILTERS, rng.randint(0, 1)),
+            "serving_size": rng.choice(SERVING_SIZES),
+        }
+        return "POST", "/api/chatbot/message/", None, body
+    if kind == "recommend":
+        params = [
+            ("time_filters", value)
+            for value in rng.sample(TIME_FILTERS, rng.randint(0, 2))
+        ]
+        serving_size = rng.choice(SERVING_SIZES)
+        if serving_size:
+            params.append(("serving_size", serving_size))
+        return "GET", "/api/recipes/recommend/", params, None
+
+    recipe_id = rng.randint(*args.recipe_ids)
+    if kind == "detail":
+        return "GET", f"/api/recipes/{recipe_id}/", None, None
+    if kind == "instructions":
+        return "GET", f"/api/recipes/generate-instructions/{recipe_id}/", None, None
+    return (
+        "GET",
+        f"/api/recipes/generate-instructions/{recipe_id}/stream/",
+        None,
+        None,
+    )
+
+
+async def send(client, kind, request, scheduled):
+    """요청 1건 전송 - 결과 dict (지연 시간은 예정 시각 기준, 스트림은 첫 바이트 시간 포함)"""
+    method, path, params, body = request
+    result = {"kind": kind, "status": None, "error": None, "ttfb": None}
+    try:
+        async with client.stream(method, path, params=params, json=body) as response:
+            async for _ in response.aiter_bytes():
+                if result["ttfb"] is None:
+                    result["ttfb"] = time.perf_counter() - scheduled
+            result["status"] = response.status_code
+    except httpx.HTTPError as e:
+        result["error"] = type(e).__name__
+    result["latency"] = time.perf_counter() - scheduled
+    return result
+
+
+async def run_load(args):
+    rng = random.Random(args.seed)
+    kinds = list(args.mix)
+    weights = [args.mix[kind] for kind in kinds]
+    total = int(args.rps * args.duration)
+    interval = 1.0 / args.rps
+
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout, limits=limits
+    ) as client:
+        started = time.perf_counter()
+        tasks = []
+        for index in range(total):
+            scheduled = started + index * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            kind = rng.choices(kinds, weights)[0]
+            request = build_request(kind, rng, args)
+            tasks.append(asyncio.create_task(send(client, kind, request, scheduled)))
+        results = await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    return results, elapsed
+
+
+def summarize(results, elapsed):
+    """요청 결과 목록을 지연 시간 백분위수/처리량/오류율로 요약"""
+    latencies = [r["latency"] * 1000 for r in results]
+    errors = [r for r in results if r["error"] or r["status"] >= 400]
+    statuses = {}
+    for r in results:
+        key = str(r["status"]) if r["status"] is not None else r["error"]
+        statuses[key] = statuses.get(key, 0) + 1
+
+    summary = {
+        "requests": len(results),
+        "errors": len(errors),
+        "error_rate": round(len(errors) / len(results), 4) if results else 0.0,
+        "throughput_rps": round((len(results) - len(errors)) / elapsed, 2),
+        "status_codes": statuses,
+    }
+    if latencies:
+        summary["latency_ms"] = {
+            "mean": round(statistics.mean(latencies), 1),
+            "p50": round(percentile(latencies, 50), 1),
+            "p95": round(percentile(latencies, 95), 1),
+            "p99": round(percentile(latencies, 99), 1),
+            "max": round(max(latencies), 1),
+        }
+    ttfbs = [r["ttfb"] * 1000 for r in results if r["ttfb"] is not None]
+    if ttfbs and any(r["kind"] == "instructions_stream" for r in results):
+        summary["ttfb_ms"] = {
+            "p50": round(percentile(ttfbs, 50), 1),
+            "p95": round(percentile(ttfbs, 95), 1),
+            "p99": round(percentile(ttfbs, 99), 1),
+        }
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recipick API 부하 테스트")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rps", type=float, default=20, help="목표 초당 요청 수")
+    parser.add_argument("--duration", type=float, default=30, help="부하 시간 (초)")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=parse_mix("chatbot=4,recommend=3,detail=2,instructions=1"),
+        help=f"요청 종류별 가중치 ({', '.join(REQUEST_KINDS)})",
+    )
+    parser.add_argument(
+        "--recipe-ids",
+        type=parse_id_range,
+        default=(1, 1000),
+        help="상세/조리 방법 요청에 사용할 레시피 id 범위 (예: 1-10000)",
+    )
+    parser.add_argument("--sessions", type=int, default=200, help="챗봇 세션 수")
+    parser.add_argument(
+        "--concurrency", type=int, default=200, help="최대 동시 연결 수"
+    )
+    parser.add_argument("--timeout", type=float, default=60, help="요청 타임아웃 (초)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과 JSON 파일 (없으면 표준 출력)")
+    args = parser.parse_args(argv)
+
+    print(
+        f"{args.base_url}에 {args.rps}rps로 {args.duration}초 동안 요청 중...",
+        file=sys.stderr,
+    )
+    results, elapsed = asyncio.run(run_load(args))
+
+    report = {
+        "meta": {
+            "base_url": args.base_url,
+            "target_rps": args.rps,
+            "duration": args.duration,
+            "elapsed": round(elapsed, 2),
+            "mix": args.mix,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "overall": summarize(results, elapsed),
+        "by_kind": {
+            kind: summarize([r for r in results if r["kind"] == kind], elapsed)
+            for kind in args.mix
+            if any(r["kind"] == kind for r in results)
+        },
+    }
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+        print(f"결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
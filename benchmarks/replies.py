@@ -0,0 +1,47 @@
+"""형식에 맞는 가짜 LLM 응답 (LLM 스텁과 가짜 OpenAI 서버가 공유, Django 의존 없음)"""
+
+import itertools
+import json
+import re
+
+BATCH_COUNT_PATTERN = re.compile(r"(\d+)개 생성")
+
+_counter = itertools.count(1)
+
+
+def canned_reply(messages, params):
+    """요청 메시지/파라미터에 맞는 응답 텍스트 (레시피 형식, 일괄 JSON, 숫자, 조리 방법)"""
+    prompt = messages[-1]["content"]
+    if params.get("response_format", {}).get("type") == "json_object":
+        match = BATCH_COUNT_PATTERN.search(prompt)
+        count = int(match.group(1)) if match else 1
+        return json.dumps(
+            {
+                "recipes": [
+                    {
+                        "CKG_NM": f"벤치마크 생성 레시피 {next(_counter)}",
+                        "CKG_MTRL_CN": "감자 2개| 양파 1개| 소금 약간",
+                        "CKG_INBUN_NM": "2인분",
+                        "CKG_TIME_NM": "20분",
+                        "CKG_METHOD_CN": "1. 감자를 썬다.\n2. 볶는다.",
+                    }
+                    for _ in range(count)
+                ]
+            },
+            ensure_ascii=False,
+        )
+    if "CKG_NM:" in prompt:
+        return (
+            f"CKG_NM: 벤치마크 생성 레시피 {next(_counter)}\n"
+            "CKG_MTRL_CN: 감자 2개| 양파 1개\n"
+            "CKG_INBUN_NM: 2인분\n"
+            "CKG_TIME_NM: 20분"
+        )
+    if "숫자로" in prompt:
+        return "2"
+    return "1. 재료를 손질합니다.\n2. 팬에 볶습니다.\n3. 그릇에 담습니다."
+
+
+def split_tokens(text):
+    """스트리밍 응답용으로 텍스트를 단어(뒤 공백 포함) 단위 조각으로 분리"""
+    return re.findall(r"\S+\s*|\s+", text)
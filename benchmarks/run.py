@@ -0,0 +1,297 @@
+"""
+레시피/챗봇 API 데이터 규모별 벤치마크
+
+    python -m benchmarks.run --scale 10k
+    python -m benchmarks.run --scale 100k --iterations 50 --output results.json
+
+- 시드 고정 합성 데이터(10k/100k/1m)를 적재한 DB에서 측정 (규모/시드별 SQLite 파일 재사용)
+- LLM은 스텁으로 대체 (--llm-delay로 호출 지연 흉내)
+- 엔드포인트별 지연 시간, 요청당 SQL 쿼리 수, 최대 메모리 사용량을 JSON으로 출력
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+ENDPOINTS = ("recommend", "filter", "detail", "chatbot")
+
+TIME_FILTERS = ["5분 이내", "5~15분", "15~30분", "30분 이상"]
+SERVING_SIZES = ["1인분", "2인분", "4인분", "6인분 이상", None]
+CHAT_MESSAGES = [
+    "김치찌개 먹고 싶어",
+    "감자로 만들 수 있는 요리 추천해줘",
+    "매콤한 돼지고기 볶음",
+    "계란 두부",
+    "초간단 자취생 요리",
+    "다이어트 샐러드",
+    "떡볶이",
+    "버섯 참치 덮밥",
+]
+
+
+def parse_scale(value):
+    """'10k', '1m', '5000' 형식의 규모를 정수로 변환"""
+    value = value.lower()
+    if value in SCALES:
+        return SCALES[value]
+    if value.endswith("k"):
+        return int(value[:-1]) * 1000
+    if value.endswith("m"):
+        return int(value[:-1]) * 1_000_000
+    return int(value)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="레시피/챗봇 API 벤치마크")
+    parser.add_argument("--scale", default="10k", help="레시피 수 (10k, 100k, 1m 등)")
+    parser.add_argument("--seed", type=int, default=42, help="데이터/요청 생성 시드")
+    parser.add_argument(
+        "--iterations", type=int, default=30, help="엔드포인트별 측정 횟수"
+    )
+    parser.add_argument("--warmup", type=int, default=3, help="측정 전 예열 횟수")
+    parser.add_argument(
+        "--memory-iterations", type=int, default=5, help="메모리 측정 횟수"
+    )
+    parser.add_argument(
+        "--endpoints",
+        default=",".join(ENDPOINTS),
+        help=f"측정할 엔드포인트 (쉼표 구분, {', '.join(ENDPOINTS)})",
+    )
+    parser.add_argument(
+        "--llm-delay", type=float, default=0.0, help="LLM 스텁 호출당 지연 (초)"
+    )
+    parser.add_argument(
+        "--rebuild", action="store_true", help="기존 벤치마크 DB를 지우고 다시 적재"
+    )
+    parser.add_argument("--output", help="결과 JSON 파일 (없으면 표준 출력)")
+    return parser.parse_args(argv)
+
+
+def configure(args, rows):
+    """Django 설정 선택 및 벤치마크 DB 경로 지정 (django.setup 전에 호출)"""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+    if "BENCHMARK_DB_PATH" not in os.environ:
+        cache_dir = BASE_DIR / ".cache"
+        cache_dir.mkdir(exist_ok=True)
+        os.environ["BENCHMARK_DB_PATH"] = str(
+            cache_dir / f"benchmark-{rows}-{args.seed}.sqlite3"
+        )
+
+    db_path = Path(os.environ["BENCHMARK_DB_PATH"])
+    if args.rebuild and os.getenv("BENCHMARK_USE_CONFIGURED_DB") != "1":
+        db_path.unlink(missing_ok=True)
+    return db_path.with_suffix(".json")
+
+
+def prepare_corpus(rows, seed, meta_path, log):
+    """적재된 데이터가 같은 규모/시드가 아니면 새로 적재"""
+    from django.core.management import call_command
+
+    from benchmarks.corpus import load_corpus
+    from recipe.models import Recipe
+
+    call_command("migrate", run_syncdb=True, verbosity=0)
+
+    expected = {"rows": rows, "seed": seed}
+    if meta_path.exists() and json.loads(meta_path.read_text()) == expected:
+        if Recipe.objects.exists():
+            return 0.0
+
+    if Recipe.objects.exists():
+        raise SystemExit(
+            "벤치마크 DB에 다른 데이터가 있습니다. --rebuild 옵션으로 다시 적재하세요."
+        )
+
+    started = time.perf_counter()
+    load_corpus(rows, seed, log=log)
+    meta_path.write_text(json.dumps(expected))
+    return time.perf_counter() - started
+
+
+def build_requests(name, rng, recipe_ids):
+    """엔드포인트별 요청 생성 함수 - 호출할 때마다 (method, path, data) 반환"""
+
+    def recommend():
+        params = [
+            ("time_filters", value)
+            for value in rng.sample(TIME_FILTERS, rng.randint(0, 2))
+        ]
+        serving_size = rng.choice(SERVING_SIZES)
+        if serving_size:
+            params.append(("serving_size", serving_size))
+        return "get", "/api/recipes/recommend/", params
+
+    def filter_():
+        low = rng.choice([5, 10, 15, 30])
+        params = {"cook_time": f"{low}-{low * 2}", "servings": rng.choice([1, 2, 4])}
+        return "get", "/api/recipes/filter/", params
+
+    def detail():
+        return "get", f"/api/recipes/{rng.choice(recipe_ids)}/", None
+
+    def chatbot():
+        data = {
+            "message": rng.choice(CHAT_MESSAGES),
+            "session_id": f"bench-{rng.randint(1, 50)}",
+            "time_filters": rng.sample(TIME_FILTERS, rng.randint(0, 1)),
+            "serving_size": rng.choice(SERVING_SIZES),
+        }
+        return "post", "/api/chatbot/message/", data
+
+    return {
+        "recommend": recommend,
+        "filter": filter_,
+        "detail": detail,
+        "chatbot": chatbot,
+    }[name]
+
+
+def send(client, method, path, data):
+    if method == "post":
+        return client.post(path, data, content_type="application/json")
+    return client.get(path, data)
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def measure(name, client, make_request, args):
+    """지연 시간/쿼리 수 측정 후 tracemalloc으로 요청당 최대 메모리 측정"""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    for _ in range(args.warmup):
+        send(client, *make_request())
+
+    latencies = []
+    queries = []
+    statuses = {}
+    for _ in range(args.iterations):
+        request = make_request()
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = send(client, *request)
+            if getattr(response, "streaming", False):
+                b"".join(response.streaming_content)
+            latencies.append((time.perf_counter() - started) * 1000)
+        queries.append(len(captured.captured_queries))
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(args.memory_iterations):
+            request = make_request()
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            send(client, *request)
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "iterations": args.iterations,
+        "status_codes": {str(code): count for code, count in statuses.items()},
+        "latency_ms": {
+            "mean": round(statistics.mean(latencies), 3),
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "min": round(min(latencies), 3),
+            "max": round(max(latencies), 3),
+        },
+        "queries": {
+            "mean": round(statistics.mean(queries), 2),
+            "max": max(queries),
+        },
+        "peak_memory_kb": round(max(peaks) / 1024, 1) if peaks else None,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BASE_DIR,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    rows = parse_scale(args.scale)
+    endpoints = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    unknown = set(endpoints) - set(ENDPOINTS)
+    if unknown:
+        raise SystemExit(f"알 수 없는 엔드포인트: {', '.join(sorted(unknown))}")
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    meta_path = configure(args, rows)
+
+    import django
+
+    django.setup()
+
+    from django.db import connection
+    from django.test import Client
+
+    from benchmarks.stubs import stub_llm
+    from recipe.models import Recipe
+
+    load_seconds = prepare_corpus(rows, args.seed, meta_path, log)
+    recipe_ids = list(Recipe.objects.order_by("id").values_list("id", flat=True)[:rows])
+
+    rng = random.Random(args.seed)
+    # 오류가 난 요청도 상태 코드(500)로 기록
+    client = Client(raise_request_exception=False)
+    results = {}
+    with stub_llm(delay=args.llm_delay):
+        for name in endpoints:
+            log(f"{name} 측정 중...")
+            results[name] = measure(
+                name, client, build_requests(name, rng, recipe_ids), args
+            )
+
+    report = {
+        "meta": {
+            "scale": rows,
+            "seed": args.seed,
+            "corpus_rows": Recipe.objects.count(),
+            "corpus_load_seconds": round(load_seconds, 2),
+            "database": connection.vendor,
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "llm_delay": args.llm_delay,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+        log(f"결과 저장: {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+레시피 목록 직렬화 벤치마크 (행당 비용)
+
+    python -m benchmarks.serialization --scale 10k
+    python -m benchmarks.serialization --scale 100k --batch-size 500 --batches 20
+
+- 기존 방식: 전체 컬럼 조회(in_bulk) + RecipeListSerializer
+- 빠른 경로: 목록 컬럼만 .values()로 조회 + 항목 dict 직접 생성
+- 조회+직렬화, 직렬화만 각각 행당 마이크로초로 출력하고 두 방식의 결과가 같은지 확인
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.run import configure, git_commit, parse_scale, prepare_corpus
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="레시피 목록 직렬화 벤치마크")
+    parser.add_argument("--scale", default="10k", help="레시피 수 (10k, 100k, 1m 등)")
+    parser.add_argument("--seed", type=int, default=42, help="데이터/표본 생성 시드")
+    parser.add_argument(
+        "--batch-size", type=int, default=200, help="한 번에 직렬화할 레시피 수"
+    )
+    parser.add_argument("--batches", type=int, default=20, help="측정 횟수")
+    parser.add_argument(
+        "--rebuild", action="store_true", help="기존 벤치마크 DB를 지우고 다시 적재"
+    )
+    parser.add_argument("--output", help="결과 JSON 파일 (없으면 표준 출력)")
+    return parser.parse_args(argv)
+
+
+def per_row_us(func, batches, batch_size):
+    """배치마다 func(ids) 실행 시간을 재서 행당 마이크로초 (중앙값, 최소값)"""
+    samples = []
+    for ids in batches:
+        started = time.perf_counter()
+        func(ids)
+        samples.append((time.perf_counter() - started) * 1e6 / batch_size)
+    return {
+        "median": round(statistics.median(samples), 2),
+        "min": round(min(samples), 2),
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    rows = parse_scale(args.scale)
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    meta_path = configure(args, rows)
+
+    import django
+
+    django.setup()
+
+    from django.db import connection
+
+    from recipe.listing import LIST_FIELDS, _build_item, list_items_for_ids
+    from recipe.models import Recipe
+    from recipe.serializers import RecipeListSerializer
+
+    prepare_corpus(rows, args.seed, meta_path, log)
+    recipe_ids = list(Recipe.objects.values_list("id", flat=True))
+    batch_size = min(args.batch_size, len(recipe_ids))
+    rng = random.Random(args.seed)
+    batches = [rng.sample(recipe_ids, batch_size) for _ in range(args.batches)]
+
+    def serializer_path(ids):
+        recipes = Recipe.objects.in_bulk(ids)
+        return RecipeListSerializer(
+            [recipes[recipe_id] for recipe_id in ids], many=True
+        ).data
+
+    # 결과가 같은지 확인 (순서, 필드, 값 모두)
+    schema_match = all(
+        json.dumps(serializer_path(ids)) == json.dumps(list_items_for_ids(ids))
+        for ids in batches
+    )
+
+    # 직렬화만 비교하기 위해 미리 불러온 인스턴스/값
+    instances = {ids[0]: list(Recipe.objects.filter(id__in=ids)) for ids in batches}
+    values = {
+        ids[0]: list(Recipe.objects.filter(id__in=ids).values(*LIST_FIELDS))
+        for ids in batches
+    }
+
+    log("측정 중...")
+    results = {
+        "fetch_and_serialize_us_per_row": {
+            "serializer": per_row_us(serializer_path, batches, batch_size),
+            "fast": per_row_us(list_items_for_ids, batches, batch_size),
+        },
+        "serialize_only_us_per_row": {
+            "serializer": per_row_us(
+                lambda ids: RecipeListSerializer(instances[ids[0]], many=True).data,
+                batches,
+                batch_size,
+            ),
+            "fast": per_row_us(
+                lambda ids: [_build_item(row) for row in values[ids[0]]],
+                batches,
+                batch_size,
+            ),
+        },
+        "schema_match": schema_match,
+    }
+
+    report = {
+        "meta": {
+            "scale": rows,
+            "seed": args.seed,
+            "batch_size": batch_size,
+            "batches": args.batches,
+            "database": connection.vendor,
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+        log(f"결과 저장: {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+벤치마크 전용 설정 - config.settings를 그대로 쓰고 DB만 교체
+
+- 기본: 규모/시드별 SQLite 파일 (BENCHMARK_DB_PATH)
+- BENCHMARK_USE_CONFIGURED_DB=1 이면 config.settings의 DB(MySQL) 사용
+"""
+
+import os
+
+from config.settings import *  # noqa: F401,F403
+from config.settings import BASE_DIR, DATABASES
+
+if os.getenv("BENCHMARK_USE_CONFIGURED_DB") != "1":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv(
+                "BENCHMARK_DB_PATH", str(BASE_DIR / ".cache" / "benchmark.sqlite3")
+            ),
+        }
+    }
+
+# 마이그레이션 대신 현재 모델 기준으로 테이블 생성 (측정 대상이 아니며 대용량 적재가 빠름)
+MIGRATION_MODULES = {"recipe": None, "chatbot": None}
+
+DEBUG = False
+ALLOWED_HOSTS = ["testserver", "localhost", "127.0.0.1"]
+
+# 벤치마크는 LLM을 스텁으로 대체하므로 응답 캐시와 메모리 카탈로그를 끔
+LLM_CACHE_ENABLED = False
+RECIPE_CATALOG_ENABLED = os.getenv("RECIPE_CATALOG_ENABLED", "0") == "1"
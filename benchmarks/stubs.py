@@ -0,0 +1,28 @@
+"""LLM 스텁 - 벤치마크에서 OpenAI 호출 없이 형식에 맞는 응답을 돌려줌"""
+
+import time
+from contextlib import contextmanager
+from unittest import mock
+
+from recipe.llm import LLMResult
+
+from .replies import canned_reply, split_tokens
+
+
+@contextmanager
+def stub_llm(delay=0.0):
+    """recipe.llm.chat/stream_chat을 스텁으로 교체 (delay: 호출당 지연 시간, 초)"""
+
+    def chat(messages, model=None, use_cache=True, validate=None, **params):
+        time.sleep(delay)
+        content = canned_reply(messages, params)
+        return LLMResult(content=content, model="stub", attempts=1, latency=delay)
+
+    def stream_chat(messages, model=None, use_cache=True, **params):
+        time.sleep(delay)
+        yield from split_tokens(canned_reply(messages, params))
+
+    with mock.patch("recipe.llm.chat", chat), mock.patch(
+        "recipe.llm.stream_chat", stream_chat
+    ):
+        yield
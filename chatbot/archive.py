@@ -0,0 +1,251 @@
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime, time, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ChatLog
+
+MANIFEST_NAME = "manifest.json"
+
+
+def archive_cutoff(days=None):
+    """보관 기간(days일)보다 오래된 기준 시각 - 날짜 단위로 자르기 위해 그날 0시"""
+    if days is None:
+        days = settings.CHAT_LOG_RETENTION_DAYS
+    today = timezone.localdate()
+    return timezone.make_aware(datetime.combine(today - timedelta(days=days), time.min))
+
+
+def _day_range(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def _serialize(log):
+    return {
+        "id": log.id,
+        "session_id": log.session_id,
+        "message": log.message,
+        "is_user": log.is_user,
+        "timestamp": log.timestamp.isoformat(),
+    }
+
+
+class ChatLogArchive:
+    """
+    날짜별 gzip NDJSON 대화 기록 보관소
+    - 파일: <root>/YYYY/MM/chat_logs-YYYY-MM-DD[.N].ndjson.gz (같은 날짜를 다시 보관하면 .N 추가)
+    - manifest.json: 파일별 날짜, 행 수, id 범위, sha256 (복원 시 무결성 확인)
+    """
+
+    def __init__(self, root=None):
+        self.root = Path(root or settings.CHAT_LOG_ARCHIVE_DIR)
+        self.manifest_path = self.root / MANIFEST_NAME
+
+    def load_manifest(self):
+        if not self.manifest_path.exists():
+            return {"partitions": []}
+        with open(self.manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest):
+        # 임시 파일에 쓴 뒤 교체하여 중간에 중단되어도 manifest가 깨지지 않도록 함
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _partition_path(self, day):
+        directory = self.root / f"{day:%Y}" / f"{day:%m}"
+        name = f"chat_logs-{day.isoformat()}"
+        path = directory / f"{name}.ndjson.gz"
+        part = 1
+        while path.exists():
+            path = directory / f"{name}.{part}.ndjson.gz"
+            part += 1
+        return path
+
+    def write_partition(self, day, logs):
+        """한 날짜의 대화 기록을 스트리밍으로 압축 저장하고 manifest에 추가"""
+        path = self._partition_path(day)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+
+        rows = 0
+        first_id = last_id = None
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            for log in logs:
+                f.write(json.dumps(_serialize(log), ensure_ascii=False) + "\n")
+                rows += 1
+                first_id = log.id if first_id is None else min(first_id, log.id)
+                last_id = log.id if last_id is None else max(last_id, log.id)
+
+        if rows == 0:
+            tmp_path.unlink()
+            return None
+
+        os.replace(tmp_path, path)
+        entry = {
+            "date": day.isoformat(),
+            "file": path.relative_to(self.root).as_posix(),
+            "rows": rows,
+            "first_id": first_id,
+            "last_id": last_id,
+            "bytes": path.stat().st_size,
+            "sha256": _file_sha256(path),
+            "archived_at": timezone.now().isoformat(),
+        }
+        manifest = self.load_manifest()
+        manifest["partitions"].append(entry)
+        self._save_manifest(manifest)
+        return entry
+
+    def partitions(self, days=None):
+        """manifest 항목 목록 (days를 주면 해당 날짜만)"""
+        entries = self.load_manifest()["partitions"]
+        if days is None:
+            return entries
+        days = {str(day) for day in days}
+        return [entry for entry in entries if entry["date"] in days]
+
+    def read_partition(self, entry):
+        """보관 파일의 대화 기록을 한 줄씩 읽기 (sha256 불일치 시 ValueError)"""
+        path = self.root / entry["file"]
+        if _file_sha256(path) != entry["sha256"]:
+            raise ValueError(f"보관 파일이 손상되었습니다: {entry['file']}")
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def archivable_days(cutoff):
+    """기준 시각보다 오래된 대화 기록이 있는 날짜 목록"""
+    return list(
+        ChatLog.objects.filter(timestamp__lt=cutoff)
+        .dates("timestamp", "day")
+        .order_by("timestamp")
+    )
+
+
+def _iter_day_logs(day, cutoff, batch_size):
+    """한 날짜의 대화 기록을 id 순으로 batch_size개씩 조회 (메모리 사용량 일정)"""
+    start, end = _day_range(day)
+    queryset = ChatLog.objects.filter(
+        timestamp__gte=start, timestamp__lt=min(end, cutoff)
+    ).order_by("id")
+    last_id = 0
+    while True:
+        chunk = list(queryset.filter(id__gt=last_id)[:batch_size])
+        if not chunk:
+            return
+        yield from chunk
+        last_id = chunk[-1].id
+
+
+def delete_archived(entry, cutoff, batch_size):
+    """보관된 날짜의 행을 batch_size개씩 별도 트랜잭션으로 삭제 (보관 이후 추가된 행은 유지)"""
+    start, end = _day_range(datetime.fromisoformat(entry["date"]).date())
+    queryset = ChatLog.objects.filter(
+        timestamp__gte=start,
+        timestamp__lt=min(end, cutoff),
+        id__gte=entry["first_id"],
+        id__lte=entry["last_id"],
+    )
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                queryset.order_by("id").values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                return deleted
+            deleted += ChatLog.objects.filter(id__in=ids).delete()[0]
+
+
+def archive_chat_logs(
+    cutoff=None, batch_size=None, archive=None, delete=True, log=print
+):
+    """
+    기준 시각보다 오래된 대화 기록을 날짜별로 보관 후 삭제
+    - 날짜 하나씩: 파일 저장 → manifest 기록 → 행 삭제 순서 (삭제 전에 항상 보관 완료)
+    """
+    if cutoff is None:
+        cutoff = archive_cutoff()
+    if batch_size is None:
+        batch_size = settings.CHAT_LOG_ARCHIVE_BATCH_SIZE
+    if archive is None:
+        archive = ChatLogArchive()
+
+    archived = deleted = 0
+    for day in archivable_days(cutoff):
+        entry = archive.write_partition(day, _iter_day_logs(day, cutoff, batch_size))
+        if entry is None:
+            continue
+        archived += entry["rows"]
+        removed = delete_archived(entry, cutoff, batch_size) if delete else 0
+        deleted += removed
+        log(
+            f"{entry['date']}: {entry['rows']}개 보관, {removed}개 삭제 ({entry['file']})"
+        )
+    return archived, deleted
+
+
+def _restore_batch(rows):
+    """
+    보관된 행을 원래 id와 생성 시간으로 저장 - 실제로 추가한 행 수 반환
+    - 이미 있는 id는 건너뜀 (기존 행의 값은 바꾸지 않음)
+    """
+    with transaction.atomic():
+        existing = set(
+            ChatLog.objects.filter(id__in=[row["id"] for row in rows]).values_list(
+                "id", flat=True
+            )
+        )
+        logs = [ChatLog(**row) for row in rows if row["id"] not in existing]
+        if logs:
+            ChatLog.objects.bulk_create(logs, ignore_conflicts=True)
+    return len(logs)
+
+
+def restore_chat_logs(days=None, batch_size=None, archive=None, log=print):
+    """보관 파일을 다시 chat_logs로 가져오기 (같은 id가 이미 있으면 건너뜀) - 복원한 행 수 반환"""
+    if batch_size is None:
+        batch_size = settings.CHAT_LOG_ARCHIVE_BATCH_SIZE
+    if archive is None:
+        archive = ChatLogArchive()
+
+    restored = 0
+    for entry in archive.partitions(days):
+        inserted = 0
+        batch = []
+        for row in archive.read_partition(entry):
+            row["timestamp"] = parse_datetime(row["timestamp"])
+            batch.append(row)
+            if len(batch) >= batch_size:
+                inserted += _restore_batch(batch)
+                batch = []
+        if batch:
+            inserted += _restore_batch(batch)
+        restored += inserted
+        log(
+            f"{entry['date']}: {inserted}개 복원, "
+            f"{entry['rows'] - inserted}개 이미 있음 ({entry['file']})"
+        )
+    return restored
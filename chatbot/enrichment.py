@@ -0,0 +1,322 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+from django.conf import settings
+
+from recipe.parsers import parse_cook_minutes, parse_servings
+from recipe.pregeneration import RateLimiter
+
+# 빈 값을 AI로 채울 컬럼 -> RecipeGenerator.fill_missing_data의 field_type
+ENRICH_FIELDS = {
+    "CKG_TIME_NM": "조리시간",
+    "CKG_INBUN_NM": "인분",
+    "CKG_METHOD_CN": "조리방법",
+}
+# 한 번의 LLM 호출로 여러 요리를 함께 채울 수 있는 컬럼 (숫자 하나씩이라 일괄 요청)
+BATCH_FIELDS = ("CKG_TIME_NM", "CKG_INBUN_NM")
+# 일괄 응답에서 받아들일 범위 (분, 인분)
+MINUTES_RANGE = (1, 24 * 60)
+SERVINGS_RANGE = (1, 20)
+# 진행 상황을 출력할 처리 간격
+PROGRESS_EVERY = 10
+
+
+def missing_fields(df):
+    """
+    컬럼 단위로 빈 필드 판별 (NaN 또는 공백 문자열) - 행 x ENRICH_FIELDS 불리언 DataFrame
+    - 요리 이름이 없는 행은 채울 수 없으므로 모두 False
+    """
+    mask = pd.DataFrame(index=df.index)
+    for column in ENRICH_FIELDS:
+        if column not in df.columns:
+            mask[column] = True
+            continue
+        values = df[column]
+        mask[column] = values.isna() | values.astype(str).str.strip().eq("")
+    has_name = df["CKG_NM"].notna() & df["CKG_NM"].astype(str).str.strip().ne("")
+    return mask & has_name.to_numpy()[:, None]
+
+
+class EnrichmentCheckpoint:
+    """
+    완료된 값을 한 줄씩 기록하는 NDJSON 파일 (처리 결과 옆에 두는 sidecar)
+    - 값을 받는 즉시 기록하므로 중단되어도 다시 실행하면 남은 필드부터 처리
+    - 요리 이름이 달라진 행(입력 파일이 바뀐 경우)의 기록은 무시
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def load(self):
+        """{행 index: (요리 이름, {컬럼: 값})}"""
+        entries = {}
+        if not self.path or not os.path.exists(self.path):
+            return entries
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # 중단으로 마지막 줄이 잘린 경우
+                    continue
+                # 한 행의 값이 단계별로 나뉘어 기록될 수 있으므로 합침
+                name, values = entries.get(entry["index"], (None, {}))
+                if name != entry["name"]:
+                    values = {}
+                values.update(entry["values"])
+                entries[entry["index"]] = (entry["name"], values)
+        return entries
+
+    def record(self, index, name, values):
+        if not self.path:
+            return
+        line = json.dumps(
+            {"index": index, "name": name, "values": values}, ensure_ascii=False
+        )
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def remove(self):
+        self.close()
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _to_key(index):
+    """JSON으로 저장할 수 있는 행 index (numpy 정수 -> int)"""
+    return index.item() if hasattr(index, "item") else index
+
+
+def _apply_checkpoint(df, checkpoint):
+    """이전 실행에서 완료된 행의 값을 DataFrame에 반영 - 반영한 행 index 집합"""
+    restored = set()
+    for index, (name, values) in checkpoint.load().items():
+        if index not in df.index or str(df.at[index, "CKG_NM"]) != name:
+            continue
+        for column, value in values.items():
+            df.at[index, column] = value
+        restored.add(index)
+    return restored
+
+
+def parse_numbers_batch(content):
+    """
+    일괄 조리시간/인분 응답(JSON)을 {번호: (분, 인분)}으로 변환
+    - JSON 객체가 아니면 ValueError
+    - 항목별로 숫자 형식과 범위를 확인하여 어긋난 항목은 제외 (호출 측에서 개별 생성)
+    """
+    try:
+        data = json.loads(content.strip().strip("`").removeprefix("json"))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"JSON 파싱 실패: {str(e)}")
+    if not isinstance(data, dict):
+        raise ValueError("응답이 JSON 객체가 아닙니다.")
+
+    numbers = {}
+    for key, item in data.items():
+        if not isinstance(item, dict):
+            continue
+        minutes = _number(item.get("minutes"), parse_cook_minutes)
+        servings = _number(item.get("servings"), parse_servings)
+        if minutes is None or not MINUTES_RANGE[0] <= minutes <= MINUTES_RANGE[1]:
+            continue
+        if servings is None or not SERVINGS_RANGE[0] <= servings <= SERVINGS_RANGE[1]:
+            continue
+        numbers[str(key)] = (minutes, servings)
+    return numbers
+
+
+def _number(value, parse):
+    """정수 또는 "30분"/"2인분" 같은 문자열을 정수로 (그 외 None)"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return round(value)
+    if isinstance(value, str):
+        return parse(value)
+    return None
+
+
+def _fill_rows(generator, limiter, rows):
+    """
+    행마다 빈 필드를 순서대로 하나씩 생성
+    - [(index, 요리 이름, {컬럼: 값} 또는 예외)] 반환
+    """
+    results = []
+    for index, name, fields in rows:
+        try:
+            values = {}
+            for column in fields:
+                limiter.acquire()
+                values[column] = generator.fill_missing_data(
+                    name, ENRICH_FIELDS[column]
+                )
+        except Exception as e:
+            values = e
+        results.append((index, name, values))
+    return results
+
+
+def _fill_numbers_batch(generator, limiter, rows):
+    """
+    여러 행의 조리시간/인분을 LLM 호출 한 번으로 생성
+    - 응답에서 빠졌거나 범위를 벗어난 행은 개별 호출로 다시 생성
+    - [(index, 요리 이름, {컬럼: 값} 또는 예외)] 반환
+    """
+    limiter.acquire()
+    try:
+        numbers = generator.fill_missing_numbers_batch(
+            list(dict.fromkeys(name for _, name, _ in rows))
+        )
+    except Exception as e:
+        print(f"조리시간/인분 일괄 생성 실패 ({len(rows)}개): {str(e)}")
+        numbers = {}
+
+    results = []
+    retry = []
+    for index, name, fields in rows:
+        if name not in numbers:
+            retry.append((index, name, fields))
+            continue
+        minutes, servings = numbers[name]
+        values = {"CKG_TIME_NM": f"{minutes}분", "CKG_INBUN_NM": f"{servings}인분"}
+        results.append((index, name, {column: values[column] for column in fields}))
+    return results + _fill_rows(generator, limiter, retry)
+
+
+def _batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _run_tasks(executor, concurrency, tasks, on_result):
+    """작업을 스레드 풀에서 실행 (진행 중인 작업 수를 제한하여 큰 파일에서도 메모리 일정)"""
+    futures = set()
+    while True:
+        while len(futures) < concurrency * 2:
+            task = next(tasks, None)
+            if task is None:
+                break
+            futures.add(executor.submit(*task))
+        if not futures:
+            return
+
+        finished, futures = wait(futures, return_when=FIRST_COMPLETED)
+        for future in finished:
+            for index, name, values in future.result():
+                on_result(index, name, values)
+
+
+def enrich_csv_data(
+    df,
+    generator,
+    concurrency=None,
+    requests_per_minute=None,
+    batch_size=None,
+    checkpoint_path=None,
+    log=print,
+):
+    """
+    DataFrame의 빈 조리시간/인분/조리방법을 AI로 채우기
+    - 조리시간/인분: batch_size개 요리를 LLM 호출 한 번으로 생성 (1이면 행마다 개별 호출)
+    - 조리방법: 행마다 개별 호출
+    - concurrency개 스레드로 동시에 처리, 분당 requests_per_minute건으로 제한
+    - 완료된 값은 checkpoint_path에 바로 기록 (다시 실행하면 이어서 처리)
+    - 실패한 행은 비워 두고 다음 실행에서 다시 시도
+    - (처리 대상 행 수, 완료 행 수, 실패 행 수) 반환
+    """
+    concurrency = concurrency or settings.CSV_ENRICH_CONCURRENCY
+    requests_per_minute = requests_per_minute or settings.CSV_ENRICH_RPM
+    batch_size = batch_size or settings.CSV_ENRICH_BATCH_SIZE
+
+    for column in ENRICH_FIELDS:
+        if column not in df.columns:
+            df[column] = None
+        df[column] = df[column].astype(object)
+
+    checkpoint = EnrichmentCheckpoint(checkpoint_path)
+    restored = _apply_checkpoint(df, checkpoint)
+    if restored:
+        log(f"체크포인트에서 {len(restored)}개 행 복원")
+
+    mask = missing_fields(df)
+    mask = mask[mask.any(axis=1)]
+    batched = list(BATCH_FIELDS) if batch_size > 1 else []
+    batch_mask = mask[batched].any(axis=1)
+    single_mask = mask.drop(columns=batched).any(axis=1)
+
+    total = int(batch_mask.sum() + single_mask.sum())
+    requests = -(-int(batch_mask.sum()) // batch_size) + int(
+        mask.drop(columns=batched).to_numpy().sum()
+    )
+    log(f"빈 필드가 있는 행: {len(mask)}개 (AI 요청 약 {requests}건)")
+
+    def rows(selected, columns):
+        for index, flags in mask[selected].iterrows():
+            name = str(df.at[index, "CKG_NM"]).strip()
+            yield index, name, [column for column in columns if flags[column]]
+
+    limiter = RateLimiter(requests_per_minute)
+    failed_rows = set()
+    processed = 0
+    started = time.monotonic()
+
+    def on_result(index, name, values):
+        nonlocal processed
+        if isinstance(values, Exception):
+            print(f"Error processing recipe {name}: {str(values)}")
+            failed_rows.add(index)
+        else:
+            for column, value in values.items():
+                df.at[index, column] = value
+            checkpoint.record(_to_key(index), str(df.at[index, "CKG_NM"]), values)
+
+        processed += 1
+        if processed % PROGRESS_EVERY == 0 or processed == total:
+            elapsed = time.monotonic() - started
+            log(
+                f"{processed}/{total}건 처리, {len(failed_rows)}개 행 실패 "
+                f"({processed / elapsed * 60:.1f}건/분)"
+            )
+
+    single_columns = [column for column in ENRICH_FIELDS if column not in batched]
+    stages = [
+        (
+            (_fill_numbers_batch, generator, limiter, batch)
+            for batch in _batches(rows(batch_mask, batched), batch_size)
+        ),
+        (
+            (_fill_rows, generator, limiter, [row])
+            for row in rows(single_mask, single_columns)
+        ),
+    ]
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        try:
+            for tasks in stages:
+                _run_tasks(executor, concurrency, tasks, on_result)
+        finally:
+            checkpoint.close()
+
+    return len(mask), len(mask) - len(failed_rows), len(failed_rows)
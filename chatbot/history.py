@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import OrderedDict, deque
+
+from django.conf import settings
+from django.utils import timezone
+
+from .log_writer import chat_log_writer
+from .models import ChatLog
+
+
+class ChatHistoryCache:
+    """
+    세션별 최근 대화 창 (메모리, 프로세스 단위)
+    - 세션마다 최근 max_turns개 메시지만 유지 (deque)
+    - 세션 수는 max_sessions개까지 (LRU), ttl초가 지나면 DB에서 다시 불러옴
+      (다른 프로세스에서 같은 세션에 저장한 대화를 반영하기 위해)
+    """
+
+    def __init__(self, max_turns, max_sessions, ttl):
+        self.max_turns = max_turns
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions = OrderedDict()  # session_id -> (불러온 시각, deque)
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        """캐시된 대화 목록 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            if self.ttl and time.monotonic() - entry[0] > self.ttl:
+                del self._sessions[session_id]
+                return None
+            self._sessions.move_to_end(session_id)
+            return list(entry[1])
+
+    def put(self, session_id, messages):
+        """DB에서 불러온 대화 목록으로 세션 창 설정"""
+        with self._lock:
+            window = deque(messages, maxlen=self.max_turns)
+            self._sessions[session_id] = (time.monotonic(), window)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def append(self, session_id, messages):
+        """새 대화를 세션 창에 추가 (캐시된 세션만 - save_chat_turn이 저장 전에 불러옴)"""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                entry[1].extend(messages)
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+
+
+history_cache = ChatHistoryCache(
+    max_turns=settings.MAX_CHAT_TURNS,
+    max_sessions=settings.CHAT_HISTORY_CACHE_SESSIONS,
+    ttl=settings.CHAT_HISTORY_CACHE_TTL,
+)
+
+
+def _as_message(log):
+    return {"role": "user" if log.is_user else "assistant", "content": log.message}
+
+
+def get_recent_history(session_id, max_turns=settings.MAX_CHAT_TURNS):
+    """
+    최근 대화 기록 (오래된 순, 최대 max_turns개)
+    - 캐시된 세션은 쿼리 없이 반환, 아니면 (session_id, timestamp) 인덱스로 한 번 조회
+    """
+    if max_turns <= history_cache.max_turns:
+        messages = history_cache.get(session_id)
+        if messages is not None:
+            return messages[-max_turns:] if max_turns else []
+
+    limit = max(max_turns, history_cache.max_turns)
+    logs = ChatLog.objects.filter(session_id=session_id).order_by("-timestamp", "-id")[
+        :limit
+    ]
+    messages = [_as_message(log) for log in reversed(logs)]
+    history_cache.put(session_id, messages)
+    return messages[-max_turns:] if max_turns else []
+
+
+def save_chat_turn(session_id, user_message, bot_message):
+    """
+    사용자 메시지와 AI 응답을 INSERT 한 번으로 저장하고 대화 창에 반영
+    - CHAT_LOG_WRITE_BEHIND: 저장 대기열에 넣고 바로 반환 (백그라운드 스레드가 모아서 저장)
+    - 생성 시간은 요청 시각으로 지정 (지연 저장해도 저장된 시각이 아니라 대화한 시각)
+    - 캐시에 없는 세션은 저장 전에 DB에서 대화 창을 불러옴
+      (아직 저장되지 않은 대화도 다음 조회에 포함되도록, 저장 후에 불러오면 새 대화가 두 번 들어감)
+    """
+    get_recent_history(session_id)
+    now = timezone.now()
+    logs = [
+        ChatLog(
+            session_id=session_id, message=user_message, is_user=True, timestamp=now
+        ),
+        ChatLog(
+            session_id=session_id, message=bot_message, is_user=False, timestamp=now
+        ),
+    ]
+    if settings.CHAT_LOG_WRITE_BEHIND:
+        chat_log_writer.submit(logs)
+    else:
+        ChatLog.objects.bulk_create(logs)
+    history_cache.append(session_id, [_as_message(log) for log in logs])
+    return logs
@@ -0,0 +1,214 @@
+import atexit
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+from .models import ChatLog
+
+
+class ChatLogWriter:
+    """
+    대화 기록 지연 저장 (write-behind)
+    - 요청 스레드는 큐에 넣기만 하고, 백그라운드 스레드가 flush_rows개 또는
+      flush_interval초마다 bulk_create 한 번으로 저장
+    - 큐가 가득 차면 put_timeout초까지 기다리고, 그래도 자리가 없으면 요청 스레드에서 직접 저장
+    - 저장에 실패하면 retries번까지 간격을 늘려 다시 시도하고, 그래도 실패하면 한 건씩 저장
+    - 종료 시(atexit) 남은 기록을 모두 저장
+    """
+
+    def __init__(
+        self,
+        max_size,
+        flush_rows,
+        flush_interval,
+        put_timeout,
+        retries=3,
+        retry_backoff=0.2,
+    ):
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self._queue = queue.Queue(maxsize=max_size)
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._metrics = {
+            "queued": 0,
+            "written": 0,
+            "failed": 0,
+            "sync_writes": 0,
+            "retries": 0,
+            "fallback_writes": 0,
+            "flushes": 0,
+            "max_queue_depth": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+        }
+
+    def start(self):
+        """저장 스레드 시작 (이미 실행 중이면 무시, fork된 워커에서는 새로 시작)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="chat-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, logs):
+        """대화 기록을 저장 대기열에 추가 (큐가 계속 가득 차 있으면 직접 저장)"""
+        self.start()
+        for position, log in enumerate(logs):
+            try:
+                self._queue.put(log, timeout=self.put_timeout)
+            except queue.Full:
+                remaining = logs[position:]
+                ChatLog.objects.bulk_create(remaining)
+                self._count("sync_writes", len(remaining))
+                break
+            self._count("queued")
+        with self._lock:
+            depth = self._queue.qsize()
+            if depth > self._metrics["max_queue_depth"]:
+                self._metrics["max_queue_depth"] = depth
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._metrics[name] += amount
+
+    def _next_batch(self):
+        """flush_rows개가 모이거나 flush_interval초가 지날 때까지 기록 수집"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.flush_rows:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain(self):
+        batch = []
+        while len(batch) < self.flush_rows:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _bulk_create(self, batch):
+        """bulk_create를 최대 retries번 다시 시도 (간격은 retry_backoff초부터 두 배씩 증가)"""
+        for attempt in range(self.retries + 1):
+            try:
+                close_old_connections()
+                ChatLog.objects.bulk_create(batch)
+                return True
+            except Exception as e:
+                print(f"대화 기록 저장 실패 ({attempt + 1}회): {str(e)}")
+            if attempt < self.retries:
+                self._count("retries")
+                time.sleep(self.retry_backoff * 2**attempt)
+        return False
+
+    def _save_each(self, batch):
+        """일괄 저장이 계속 실패하면 한 건씩 저장 (문제가 있는 행만 버림) - 버린 건수 반환"""
+        failed = 0
+        for log in batch:
+            try:
+                close_old_connections()
+                log.save()
+            except Exception as e:
+                print(f"대화 기록 저장 실패: {str(e)}")
+                failed += 1
+        return failed
+
+    def _write(self, batch):
+        start = time.perf_counter()
+        try:
+            if not self._bulk_create(batch):
+                failed = self._save_each(batch)
+                self._count("fallback_writes", len(batch) - failed)
+                self._count("failed", failed)
+                return
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+        elapsed = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._metrics["written"] += len(batch)
+            self._metrics["flushes"] += 1
+            self._metrics["last_flush_ms"] = round(elapsed, 2)
+            self._metrics["max_flush_ms"] = round(
+                max(self._metrics["max_flush_ms"], elapsed), 2
+            )
+            self._metrics["total_flush_ms"] += elapsed
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                batch = self._next_batch()
+                if batch:
+                    self._write(batch)
+            while batch := self._drain():
+                self._write(batch)
+        finally:
+            connection.close()
+
+    def flush(self, timeout=None):
+        """대기 중인 기록이 모두 저장될 때까지 대기 (저장 스레드가 없으면 직접 저장)"""
+        if self._thread is None or not self._thread.is_alive():
+            while batch := self._drain():
+                self._write(batch)
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            time.sleep(0.01)
+
+    def stop(self, timeout=None):
+        """저장 스레드를 멈추고 남은 기록을 모두 저장"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+    def stats(self):
+        """큐 길이와 저장 통계"""
+        with self._lock:
+            metrics = dict(self._metrics)
+        flushes = metrics.pop("flushes")
+        total_flush_ms = metrics.pop("total_flush_ms")
+        metrics.update(
+            {
+                "enabled": settings.CHAT_LOG_WRITE_BEHIND,
+                "queue_depth": self._queue.qsize(),
+                "queue_size": self._queue.maxsize,
+                "flushes": flushes,
+                "avg_flush_ms": round(total_flush_ms / flushes, 2) if flushes else 0.0,
+            }
+        )
+        return metrics
+
+
+chat_log_writer = ChatLogWriter(
+    max_size=settings.CHAT_LOG_QUEUE_SIZE,
+    flush_rows=settings.CHAT_LOG_FLUSH_ROWS,
+    flush_interval=settings.CHAT_LOG_FLUSH_INTERVAL_MS / 1000,
+    put_timeout=settings.CHAT_LOG_QUEUE_PUT_TIMEOUT,
+    retries=settings.CHAT_LOG_WRITE_RETRIES,
+    retry_backoff=settings.CHAT_LOG_WRITE_RETRY_BACKOFF_MS / 1000,
+)
+atexit.register(chat_log_writer.stop, timeout=5)
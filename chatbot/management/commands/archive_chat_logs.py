@@ -0,0 +1,107 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+from chatbot.archive import (
+    ChatLogArchive,
+    archive_chat_logs,
+    archive_cutoff,
+    restore_chat_logs,
+)
+from chatbot.models import ChatLog
+
+
+class Command(BaseCommand):
+    help = "보관 기간이 지난 대화 기록을 날짜별 압축 파일(NDJSON)로 보관하고 삭제합니다"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.CHAT_LOG_RETENTION_DAYS,
+            help="보관 기간 (이보다 오래된 대화 기록을 보관)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.CHAT_LOG_ARCHIVE_BATCH_SIZE,
+            help="한 번에 읽고 삭제할 행 수",
+        )
+        parser.add_argument(
+            "--output-dir",
+            default=settings.CHAT_LOG_ARCHIVE_DIR,
+            help="보관 파일 저장 위치",
+        )
+        parser.add_argument(
+            "--keep-rows",
+            action="store_true",
+            help="보관만 하고 DB에서 삭제하지 않음",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="보관 대상 날짜와 행 수만 출력",
+        )
+        parser.add_argument(
+            "--list", action="store_true", help="보관된 파일 목록(manifest) 출력"
+        )
+        parser.add_argument(
+            "--restore",
+            nargs="+",
+            metavar="YYYY-MM-DD",
+            help="보관된 날짜의 대화 기록을 다시 가져오기 (all: 전체)",
+        )
+
+    def handle(self, *args, **options):
+        archive = ChatLogArchive(options["output_dir"])
+
+        if options["list"]:
+            for entry in archive.partitions():
+                self.stdout.write(
+                    f"{entry['date']}  {entry['rows']}행  {entry['bytes']}B  {entry['file']}"
+                )
+            return
+
+        if options["restore"]:
+            days = None if options["restore"] == ["all"] else options["restore"]
+            try:
+                if days is not None:
+                    days = [date.fromisoformat(day) for day in days]
+                restored = restore_chat_logs(
+                    days, options["batch_size"], archive, log=self.stdout.write
+                )
+            except ValueError as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(f"대화 기록 복원 완료: {restored}개"))
+            return
+
+        cutoff = archive_cutoff(options["days"])
+        self.stdout.write(f"보관 기준: {cutoff.isoformat()} 이전")
+
+        if options["dry_run"]:
+            rows = (
+                ChatLog.objects.filter(timestamp__lt=cutoff)
+                .annotate(day=TruncDate("timestamp"))
+                .values("day")
+                .annotate(rows=Count("id"))
+                .order_by("day")
+            )
+            for row in rows:
+                self.stdout.write(f"{row['day']}: {row['rows']}개")
+            return
+
+        archived, deleted = archive_chat_logs(
+            cutoff,
+            options["batch_size"],
+            archive,
+            delete=not options["keep_rows"],
+            log=self.stdout.write,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"대화 기록 보관 완료: {archived}개 보관, {deleted}개 삭제"
+            )
+        )
@@ -0,0 +1,84 @@
+import os
+
+import pandas as pd
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from chatbot.enrichment import missing_fields
+from chatbot.views import RecipeGenerator
+from recipe.importer import detect_encoding
+
+
+class Command(BaseCommand):
+    help = "레시피 CSV의 빈 조리시간/인분/조리방법을 AI로 채워 새 CSV로 저장합니다 (중단 후 이어서 실행 가능)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_file", help="입력 CSV 파일 경로")
+        parser.add_argument(
+            "--output", default=None, help="출력 CSV 경로 (기본: <입력>.enriched.csv)"
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default=None,
+            help="완료된 행 기록 파일 (기본: <출력>.checkpoint.ndjson)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.CSV_ENRICH_CONCURRENCY,
+            help="동시에 처리할 행 수",
+        )
+        parser.add_argument(
+            "--rpm",
+            type=int,
+            default=settings.CSV_ENRICH_RPM,
+            help="분당 최대 LLM 요청 수",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.CSV_ENRICH_BATCH_SIZE,
+            help="조리시간/인분을 한 번에 요청할 요리 수 (1: 행마다 개별 요청)",
+        )
+        parser.add_argument(
+            "--encoding",
+            default=None,
+            help="입력 CSV 인코딩 (기본: 자동 판별), 출력은 항상 utf-8-sig",
+        )
+
+    def handle(self, *args, **options):
+        csv_file = options["csv_file"]
+        if not os.path.exists(csv_file):
+            raise CommandError(f"CSV 파일을 찾을 수 없습니다: {csv_file}")
+
+        output = options["output"] or f"{os.path.splitext(csv_file)[0]}.enriched.csv"
+        checkpoint = options["checkpoint"] or f"{output}.checkpoint.ndjson"
+        encoding = options["encoding"] or detect_encoding(csv_file)
+
+        df = pd.read_csv(csv_file, encoding=encoding, dtype=str)
+        self.stdout.write(f"{csv_file}: {len(df)}행 ({encoding})")
+
+        RecipeGenerator().process_csv_data(
+            df,
+            concurrency=options["concurrency"],
+            requests_per_minute=options["rpm"],
+            batch_size=options["batch_size"],
+            checkpoint_path=checkpoint,
+            log=self.stdout.write,
+        )
+
+        # 임시 파일에 쓴 뒤 교체 (출력 파일이 완성된 후에만 체크포인트 삭제)
+        # AI 응답에 cp949로 표현할 수 없는 문자가 있을 수 있어 출력은 utf-8-sig
+        tmp_output = f"{output}.tmp"
+        df.to_csv(tmp_output, index=False, encoding="utf-8-sig")
+        os.replace(tmp_output, output)
+
+        remaining = int(missing_fields(df).to_numpy().sum())
+        if remaining == 0 and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"저장 완료: {output} (남은 빈 필드 {remaining}개"
+                f"{', 다시 실행하면 이어서 처리' if remaining else ''})"
+            )
+        )
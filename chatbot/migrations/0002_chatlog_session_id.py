@@ -9,10 +9,16 @@ class Migration(migrations.Migration):
         ("chatbot", "0001_initial"),
     ]
 
+    # session_id는 0001_initial에서 이미 생성되므로 새 DB에서는 컬럼을 다시 추가하지 않음
+    # (이미 적용된 DB에는 영향 없음, 상태만 기존과 동일하게 유지)
     operations = [
-        migrations.AddField(
-            model_name="chatlog",
-            name="session_id",
-            field=models.CharField(blank=True, max_length=255, null=True),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="chatlog",
+                    name="session_id",
+                    field=models.CharField(blank=True, max_length=255, null=True),
+                ),
+            ],
         ),
     ]
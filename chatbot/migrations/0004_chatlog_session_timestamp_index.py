@@ -0,0 +1,19 @@
+# Generated by Django 4.2.9 on 2026-10-18 19:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chatbot", "0003_alter_chatlog_session_id"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="chatlog",
+            index=models.Index(
+                fields=["session_id", "timestamp"], name="chat_logs_session_ts_idx"
+            ),
+        ),
+    ]
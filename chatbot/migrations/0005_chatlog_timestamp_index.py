@@ -0,0 +1,17 @@
+# Generated by Django 4.2.9 on 2026-10-18 20:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chatbot", "0004_chatlog_session_timestamp_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="chatlog",
+            index=models.Index(fields=["timestamp"], name="chat_logs_ts_idx"),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.9 on 2026-10-18 20:23
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chatbot", "0005_chatlog_timestamp_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="chatlog",
+            name="timestamp",
+            field=models.DateTimeField(
+                db_column="CRT_DTM",
+                default=django.utils.timezone.now,
+                editable=False,
+                null=True,
+                verbose_name="생성 시간",
+            ),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.utils import timezone
+from django.utils import timezone
 
 
 class ChatLog(models.Model):
@@ -20,7 +21,10 @@ class ChatLog(models.Model):
     )
     timestamp = models.DateTimeField(
         verbose_name="생성 시간",
-        auto_now_add=True,  # default 제거
+        # 저장 시점이 아니라 지정한 시각을 쓸 수 있도록 auto_now_add 대신 default 사용
+        # (지연 저장은 요청 시각, 보관 복원은 원래 시각)
+        default=timezone.now,
+        editable=False,
         db_column="CRT_DTM",
         null=True,  # 임시로 null 허용
     )
@@ -34,3 +38,11 @@ class ChatLog(models.Model):
         verbose_name = "대화 기록"
         verbose_name_plural = "대화 기록"
         ordering = ["timestamp"]
+        indexes = [
+            # 세션별 최근 대화 조회 (session_id로 찾고 timestamp 순 정렬)
+            models.Index(
+                fields=["session_id", "timestamp"], name="chat_logs_session_ts_idx"
+            ),
+            # 보관 명령어의 날짜 범위 조회/삭제 (세션과 관계없이 timestamp로만 검색)
+            models.Index(fields=["timestamp"], name="chat_logs_ts_idx"),
+        ]
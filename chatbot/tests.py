@@ -1,3 +1,441 @@
-from django.test import TestCase
+import json
+import tempfile
+import threading
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import pandas as pd
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from recipe.llm_cache import llm_cache
+from recipe.models import Recipe
+
+from .archive import ChatLogArchive, archive_chat_logs, restore_chat_logs
+from .enrichment import enrich_csv_data, parse_numbers_batch
+from .history import get_recent_history, history_cache, save_chat_turn
+from .log_writer import ChatLogWriter
+from .models import ChatLog
+from .views import RecipeGenerator
+
+
+def fake_completion(content):
+    """chat.completions.create 응답 형태의 가짜 객체"""
+    return SimpleNamespace(
+        model="test-model",
+        usage=None,
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+    )
+
+
+BATCH_RESPONSE = json.dumps(
+    {
+        "recipes": [
+            {
+                "CKG_NM": name,
+                "CKG_MTRL_CN": "두부 1모|대파 1대",
+                "CKG_INBUN_NM": "2인분",
+                "CKG_TIME_NM": "20분",
+                "CKG_METHOD_CN": "1. 재료를 손질한다.",
+            }
+            for name in ["된장찌개", "순두부찌개", "두부조림", "마파두부", "두부부침"]
+        ]
+    },
+    ensure_ascii=False,
+)
+
+
+@override_settings(
+    LLM_CACHE_ENABLED=True, AI_RECIPE_BATCH_GENERATION=True, CHAT_LOG_WRITE_BEHIND=False
+)
+class ChatbotRecipeGenerationTests(TestCase):
+    def setUp(self):
+        llm_cache.clear()
+        self.create = mock.Mock(return_value=fake_completion(BATCH_RESPONSE))
+        client = SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(create=self.create))
+        )
+        patcher = mock.patch("recipe.llm.get_client", return_value=client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post_message(self, message, **filters):
+        return self.client.post(
+            "/api/chatbot/message/",
+            {"message": message, "session_id": "test-session", **filters},
+            content_type="application/json",
+        )
+
+    def test_same_message_does_not_duplicate_recipes(self):
+        """같은 메시지를 다시 보내면 LLM은 다시 호출하지만 같은 이름의 레시피를 또 저장하지 않음"""
+        first = self.post_message("주말 저녁 메뉴")
+        second = self.post_message("주말 저녁 메뉴")
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 200)
+        # 일괄 생성 요청은 캐시하지 않으므로 매번 LLM 호출
+        self.assertEqual(self.create.call_count, 2)
+        self.assertEqual(Recipe.objects.count(), 5)
+        self.assertEqual(
+            Recipe.objects.values("CKG_NM").distinct().count(),
+            Recipe.objects.count(),
+        )
+        names = [item["CKG_NM"] for item in second.json()["response"]["recipes"]]
+        self.assertEqual(len(names), 5)
+        self.assertEqual(len(set(names)), 5)
+
+    def test_reused_recipes_match_filters(self):
+        """이미 있는 같은 이름의 레시피가 필터에 맞지 않으면 재사용하지도, 또 저장하지도 않음"""
+        slow = Recipe.objects.create(
+            CKG_NM="된장찌개", CKG_MTRL_CN="된장 1큰술", CKG_TIME_NM="2시간"
+        )
+        response = self.post_message("주말 저녁 메뉴", time_filters=["15~30분"])
+
+        self.assertEqual(response.status_code, 200)
+        ids = [item["id"] for item in response.json()["response"]["recipes"]]
+        self.assertNotIn(slow.id, ids)
+        self.assertEqual(Recipe.objects.filter(CKG_NM="된장찌개").count(), 1)
+        self.assertFalse(
+            Recipe.objects.filter(id__in=ids).exclude(cook_minutes__range=(15, 30))
+        )
+
+
+class ChatLogWriterRetryTests(TestCase):
+    def setUp(self):
+        self.writer = ChatLogWriter(
+            max_size=100, flush_rows=10, flush_interval=0.05, put_timeout=0.1
+        )
+        self.writer.retry_backoff = 0
+
+    def queue_logs(self, count):
+        for i in range(count):
+            self.writer._queue.put(ChatLog(session_id="s", message=f"메시지 {i}"))
+
+    def test_failed_batch_is_retried(self):
+        """일괄 저장이 한 번 실패해도 다시 시도하여 저장"""
+        self.queue_logs(3)
+        bulk_create = ChatLog.objects.bulk_create
+        calls = []
+
+        def flaky(batch):
+            calls.append(len(batch))
+            if len(calls) == 1:
+                raise Exception("일시적 오류")
+            return bulk_create(batch)
+
+        with mock.patch.object(ChatLog.objects, "bulk_create", side_effect=flaky):
+            self.writer.flush()
+
+        self.assertEqual(calls, [3, 3])
+        self.assertEqual(ChatLog.objects.count(), 3)
+        stats = self.writer.stats()
+        self.assertEqual(stats["retries"], 1)
+        self.assertEqual(stats["written"], 3)
+        self.assertEqual(stats["failed"], 0)
+
+    def test_falls_back_to_single_writes(self):
+        """재시도가 모두 실패하면 한 건씩 저장하여 기록을 버리지 않음"""
+        self.queue_logs(3)
+        with mock.patch.object(
+            ChatLog.objects, "bulk_create", side_effect=Exception("저장 실패")
+        ) as patched:
+            self.writer.flush()
+
+        self.assertEqual(patched.call_count, self.writer.retries + 1)
+        self.assertEqual(ChatLog.objects.count(), 3)
+        stats = self.writer.stats()
+        self.assertEqual(stats["fallback_writes"], 3)
+        self.assertEqual(stats["failed"], 0)
+
+
+class ChatLogWriterTests(TransactionTestCase):
+    def setUp(self):
+        self.writer = ChatLogWriter(
+            max_size=100, flush_rows=10, flush_interval=0.05, put_timeout=0.1
+        )
+        self.addCleanup(self.writer.stop, timeout=5)
+
+    def test_submitted_logs_are_written_in_background(self):
+        """요청 스레드는 큐에 넣기만 하고, 저장 스레드가 모아서 저장"""
+        self.writer.submit(
+            [ChatLog(session_id="s", message=f"메시지 {i}") for i in range(25)]
+        )
+        self.writer.flush(timeout=5)
+
+        self.assertEqual(ChatLog.objects.count(), 25)
+        stats = self.writer.stats()
+        self.assertEqual(stats["queued"], 25)
+        self.assertEqual(stats["written"], 25)
+        self.assertEqual(stats["sync_writes"], 0)
+
+    def test_full_queue_writes_synchronously(self):
+        """큐가 가득 차면 남은 기록을 요청 스레드에서 직접 저장 (기록을 버리지 않음)"""
+        writer = ChatLogWriter(
+            max_size=2, flush_rows=10, flush_interval=1, put_timeout=0
+        )
+        with mock.patch.object(writer, "start"):
+            writer.submit([ChatLog(session_id="s", message=f"{i}") for i in range(5)])
+
+        self.assertEqual(ChatLog.objects.count(), 3)
+        self.assertEqual(writer.stats()["sync_writes"], 3)
+        writer.flush()
+        self.assertEqual(ChatLog.objects.count(), 5)
+
+
+@override_settings(CHAT_LOG_WRITE_BEHIND=True)
+class ChatHistoryWriteBehindTests(TestCase):
+    def setUp(self):
+        history_cache.clear()
+        self.addCleanup(history_cache.clear)
+        self.writer = ChatLogWriter(
+            max_size=100, flush_rows=10, flush_interval=1, put_timeout=0.1
+        )
+        # 저장 스레드 없이 큐에만 쌓아 두고 flush()로 직접 저장
+        patchers = [
+            mock.patch("chatbot.history.chat_log_writer", self.writer),
+            mock.patch.object(self.writer, "start"),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        ChatLog.objects.create(session_id="s", message="이전 대화")
+
+    def test_queued_turn_is_visible_before_flush(self):
+        """캐시에 없던 세션도 아직 저장되지 않은 대화를 포함하여 조회"""
+        save_chat_turn("s", "오늘 뭐 먹지", "김치찌개 어떠세요?")
+
+        self.assertEqual(ChatLog.objects.count(), 1)
+        with self.assertNumQueries(0):
+            messages = get_recent_history("s")
+        self.assertEqual(
+            [message["content"] for message in messages],
+            ["이전 대화", "오늘 뭐 먹지", "김치찌개 어떠세요?"],
+        )
+
+    def test_timestamp_is_request_time(self):
+        """지연 저장해도 생성 시간은 저장된 시각이 아니라 요청 시각"""
+        logs = save_chat_turn("s", "오늘 뭐 먹지", "김치찌개 어떠세요?")
+        with mock.patch(
+            "django.utils.timezone.now",
+            return_value=logs[0].timestamp + timedelta(minutes=5),
+        ):
+            self.writer.flush()
+
+        saved = ChatLog.objects.filter(session_id="s").exclude(message="이전 대화")
+        self.assertEqual(
+            set(saved.values_list("timestamp", flat=True)), {logs[0].timestamp}
+        )
+
+
+class ChatLogArchiveTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.archive = ChatLogArchive(directory.name)
+        self.old_time = timezone.now() - timedelta(days=200)
+        ChatLog.objects.bulk_create(
+            [ChatLog(session_id="old", message=f"오래된 메시지 {i}") for i in range(5)]
+        )
+        ChatLog.objects.update(timestamp=self.old_time)
+        self.recent = ChatLog.objects.create(session_id="new", message="최근 메시지")
+
+    def archive_old_logs(self):
+        return archive_chat_logs(
+            cutoff=timezone.now() - timedelta(days=90),
+            batch_size=2,
+            archive=self.archive,
+            log=lambda message: None,
+        )
+
+    def restore_logs(self):
+        return restore_chat_logs(archive=self.archive, log=lambda message: None)
+
+    def test_old_logs_are_archived_then_deleted(self):
+        """보관 기간이 지난 기록만 파일에 저장한 뒤 삭제"""
+        self.assertEqual(self.archive_old_logs(), (5, 5))
+        self.assertEqual(list(ChatLog.objects.all()), [self.recent])
+
+        [entry] = self.archive.partitions()
+        self.assertEqual(entry["rows"], 5)
+        rows = list(self.archive.read_partition(entry))
+        self.assertEqual({row["session_id"] for row in rows}, {"old"})
+
+    def test_restore_keeps_archived_timestamps(self):
+        """복원한 기록은 원래 id와 생성 시간을 유지"""
+        before = dict(
+            ChatLog.objects.filter(session_id="old").values_list("id", "timestamp")
+        )
+        self.archive_old_logs()
+        self.assertEqual(self.restore_logs(), 5)
+
+        after = dict(
+            ChatLog.objects.filter(session_id="old").values_list("id", "timestamp")
+        )
+        self.assertEqual(after, before)
+        self.assertEqual(ChatLog.objects.count(), 6)
+
+    def test_restore_counts_only_inserted_rows(self):
+        """이미 있는 id는 건너뛰고 실제로 추가한 행만 셈"""
+        self.archive_old_logs()
+        ChatLog.objects.create(
+            id=self.archive.partitions()[0]["first_id"], session_id="x", message="x"
+        )
+
+        self.assertEqual(self.restore_logs(), 4)
+        self.assertEqual(self.restore_logs(), 0)
+        self.assertEqual(ChatLog.objects.count(), 6)
+
+
+class FakeEnrichmentGenerator:
+    """RecipeGenerator 대신 사용하는 가짜 생성기 (fail에 있는 요리는 예외)"""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def fill_missing_data(self, name, field_type):
+        with self._lock:
+            self.calls.append((name, field_type))
+        if name in self.fail:
+            raise RuntimeError("생성 실패")
+        return {"조리시간": "10분", "인분": "2인분", "조리방법": f"{name} 조리"}[
+            field_type
+        ]
+
+
+class CSVEnrichmentTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.checkpoint = f"{directory.name}/recipes.checkpoint.ndjson"
+
+    def make_df(self):
+        return pd.DataFrame(
+            {
+                "CKG_NM": ["김치찌개", "계란찜", "두부조림", None],
+                "CKG_TIME_NM": ["30분", None, " ", None],
+                "CKG_INBUN_NM": ["2인분", "1인분", None, None],
+                "CKG_METHOD_CN": ["끓인다", None, "조린다", None],
+            },
+            dtype=object,
+        )
+
+    def enrich(self, df, generator):
+        return enrich_csv_data(
+            df,
+            generator,
+            concurrency=3,
+            requests_per_minute=60000,
+            batch_size=1,
+            checkpoint_path=self.checkpoint,
+            log=lambda message: None,
+        )
+
+    def test_fills_only_missing_fields(self):
+        """요리 이름이 없는 행과 이미 채워진 필드는 요청하지 않음"""
+        df = self.make_df()
+        generator = FakeEnrichmentGenerator()
+        self.assertEqual(self.enrich(df, generator), (2, 2, 0))
+
+        self.assertCountEqual(
+            generator.calls,
+            [
+                ("계란찜", "조리시간"),
+                ("계란찜", "조리방법"),
+                ("두부조림", "조리시간"),
+                ("두부조림", "인분"),
+            ],
+        )
+        self.assertEqual(df.loc[1].tolist(), ["계란찜", "10분", "1인분", "계란찜 조리"])
+        self.assertEqual(df.loc[2].tolist(), ["두부조림", "10분", "2인분", "조린다"])
+
+    def test_resumes_from_checkpoint(self):
+        """완료된 행은 체크포인트에서 복원하고 실패한 행만 다시 요청"""
+        with mock.patch("builtins.print"):
+            result = self.enrich(
+                self.make_df(), FakeEnrichmentGenerator(fail=["계란찜"])
+            )
+        self.assertEqual(result, (2, 1, 1))
+
+        df = self.make_df()
+        generator = FakeEnrichmentGenerator()
+        self.assertEqual(self.enrich(df, generator), (1, 1, 0))
+        self.assertEqual({name for name, _ in generator.calls}, {"계란찜"})
+        self.assertEqual(df.loc[2].tolist(), ["두부조림", "10분", "2인분", "조린다"])
+
+
+class FakeBatchEnrichmentGenerator(FakeEnrichmentGenerator):
+    """조리시간/인분 일괄 생성도 지원 (skip에 있는 요리는 응답에서 빠짐)"""
+
+    def __init__(self, skip=()):
+        super().__init__()
+        self.skip = set(skip)
+        self.batches = []
+
+    def fill_missing_numbers_batch(self, recipe_names):
+        self.batches.append(recipe_names)
+        return {name: (15, 3) for name in recipe_names if name not in self.skip}
+
+
+class NumbersBatchTests(TestCase):
+    def test_parse_numbers_batch(self):
+        """숫자/단위 문자열을 허용하고, 범위를 벗어나거나 형식이 틀린 항목은 제외"""
+        content = json.dumps(
+            {
+                "1": {"minutes": 30, "servings": 2},
+                "2": {"minutes": "1시간", "servings": "4인분"},
+                "3": {"minutes": 0, "servings": 2},
+                "4": {"minutes": 20, "servings": 100},
+                "5": {"minutes": True, "servings": 2},
+                "6": "30분",
+            }
+        )
+        self.assertEqual(parse_numbers_batch(content), {"1": (30, 2), "2": (60, 4)})
+        for content in ["30분", "[1, 2]"]:
+            with self.assertRaises(ValueError):
+                parse_numbers_batch(content)
+
+    @override_settings(LLM_CACHE_ENABLED=False)
+    def test_generator_maps_numbers_to_names(self):
+        content = json.dumps(
+            {"1": {"minutes": 30, "servings": 2}, "3": {"minutes": 5, "servings": 1}}
+        )
+        create = mock.Mock(return_value=fake_completion(content))
+        client = SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+        )
+        with mock.patch("recipe.llm.get_client", return_value=client):
+            numbers = RecipeGenerator().fill_missing_numbers_batch(
+                ["김치찌개", "계란찜"]
+            )
+        self.assertEqual(numbers, {"김치찌개": (30, 2)})
+        create.assert_called_once()
+
+    def test_enrichment_batches_numbers_and_falls_back_per_row(self):
+        """조리시간/인분은 한 번에 요청하고, 응답에서 빠진 요리만 개별 요청"""
+        df = pd.DataFrame(
+            {
+                "CKG_NM": ["김치찌개", "계란찜", "두부조림"],
+                "CKG_TIME_NM": [None, None, "10분"],
+                "CKG_INBUN_NM": [None, "1인분", None],
+                "CKG_METHOD_CN": ["끓인다", "찐다", "조린다"],
+            },
+            dtype=object,
+        )
+        generator = FakeBatchEnrichmentGenerator(skip=["계란찜"])
+        result = enrich_csv_data(
+            df,
+            generator,
+            concurrency=2,
+            requests_per_minute=60000,
+            batch_size=10,
+            log=lambda message: None,
+        )
+
+        self.assertEqual(result, (3, 3, 0))
+        self.assertEqual(generator.batches, [["김치찌개", "계란찜", "두부조림"]])
+        self.assertEqual(generator.calls, [("계란찜", "조리시간")])
+        self.assertEqual(df["CKG_TIME_NM"].tolist(), ["15분", "10분", "10분"])
+        self.assertEqual(df["CKG_INBUN_NM"].tolist(), ["3인분", "1인분", "3인분"])
@@ -1,6 +1,7 @@
 from django.urls import path
-from .views import ChatbotMessageView
+from .views import ChatbotMessageView, chat_log_writer_stats
 
 urlpatterns = [
     path('message/', ChatbotMessageView.as_view(), name='chatbot-message'),  # POST
+    path('log-writer/stats/', chat_log_writer_stats, name='chat-log-writer-stats'),  # GET
 ]
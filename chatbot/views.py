@@ -1,24 +1,32 @@
 import json
-import openai
-import pandas as pd
 import random
 from django.conf import settings
-from django.db.models import Q
 from dotenv import load_dotenv
+from rest_framework.decorators import api_view
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from recipe.utils import save_recipe_with_ai_instructions
+from recipe.activity import record_shown
+from recipe.catalog import get_catalog
+from recipe.generation import generate_missing_recipes
+from recipe import llm
 from recipe.models import Recipe
-from recipe.serializers import RecipeListSerializer
-from .models import ChatLog
+from recipe.search import rank_recipe_ids
+from recipe.listing import (
+    list_items_for_ids,
+    list_items_for_queryset,
+    list_items_for_recipes,
+)
+from .enrichment import enrich_csv_data, parse_numbers_batch
+from .history import get_recent_history, save_chat_turn
+from .log_writer import chat_log_writer
 from django.shortcuts import get_object_or_404
 from django.shortcuts import redirect
 
 
-# 환경 변수 로드 및 OpenAI API 키 설정
+# 환경 변수 로드 (OpenAI 클라이언트는 recipe.llm에서 공유)
 load_dotenv()
-client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
 
 
 class GenerateInstructionsView(APIView):
@@ -52,57 +60,73 @@ class RecipeGenerator:
             "조리방법": f"'{recipe_name}'의 조리방법을 단계별로 설명해주세요.",
         }
 
-        response = self._call_gpt_api(prompts[field_type])
-        return response.choices[0].message.content
+        return self._call_gpt_api(prompts[field_type])
+
+    def fill_missing_numbers_batch(self, recipe_names):
+        """
+        여러 요리의 조리시간(분)과 인분 수를 한 번에 생성 - {요리 이름: (분, 인분)}
+        - 응답에서 빠졌거나 범위를 벗어난 요리는 결과에 없음 (호출 측에서 개별 생성)
+        """
+        numbered = {str(i): name for i, name in enumerate(recipe_names, 1)}
+        prompt = f"""
+        다음 요리들의 예상 조리시간(분)과 일반적인 1회 섭취 인분 수를 숫자로 알려주세요.
+        {json.dumps(numbered, ensure_ascii=False)}
+
+        다음 JSON 형식으로만 응답해 주세요 (키는 위의 번호 그대로):
+        {{"1": {{"minutes": 30, "servings": 2}}, ...}}
+        """
+        result = llm.chat(
+            [self.system_message, {"role": "user", "content": prompt}],
+            max_tokens=len(numbered) * 20 + 50,
+            response_format={"type": "json_object"},
+            validate=parse_numbers_batch,
+        )
+        return {
+            numbered[key]: numbers
+            for key, numbers in parse_numbers_batch(result.content).items()
+            if key in numbered
+        }
 
     def _call_gpt_api(self, prompt):
-        """GPT API 호출"""
+        """GPT API 호출 (같은 요리 이름의 같은 질문은 캐시된 응답 사용)"""
         try:
-            response = client.chat.completions.create(
-                model=settings.GPT_MODEL_NAME,
-                messages=[self.system_message, {"role": "user", "content": prompt}],
-            )
-            return response
+            return llm.chat(
+                [self.system_message, {"role": "user", "content": prompt}]
+            ).content
         except Exception as e:
             raise Exception(f"OpenAI API 호출 실패: {str(e)}")
 
-    def process_csv_data(self, df):
-        """CSV 데이터 처리: 각 행의 빈 필드 채우기"""
-        for index, row in df.iterrows():
-            try:
-                if pd.isna(row["CKG_NM"]):
-                    continue
-                self._process_single_row(index, row, df)
-            except Exception as e:
-                print(f"Error processing recipe {row['CKG_NM']}: {str(e)}")
+    def process_csv_data(
+        self,
+        df,
+        concurrency=None,
+        requests_per_minute=None,
+        batch_size=None,
+        checkpoint_path=None,
+        log=print,
+    ):
+        """
+        CSV 데이터 처리: 각 행의 빈 필드 채우기
+        - 빈 필드는 컬럼 단위로 한 번에 찾고, 행들은 스레드 풀에서 동시에 처리 (분당 요청 수 제한)
+        - 조리시간/인분은 batch_size개 요리씩 한 번에 요청
+        - checkpoint_path를 주면 완료된 행을 기록하여 다시 실행할 때 이어서 처리
+        """
+        enrich_csv_data(
+            df,
+            self,
+            concurrency=concurrency,
+            requests_per_minute=requests_per_minute,
+            batch_size=batch_size,
+            checkpoint_path=checkpoint_path,
+            log=log,
+        )
         return df
 
-    def _process_single_row(self, index, row, df):
-        """단일 행 처리 - 빈 필드만 AI로 채움"""
-        if self._is_empty_field(row["CKG_TIME_NM"]):
-            cooking_time = self.fill_missing_data(row["CKG_NM"], "조리시간")
-            df.at[index, "CKG_TIME_NM"] = cooking_time
-
-        if self._is_empty_field(row["CKG_INBUN_NM"]):
-            servings = self.fill_missing_data(row["CKG_NM"], "인분")
-            df.at[index, "CKG_INBUN_NM"] = servings
-
-        # 수정됨: 재료(CKG_MTRL_CN)가 아닌 AI 생성 조리방법 컬럼(CKG_METHOD_CN) 업데이트
-        if self._is_empty_field(row["CKG_METHOD_CN"]):
-            cooking_method = self.fill_missing_data(row["CKG_NM"], "조리방법")
-            df.at[index, "CKG_METHOD_CN"] = cooking_method
-
-    @staticmethod
-    def _is_empty_field(field):
-        """필드가 비어있는지 확인"""
-        return pd.isna(field) or str(field).strip() == ""
-
 
 class ChatbotMessageView(APIView):
     def get(self, request):
         # 수정: 정확히 5개의 추천 레시피 목록 반환
-        recipes = Recipe.objects.all()[:5]
-        recipe_list = RecipeListSerializer(recipes, many=True).data
+        recipe_list = list_items_for_queryset(Recipe.objects.all()[:5])
         return Response(
             {"status": "success", "response": {"recipes": recipe_list[:5]}},
             status=status.HTTP_200_OK,
@@ -118,8 +142,7 @@ class ChatbotMessageView(APIView):
 
     def get(self, request):
         """GET 요청: 5개의 추천 레시피 목록 반환"""
-        recipes = Recipe.objects.all()[:5]
-        recipe_list = RecipeListSerializer(recipes, many=True).data
+        recipe_list = list_items_for_queryset(Recipe.objects.all()[:5])
         return Response(
             {"status": "success", "response": {"recipes": recipe_list}},
             status=status.HTTP_200_OK,
@@ -160,183 +183,61 @@ class ChatbotMessageView(APIView):
             ]
 
             # DB에서 레시피 검색 (ID와 이름 중복 없이)
-            recipe_list = []
             found_recipe_ids = set()
             found_recipe_names = set()
 
-            # 전체 쿼리
-            recipes_query = Recipe.objects.filter(CKG_NM__icontains=user_message)
-
-            # 필터 적용
-            recipes_query = self._apply_filters(
-                recipes_query, time_filters, serving_size
-            )
-
-            # 결과 처리
-            for recipe in recipes_query:
-                if (
-                    recipe.id not in found_recipe_ids
-                    and recipe.CKG_NM not in found_recipe_names
-                    and len(recipe_list) < 5
-                ):
-                    found_recipe_ids.add(recipe.id)
-                    found_recipe_names.add(recipe.CKG_NM)
-                    recipe_list.append(RecipeListSerializer(recipe).data)
-
-            # 단어별 검색으로 더 찾기
-            if len(recipe_list) < 5:
-                for term in search_terms:
-                    if len(term) < 2:  # 너무 짧은 검색어 건너뛰기
-                        continue
-
-                    # 이름으로 검색
-                    name_query = Recipe.objects.filter(CKG_NM__icontains=term)
-                    name_query = self._apply_filters(
-                        name_query, time_filters, serving_size
-                    )
-
-                    for recipe in name_query:
-                        if (
-                            recipe.id not in found_recipe_ids
-                            and recipe.CKG_NM not in found_recipe_names
-                            and len(recipe_list) < 5
-                        ):
-                            found_recipe_ids.add(recipe.id)
-                            found_recipe_names.add(recipe.CKG_NM)
-                            recipe_list.append(RecipeListSerializer(recipe).data)
-
-                    # 재료로 검색
-                    ingredient_query = Recipe.objects.filter(
-                        CKG_MTRL_CN__icontains=term
-                    )
-                    ingredient_query = self._apply_filters(
-                        ingredient_query, time_filters, serving_size
-                    )
-
-                    for recipe in ingredient_query:
-                        if (
-                            recipe.id not in found_recipe_ids
-                            and recipe.CKG_NM not in found_recipe_names
-                            and len(recipe_list) < 5
-                        ):
-                            found_recipe_ids.add(recipe.id)
-                            found_recipe_names.add(recipe.CKG_NM)
-                            recipe_list.append(RecipeListSerializer(recipe).data)
-
-                    # 충분히 찾았으면 중단
-                    if len(recipe_list) >= 5:
-                        break
+            catalog = get_catalog()
+            if catalog is not None:
+                # 메모리 카탈로그에서 이름/재료 검색
+                recipe_ids = catalog.search_ids(
+                    user_message, search_terms, time_filters, serving_size, limit=5
+                )
+            else:
+                # 이름/재료 검색, 점수 계산, 이름 중복 제거, 필터를 쿼리 한 번으로 처리
+                recipe_ids = rank_recipe_ids(
+                    user_message, search_terms, time_filters, serving_size, limit=5
+                )
+
+            # 최종 레시피만 PK로 목록 컬럼 조회 (쿼리 한 번)
+            recipe_list = list_items_for_ids(recipe_ids)
+            for item in recipe_list:
+                found_recipe_ids.add(item["id"])
+                found_recipe_names.add(item["CKG_NM"])
+
+            # 노출 기록 (조리 방법 사전 생성 우선순위에 사용)
+            record_shown(found_recipe_ids)
 
             # 5개 미만이면 AI로 생성 (필터에 맞게 설정)
             if len(recipe_list) < 5:
                 missing_count = 5 - len(recipe_list)
-                client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
 
                 # 조리시간과 인분 기본값 설정
                 default_time = self._get_default_time(time_filters)
                 default_servings = serving_size if serving_size else "2인분"
 
-                for i in range(missing_count):
-                    # 검색어와 필터를 반영한 레시피 생성
-                    search_keyword = (
-                        random.choice(search_terms)
-                        if search_terms
-                        else user_message[:10]
-                    )
-
-                    prompt = f"""
-                    '{user_message}' 관련된 맛있는 음식 레시피를 하나만 생성해주세요.
-                    다음 형식으로 정확하게 응답해 주세요:
-                    
-                    CKG_NM: [요리 이름]
-                    CKG_MTRL_CN: [사용된 재료 목록, 세로 막대(|)로 구분]
-                    CKG_INBUN_NM: {default_servings}
-                    CKG_TIME_NM: {default_time}
-                    """
-
-                    try:
-                        response = client.chat.completions.create(
-                            model=settings.GPT_MODEL_NAME,
-                            messages=[
-                                {
-                                    "role": "system",
-                                    "content": settings.SYSTEM_RECIPE_EXPERT,
-                                },
-                                {"role": "user", "content": prompt},
-                            ],
-                            temperature=0.7,
-                            max_tokens=500,
-                        )
-
-                        # 생성된 응답 파싱
-                        ai_recipe = response.choices[0].message.content
-                        recipe_data = {}
-
-                        # 줄별로 처리하여 필드 추출
-                        for line in ai_recipe.strip().split("\n"):
-                            if ":" in line:
-                                key, value = line.split(":", 1)
-                                key = key.strip()
-                                value = value.strip()
-                                recipe_data[key] = value
-
-                        # 레시피 이름 중복 확인
-                        recipe_name = recipe_data.get(
-                            "CKG_NM", f"{user_message} 추천 레시피"
-                        )
-
-                        # 이름이 중복되지 않는 경우에만 저장
-                        if recipe_name not in found_recipe_names:
-                            # 기본 이미지 URL 설정
-                            default_image_url = settings.DEFAULT_RECIPE_IMAGE_PATH
-
-                            # DB에 저장
-                            new_recipe = Recipe.objects.create(
-                                CKG_NM=recipe_name,
-                                CKG_MTRL_CN=recipe_data.get("CKG_MTRL_CN", ""),
-                                CKG_INBUN_NM=recipe_data.get(
-                                    "CKG_INBUN_NM", default_servings
-                                ),
-                                CKG_TIME_NM=recipe_data.get(
-                                    "CKG_TIME_NM", default_time
-                                ),
-                                RCP_IMG_URL=default_image_url,
-                            )
-
-                            # 조리 방법 생성 및 저장
-                            instructions_prompt = f"""
-                            레시피 이름: {new_recipe.CKG_NM}
-                            필요한 재료: {new_recipe.CKG_MTRL_CN}
-                            조리 시간: {new_recipe.CKG_TIME_NM}
-                            인분: {new_recipe.CKG_INBUN_NM}
-                            
-                            위 레시피의 상세한 조리 방법을 단계별로 설명해주세요.
-                            """
-
-                            instructions_response = client.chat.completions.create(
-                                model=settings.GPT_MODEL_NAME,
-                                messages=[
-                                    {
-                                        "role": "system",
-                                        "content": settings.SYSTEM_RECIPE_EXPERT,
-                                    },
-                                    {"role": "user", "content": instructions_prompt},
-                                ],
-                                temperature=0.7,
-                                max_tokens=1000,
-                            )
-
-                            # 조리 방법 저장
-                            new_recipe.CKG_METHOD_CN = instructions_response.choices[
-                                0
-                            ].message.content
-                            new_recipe.save()
-
-                            # 결과 목록에 추가
-                            recipe_list.append(RecipeListSerializer(new_recipe).data)
-                            found_recipe_names.add(recipe_name)
-                    except Exception as e:
-                        print(f"레시피 생성 실패: {str(e)}")
+                prompt = f"""
+                '{user_message}' 관련된 맛있는 음식 레시피를 하나만 생성해주세요.
+                다음 형식으로 정확하게 응답해 주세요:
+
+                CKG_NM: [요리 이름]
+                CKG_MTRL_CN: [사용된 재료 목록, 세로 막대(|)로 구분]
+                CKG_INBUN_NM: {default_servings}
+                CKG_TIME_NM: {default_time}
+                """
+
+                # AI 레시피 생성 (한 번에 일괄 생성, 실패하면 개별 동시 생성 / 이름 중복 없이)
+                new_recipes = generate_missing_recipes(
+                    prompt,
+                    user_message,
+                    missing_count,
+                    found_recipe_names,
+                    default_time,
+                    default_servings,
+                    fallback_name=lambda i: f"{user_message} 추천 레시피",
+                    time_filters=time_filters,
+                    serving_size=serving_size,
+                )
+                recipe_list.extend(list_items_for_recipes(new_recipes))
 
             return {
                 "response": "아래 메뉴 중에서 선택해주세요!",
@@ -346,42 +247,6 @@ class ChatbotMessageView(APIView):
         except Exception as e:
             raise Exception(f"레시피 검색 실패: {str(e)}")
 
-    # 필터 적용 헬퍼 메서드
-    def _apply_filters(self, query, time_filters, serving_size):
-        # 조리시간 필터 적용
-        if time_filters:
-            time_conditions = Q()
-            for time_filter in time_filters:
-                if time_filter == "5분 이내":
-                    time_conditions |= Q(CKG_TIME_NM__icontains="5분") | Q(
-                        CKG_TIME_NM__regex=r"^[1-5]분$"
-                    )
-                elif time_filter == "5~15분":
-                    time_conditions |= Q(CKG_TIME_NM__regex=r"^(([5-9]|1[0-5]))분$")
-                elif time_filter == "15~30분":
-                    time_conditions |= Q(CKG_TIME_NM__regex=r"^(1[5-9]|2[0-9]|30)분$")
-                elif time_filter == "30분 이상":
-                    time_conditions |= Q(
-                        CKG_TIME_NM__regex=r"^([3-9][0-9]|[1-9][0-9]{2,})분$"
-                    )
-
-            query = query.filter(time_conditions)
-
-        # 인분 필터 적용
-        if serving_size:
-            if serving_size == "1인분":
-                query = query.filter(CKG_INBUN_NM__icontains="1인분")
-            elif serving_size == "2인분":
-                query = query.filter(CKG_INBUN_NM__icontains="2인분")
-            elif serving_size == "4인분":
-                query = query.filter(CKG_INBUN_NM__icontains="4인분")
-            elif serving_size == "6인분 이상":
-                query = query.filter(
-                    Q(CKG_INBUN_NM__regex=r"^([6-9]|[1-9][0-9]+)인분$")
-                )
-
-        return query
-
     # AI 레시피 생성 시 기본 조리시간 선택
     def _get_default_time(self, time_filters):
         if not time_filters:
@@ -402,38 +267,13 @@ class ChatbotMessageView(APIView):
         return "30분"  # 기본값
 
     def _get_recent_chat_history(self, session_id, max_turns=settings.MAX_CHAT_TURNS):
-        """최근 채팅 기록 불러오기 (최대 max_turns 만큼)"""
-        chat_logs = ChatLog.objects.filter(session_id=session_id).order_by(
-            "-timestamp"  # created_at → timestamp
-        )[:max_turns]
-        history = []
-        for log in reversed(chat_logs):
-            history.extend(
-                [
-                    {
-                        "role": "user" if log.is_user else "assistant",
-                        "content": log.message,
-                    }
-                ]
-            )
-        return history
+        """최근 채팅 기록 불러오기 (최대 max_turns 만큼, 세션별 메모리 창 사용)"""
+        return get_recent_history(session_id, max_turns)
 
     def _save_chat_log(self, session_id, user_message, response_data):
-        """채팅 로그 저장: 사용자와 AI 메시지 각각 별도 저장"""
+        """채팅 로그 저장: 사용자와 AI 메시지를 한 번에 저장"""
         try:
-            # 사용자 메시지 저장
-            ChatLog.objects.create(
-                session_id=session_id,
-                message=user_message,  # user_input → message
-                is_user=True,
-            )
-
-            # AI 응답 저장
-            ChatLog.objects.create(
-                session_id=session_id,
-                message=response_data["response"],  # recommended_recipes → message
-                is_user=False,
-            )
+            save_chat_turn(session_id, user_message, response_data["response"])
         except Exception:
             raise Exception(settings.CHAT_SAVE_ERROR)
 
@@ -451,3 +291,11 @@ class ChatbotMessageView(APIView):
         return Response(
             {"status": settings.STATUS_ERROR, "message": message}, status=status_code
         )
+
+
+@api_view(["GET"])
+def chat_log_writer_stats(request):
+    """대화 기록 지연 저장 대기열 길이와 저장 지연 시간 (현재 프로세스 기준)"""
+    return Response(
+        {"status": settings.STATUS_SUCCESS, "writer": chat_log_writer.stats()}
+    )
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_asgi_application()
+
+# 메모리 카탈로그를 사용하면 요청을 받기 전에 적재
+from recipe.catalog import warm_catalog  # noqa: E402
+
+warm_catalog()
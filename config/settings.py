@@ -13,12 +13,12 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 import os
 from pathlib import Path
 from dotenv import load_dotenv
-import openai
 import os
 
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-client = openai.OpenAI(api_key=OPENAI_API_KEY)
+# OpenAI 호환 서버 주소 (프록시, 로컬 테스트 서버 등, 비어 있으면 기본 API)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
 
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -153,6 +153,95 @@ UNKNOWN_ERROR = "알 수 없는 오류가 발생했습니다."
 
 # 설정값
 MAX_CHAT_TURNS = 5
+CHAT_HISTORY_CACHE_SESSIONS = 10000  # 최근 대화 창을 메모리에 유지할 세션 수 (LRU)
+CHAT_HISTORY_CACHE_TTL = 300  # 대화 창을 DB에서 다시 불러오는 주기 (초)
+
+# 대화 기록 보관 (archive_chat_logs 명령어)
+CHAT_LOG_RETENTION_DAYS = 90  # DB에 남겨 둘 기간 (일), 이보다 오래된 기록은 파일로 보관
+CHAT_LOG_ARCHIVE_DIR = BASE_DIR / "archive" / "chat_logs"  # 날짜별 압축 파일 저장 위치
+CHAT_LOG_ARCHIVE_BATCH_SIZE = 1000  # 한 번에 읽고 삭제할 행 수
+
+# 대화 기록 지연 저장 (응답 후 백그라운드 스레드에서 모아서 저장)
+CHAT_LOG_WRITE_BEHIND = False  # True면 요청 처리 중에 DB에 쓰지 않음
+CHAT_LOG_QUEUE_SIZE = 10000  # 저장 대기열 최대 길이
+CHAT_LOG_FLUSH_ROWS = 200  # 이만큼 모이면 바로 저장
+CHAT_LOG_FLUSH_INTERVAL_MS = 500  # 최대 저장 주기 (밀리초)
+CHAT_LOG_QUEUE_PUT_TIMEOUT = (
+    1.0  # 대기열이 가득 찼을 때 기다릴 시간 (초), 넘으면 직접 저장
+)
+CHAT_LOG_WRITE_RETRIES = 3  # 일괄 저장 실패 시 재시도 횟수, 이후 한 건씩 저장
+CHAT_LOG_WRITE_RETRY_BACKOFF_MS = 200  # 첫 재시도 대기 시간 (밀리초), 이후 두 배씩 증가
 GPT_MODEL_NAME = "gpt-4o-mini"
 SYSTEM_RECIPE_EXPERT = "당신은 요리 전문가입니다."
 SYSTEM_RECIPE_FINDER = "사용자가 찾는 레시피나 음식을 파악해주세요."
+
+# 레시피 CSV 가져오기 (import_recipes 명령어)
+RECIPE_IMPORT_CHUNK_SIZE = 5000  # 한 번에 읽어서 저장할 행 수 (메모리 사용량 결정)
+
+# 레시피 CSV 빈 필드 AI 채우기 (enrich_recipe_csv 명령어)
+CSV_ENRICH_CONCURRENCY = 4  # 동시에 처리할 행 수
+CSV_ENRICH_RPM = 60  # 분당 최대 LLM 요청 수
+CSV_ENRICH_BATCH_SIZE = 50  # 조리시간/인분을 한 번에 요청할 요리 수
+
+# AI 레시피 생성 (부족한 추천 레시피 채우기)
+AI_RECIPE_MAX_CONCURRENCY = 5  # 요청당 동시 생성 수
+AI_RECIPE_DEADLINE = 30  # 요청당 생성 제한 시간 (초)
+AI_RECIPE_BATCH_GENERATION = True  # LLM 호출 한 번으로 부족한 레시피를 모두 생성
+
+# 조리 방법 사전 생성 워커 (manage.py pregenerate_instructions)
+INSTRUCTION_PREGEN_CONCURRENCY = 4  # 동시 생성 수
+INSTRUCTION_PREGEN_RPM = 60  # 분당 최대 LLM 요청 수
+INSTRUCTION_PREGEN_BATCH_SIZE = 20  # 한 번에 가져와 생성할 레시피 수
+INSTRUCTION_PREGEN_SAVE_BATCH_SIZE = 5  # 끝난 결과를 모아서 한 번에 저장할 수
+INSTRUCTION_PREGEN_SAVE_INTERVAL = 2.0  # 끝난 결과를 저장 전까지 모아 둘 최대 시간 (초)
+# 같은 레시피 조리 방법을 다른 요청이 생성 중일 때 기다릴 최대 시간 (초)
+INSTRUCTION_LOCK_TIMEOUT = 60
+
+# LLM 호출 (recipe/llm.py - 프로세스 전역 클라이언트, 연결 풀 공유)
+LLM_TIMEOUT = 60  # 응답 대기 시간 (초)
+LLM_CONNECT_TIMEOUT = 5  # 연결 시간 (초)
+LLM_MAX_RETRIES = 3  # 429/5xx/연결 오류 재시도 횟수
+LLM_RETRY_BASE_DELAY = 0.5  # 지수 백오프 기본 대기 시간 (초)
+LLM_RETRY_MAX_DELAY = 8  # 재시도 최대 대기 시간 (초)
+LLM_MAX_CONNECTIONS = 50  # 연결 풀 최대 연결 수
+LLM_MAX_KEEPALIVE_CONNECTIONS = 20  # 유지할 유휴 연결 수
+LLM_KEEPALIVE_EXPIRY = 30  # 유휴 연결 유지 시간 (초)
+
+# LLM 응답 캐시 (같은 모델/메시지/파라미터 요청 재사용, 재시작 후에도 유지)
+LLM_CACHE_ENABLED = True
+LLM_CACHE_MAX_ENTRIES = 1000  # 메모리에 유지할 응답 수 (LRU)
+LLM_CACHE_TTL = 60 * 60 * 24 * 7  # 초
+LLM_CACHE_PATH = BASE_DIR / ".cache" / "llm_responses.sqlite3"
+
+# 요리 이름 검색 색인: "auto"(MySQL이면 FULLTEXT ngram, 그 외 bigram 테이블), "fulltext", "ngram"
+RECIPE_NAME_SEARCH_BACKEND = os.getenv("RECIPE_NAME_SEARCH_BACKEND", "auto")
+
+# 메모리 레시피 카탈로그 (서버 시작 시 또는 처음 사용할 때 적재, 필터/샘플링/검색을 DB 없이 처리)
+RECIPE_CATALOG_ENABLED = os.getenv("RECIPE_CATALOG_ENABLED", "0") == "1"
+RECIPE_CATALOG_SYNC_INTERVAL = 30  # 다른 프로세스의 신규 레시피 확인 주기 (초)
+# 카탈로그를 사용할 때 서버(WSGI/ASGI) 시작 시 미리 적재 (첫 요청이 적재를 기다리지 않음)
+RECIPE_CATALOG_WARM_ON_START = os.getenv("RECIPE_CATALOG_WARM_ON_START", "1") == "1"
+
+# 추천 레시피 풀 (python manage.py build_recipe_pools로 생성, 신규 레시피는 저장 시 추가)
+RECIPE_POOL_SYNC_INTERVAL = 30  # 다른 프로세스에서 바뀐 풀 확인 주기 (초)
+RECIPE_POOL_REBUILD_INTERVAL = (
+    3600  # build_recipe_pools --loop 전체 재생성 주기 (초, 조리시간/인분 수정 반영)
+)
+
+# 레시피 상세 응답 캐시 (저장 시 무효화, 다른 프로세스의 변경은 TTL 후 반영)
+RECIPE_DETAIL_CACHE_TTL = 60  # 초
+RECIPE_VIEW_FLUSH_INTERVAL = 10  # 조회수/노출 기록을 모아서 DB에 반영하는 주기 (초)
+
+# 레시피 필터 API 페이지네이션 (id 기준 커서)
+RECIPE_FILTER_PAGE_SIZE = 50  # limit 미지정 시 페이지 크기
+RECIPE_FILTER_MAX_PAGE_SIZE = 500  # limit 최대값
+RECIPE_FILTER_STREAM_BATCH_SIZE = 1000  # format=ndjson 스트리밍 시 한 번에 조회할 행 수
+
+# 기본 캐시 (프로세스별 메모리) - 여러 프로세스가 무효화를 공유하려면 Redis/Memcached로 변경
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "recipick",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+}
@@ -0,0 +1,106 @@
+import atexit
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Recipe
+
+
+# 노출 기록 UPDATE 한 번에 포함할 레시피 수 (IN 목록 크기 제한)
+SHOWN_FLUSH_BATCH_SIZE = 1000
+# 아직 DB에 반영하지 않은 조회수 {레시피 id: 증가분}, 노출된 레시피 id
+_pending_views = Counter()
+_pending_shown = set()
+_pending_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def _flush_if_due():
+    """마지막 반영 후 RECIPE_VIEW_FLUSH_INTERVAL초가 지났으면 모아 둔 조회수/노출 기록 반영"""
+    global _last_flush
+    with _pending_lock:
+        due = time.monotonic() - _last_flush >= settings.RECIPE_VIEW_FLUSH_INTERVAL
+        if due:
+            _last_flush = time.monotonic()
+    if due:
+        flush_activity()
+
+
+def record_shown(recipe_ids):
+    """
+    추천/검색 결과로 노출된 레시피 기록
+    - 메모리에 모아 두었다가 조회수와 함께 한 번에 최근 노출 시각 갱신 (요청마다 UPDATE하지 않음)
+    """
+    recipe_ids = [recipe_id for recipe_id in recipe_ids if recipe_id is not None]
+    if not recipe_ids:
+        return
+    with _pending_lock:
+        _pending_shown.update(recipe_ids)
+    _flush_if_due()
+
+
+def record_view(recipe_id):
+    """
+    레시피 상세 조회수 증가
+    - 메모리에 모아 두었다가 RECIPE_VIEW_FLUSH_INTERVAL초마다 한 번에 반영 (조회마다 UPDATE하지 않음)
+    """
+    with _pending_lock:
+        _pending_views[recipe_id] += 1
+    _flush_if_due()
+
+
+def flush_views():
+    """모아 둔 조회수를 DB에 반영 (증가분이 같은 레시피끼리 UPDATE 한 번)"""
+    global _pending_views
+    with _pending_lock:
+        pending, _pending_views = _pending_views, Counter()
+    if not pending:
+        return
+
+    by_count = defaultdict(list)
+    for recipe_id, count in pending.items():
+        by_count[count].append(recipe_id)
+    try:
+        for count, recipe_ids in by_count.items():
+            # update()는 updated_at(auto_now)을 바꾸지 않음 (상세 응답 캐시 유지)
+            Recipe.objects.filter(id__in=recipe_ids).update(
+                view_count=F("view_count") + count
+            )
+    except DatabaseError as e:
+        print(f"레시피 조회수 기록 실패: {str(e)}")
+
+
+def flush_shown():
+    """
+    모아 둔 노출 기록을 DB에 반영 (UPDATE 한 번)
+    - 최근 노출 시각은 반영 시각으로 기록 (최대 RECIPE_VIEW_FLUSH_INTERVAL초 늦음, 우선순위 계산에는 충분)
+    """
+    global _pending_shown
+    with _pending_lock:
+        pending, _pending_shown = _pending_shown, set()
+    if not pending:
+        return
+    pending = sorted(pending)
+    shown_at = timezone.now()
+    try:
+        for start in range(0, len(pending), SHOWN_FLUSH_BATCH_SIZE):
+            # update()는 updated_at(auto_now)을 바꾸지 않음
+            Recipe.objects.filter(
+                id__in=pending[start : start + SHOWN_FLUSH_BATCH_SIZE]
+            ).update(last_shown_at=shown_at)
+    except DatabaseError as e:
+        print(f"레시피 노출 기록 실패: {str(e)}")
+
+
+def flush_activity():
+    """모아 둔 조회수와 노출 기록 반영"""
+    flush_views()
+    flush_shown()
+
+
+atexit.register(flush_activity)
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class RecipeConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "recipe"
\ No newline at end of file
+    name = "recipe"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,424 @@
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db import DatabaseError
+
+from .filters import SERVING_BUCKETS, TIME_BUCKETS
+from .models import Ingredient, Recipe, RecipeIngredient
+from .search import ingredient_search_term
+
+# 조리시간/인분 값이 없는 경우
+MISSING = -1
+# 문자열 사전에서 항목 사이 구분자 (이름에 들어갈 수 없는 문자)
+SEPARATOR = "\n"
+
+
+def normalize_recipe_name(name):
+    """이름 중복 판단용 요리 이름 정규화 (공백 정리, 소문자화)"""
+    return " ".join(str(name or "").split()).lower()
+
+
+class StringDictionary:
+    """
+    문자열 사전 - 코드(정수) <-> 문자열
+    - 모든 문자열을 구분자로 이어 붙인 하나의 텍스트로 보관하여 부분 문자열 검색을 C 수준 str.find로 처리
+    """
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+        self._text = None
+        self._offsets = None
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+            self._text = None
+        return code
+
+    def _build(self):
+        if self._text is None:
+            self._text = SEPARATOR + SEPARATOR.join(self.values) + SEPARATOR
+            lengths = np.fromiter(
+                (len(value) + 1 for value in self.values),
+                dtype=np.int64,
+                count=len(self.values),
+            )
+            self._offsets = np.concatenate(([0], np.cumsum(lengths)))[:-1]
+
+    def _positions(self, needle):
+        positions = []
+        start = self._text.find(needle)
+        while start != -1:
+            positions.append(start)
+            start = self._text.find(needle, start + 1)
+        return np.asarray(positions, dtype=np.int64)
+
+    def _to_codes(self, positions):
+        if positions.size == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.searchsorted(self._offsets, positions, side="right") - 1)
+
+    def contains(self, needle):
+        """needle을 포함하는 문자열의 코드 배열"""
+        self._build()
+        if not needle or SEPARATOR in needle:
+            return np.empty(0, dtype=np.int64)
+        return self._to_codes(self._positions(needle))
+
+    def startswith(self, prefix):
+        """prefix로 시작하는 문자열의 코드 배열"""
+        self._build()
+        if not prefix or SEPARATOR in prefix:
+            return np.empty(0, dtype=np.int64)
+        return self._to_codes(self._positions(SEPARATOR + prefix) + 1)
+
+
+class RecipeCatalog:
+    """
+    메모리 내 컬럼형 레시피 카탈로그 (NumPy 배열)
+    - 레시피 행마다 id, 정규화된 이름 코드, 조리시간(분), 인분, 재료 id(CSR)만 보관
+    - 필터/샘플링/이름 중복 제거/검색을 벡터 연산으로 처리하고, DB는 최종 레시피 PK 조회에만 사용
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.loaded = False
+        self.loaded_at = None
+        self.synced_at = 0.0
+        self._reset()
+
+    def _reset(self):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.name_codes = np.empty(0, dtype=np.int32)
+        self.minutes = np.empty(0, dtype=np.int32)
+        self.servings = np.empty(0, dtype=np.int32)
+        # 레시피별 재료 id: ingredient_ids[indptr[i]:indptr[i + 1]]
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.ingredient_ids = np.empty(0, dtype=np.int64)
+        self.names = StringDictionary()
+        self.ingredients = StringDictionary()
+        self.ingredient_pks = np.empty(0, dtype=np.int64)  # 재료 코드 -> 재료 id
+        self._positions = {}
+        self._pending = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    # ------------------------------------------------------------------
+    # 적재 및 갱신
+    # ------------------------------------------------------------------
+    def load(self):
+        """DB 전체 레시피를 컬럼 배열로 적재"""
+        with self._lock:
+            self._reset()
+            self._load_ingredient_names()
+            rows = Recipe.objects.order_by("id").values_list(
+                "id", "CKG_NM", "cook_minutes", "serving_count"
+            )
+            links = self._load_links()
+            self._append(rows.iterator(chunk_size=5000), links)
+            self.loaded = True
+            self.loaded_at = time.time()
+            self.synced_at = time.monotonic()
+
+    def _load_ingredient_names(self, pks=None):
+        queryset = Ingredient.objects.order_by("id")
+        if pks is not None:
+            queryset = queryset.filter(id__in=pks)
+        added = []
+        for pk, name in queryset.values_list("id", "name").iterator():
+            if self.ingredients.encode(name) == len(self.ingredient_pks) + len(added):
+                added.append(pk)
+        if added:
+            self.ingredient_pks = np.concatenate(
+                (self.ingredient_pks, np.asarray(added, dtype=np.int64))
+            )
+
+    @staticmethod
+    def _load_links(recipe_ids=None):
+        queryset = RecipeIngredient.objects.order_by("recipe_id")
+        if recipe_ids is not None:
+            queryset = queryset.filter(recipe_id__in=recipe_ids)
+        links = {}
+        for recipe_id, ingredient_id in queryset.values_list(
+            "recipe_id", "ingredient_id"
+        ).iterator():
+            links.setdefault(recipe_id, []).append(ingredient_id)
+        return links
+
+    def _append(self, rows, links):
+        ids, name_codes, minutes, servings = [], [], [], []
+        counts, ingredient_ids = [], []
+        for recipe_id, name, cook_minutes, serving_count in rows:
+            recipe_links = links.get(recipe_id, [])
+            ids.append(recipe_id)
+            name_codes.append(self.names.encode(normalize_recipe_name(name)))
+            minutes.append(MISSING if cook_minutes is None else cook_minutes)
+            servings.append(MISSING if serving_count is None else serving_count)
+            counts.append(len(recipe_links))
+            ingredient_ids.extend(recipe_links)
+
+        if not ids:
+            return
+
+        start = len(self.ids)
+        self.ids = np.concatenate((self.ids, np.asarray(ids, dtype=np.int64)))
+        self.name_codes = np.concatenate(
+            (self.name_codes, np.asarray(name_codes, dtype=np.int32))
+        )
+        self.minutes = np.concatenate((self.minutes, np.asarray(minutes, np.int32)))
+        self.servings = np.concatenate((self.servings, np.asarray(servings, np.int32)))
+        self.indptr = np.concatenate(
+            (self.indptr, self.indptr[-1] + np.cumsum(counts, dtype=np.int64))
+        )
+        self.ingredient_ids = np.concatenate(
+            (self.ingredient_ids, np.asarray(ingredient_ids, dtype=np.int64))
+        )
+        for offset, recipe_id in enumerate(ids):
+            self._positions[recipe_id] = start + offset
+
+    def refresh(self, recipe_ids):
+        """저장된 레시피를 카탈로그에 반영 (다음 조회 시 한 번에 병합)"""
+        if not self.loaded:
+            return
+        with self._lock:
+            self._pending.update(dict.fromkeys(recipe_ids))
+
+    def sync(self):
+        """다른 프로세스에서 추가된 레시피(id가 더 큰 행)를 반영"""
+        if not self.loaded:
+            return
+        with self._lock:
+            last_id = int(self.ids[-1]) if len(self.ids) else 0
+            new_ids = Recipe.objects.filter(id__gt=last_id).values_list("id", flat=True)
+            self._pending.update(dict.fromkeys(new_ids))
+            self.synced_at = time.monotonic()
+
+    def _merge_pending(self):
+        with self._lock:
+            if not self._pending:
+                return
+            recipe_ids = list(self._pending)
+            self._pending = {}
+
+            rows = list(
+                Recipe.objects.filter(id__in=recipe_ids)
+                .order_by("id")
+                .values_list("id", "CKG_NM", "cook_minutes", "serving_count")
+            )
+            links = self._load_links(recipe_ids)
+            known_pks = set(self.ingredient_pks.tolist())
+            new_pks = {
+                pk for pks in links.values() for pk in pks if pk not in known_pks
+            }
+            if new_pks:
+                self._load_ingredient_names(new_pks)
+
+            # 이미 있는 행은 제자리에서 갱신 (재료 목록이 바뀐 행은 모아서 CSR 배열만 다시 구성)
+            new_rows = []
+            changed_links = {}
+            for row in rows:
+                position = self._positions.get(row[0])
+                if position is None:
+                    new_rows.append(row)
+                    continue
+                recipe_id, name, cook_minutes, serving_count = row
+                self.name_codes[position] = self.names.encode(
+                    normalize_recipe_name(name)
+                )
+                self.minutes[position] = (
+                    MISSING if cook_minutes is None else cook_minutes
+                )
+                self.servings[position] = (
+                    MISSING if serving_count is None else serving_count
+                )
+                current = self.ingredient_ids[
+                    self.indptr[position] : self.indptr[position + 1]
+                ]
+                if sorted(current.tolist()) != sorted(links.get(recipe_id, [])):
+                    changed_links[position] = links.get(recipe_id, [])
+
+            if changed_links:
+                self._replace_links(changed_links)
+            self._append(new_rows, links)
+
+    def _replace_links(self, changed_links):
+        """
+        {행 위치: 재료 id 목록}으로 해당 행의 재료만 교체 (DB 재조회 없이 배열 연산)
+        - 바뀌지 않은 행의 (행, 재료) 쌍에 새 쌍을 더해 행 순서로 안정 정렬한 뒤 CSR 재구성
+        """
+        counts = np.diff(self.indptr)
+        rows = np.repeat(np.arange(len(self.ids), dtype=np.int64), counts)
+        positions = np.fromiter(changed_links, dtype=np.int64, count=len(changed_links))
+        keep = ~np.isin(rows, positions)
+
+        new_rows = np.repeat(
+            positions, [len(pks) for pks in changed_links.values()]
+        ).astype(np.int64)
+        new_pks = np.fromiter(
+            (pk for pks in changed_links.values() for pk in pks), dtype=np.int64
+        )
+        rows = np.concatenate((rows[keep], new_rows))
+        ingredient_ids = np.concatenate((self.ingredient_ids[keep], new_pks))
+        order = np.argsort(rows, kind="stable")
+
+        counts[positions] = [len(pks) for pks in changed_links.values()]
+        self.ingredient_ids = ingredient_ids[order]
+        self.indptr = np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+
+    def _prepare(self):
+        """조회 전 대기 중인 갱신 병합 및 주기적 동기화"""
+        interval = getattr(settings, "RECIPE_CATALOG_SYNC_INTERVAL", 30)
+        if time.monotonic() - self.synced_at >= interval:
+            self.sync()
+        self._merge_pending()
+
+    # ------------------------------------------------------------------
+    # 벡터 연산
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _range_mask(values, bounds):
+        low, high = bounds
+        mask = values != MISSING
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+        return mask
+
+    def filter_mask(self, time_filters=None, serving_size=None):
+        """조리시간/인분 필터에 해당하는 행 마스크"""
+        mask = np.ones(len(self.ids), dtype=bool)
+
+        buckets = [TIME_BUCKETS[f] for f in time_filters or [] if f in TIME_BUCKETS]
+        if buckets:
+            time_mask = np.zeros(len(self.ids), dtype=bool)
+            for bounds in buckets:
+                time_mask |= self._range_mask(self.minutes, bounds)
+            mask &= time_mask
+
+        if serving_size in SERVING_BUCKETS:
+            mask &= self._range_mask(self.servings, SERVING_BUCKETS[serving_size])
+
+        return mask
+
+    def dedup_by_name(self, positions):
+        """행 위치 배열에서 이름이 처음 나온 행만 남김 (순서 유지)"""
+        positions = np.asarray(positions, dtype=np.int64)
+        if positions.size == 0:
+            return positions
+        _, first = np.unique(self.name_codes[positions], return_index=True)
+        return positions[np.sort(first)]
+
+    def _exclude_names_mask(self, exclude_names):
+        mask = np.ones(len(self.ids), dtype=bool)
+        codes = [
+            self.names.codes[name]
+            for name in map(normalize_recipe_name, exclude_names or [])
+            if name in self.names.codes
+        ]
+        if codes:
+            mask &= ~np.isin(self.name_codes, codes)
+        return mask
+
+    def _ingredient_row_mask(self, ingredient_pks):
+        """해당 재료 중 하나라도 가진 행 마스크 (CSR 구간별 any)"""
+        mask = np.zeros(len(self.ids), dtype=bool)
+        if len(ingredient_pks) == 0 or self.ingredient_ids.size == 0:
+            return mask
+        hits = np.isin(self.ingredient_ids, ingredient_pks)
+        rows = np.searchsorted(self.indptr, np.flatnonzero(hits), side="right") - 1
+        mask[rows] = True
+        return mask
+
+    def _term_ingredient_pks(self, term):
+        name = ingredient_search_term(
+            term, lambda prefix: self.ingredients.startswith(prefix).size > 0
+        )
+        if not name:
+            return np.empty(0, dtype=np.int64)
+        return self.ingredient_pks[np.unique(self.ingredients.startswith(name))]
+
+    def _name_row_mask(self, text):
+        name_mask = np.zeros(len(self.names.values), dtype=bool)
+        name_mask[self.names.contains(normalize_recipe_name(text))] = True
+        return name_mask[self.name_codes]
+
+    def sample_ids(self, k, time_filters=None, serving_size=None, exclude_names=()):
+        """필터에 맞는 레시피 중 이름 중복 없이 k개 id 무작위 추출"""
+        with self._lock:
+            self._prepare()
+            mask = self.filter_mask(time_filters, serving_size)
+            mask &= self._exclude_names_mask(exclude_names)
+            candidates = np.flatnonzero(mask)
+            if candidates.size == 0 or k <= 0:
+                return []
+
+            rng = np.random.default_rng()
+            # 대부분은 k의 몇 배만 뽑아도 이름이 겹치지 않음
+            size = min(candidates.size, k * 4)
+            picked = self.dedup_by_name(rng.choice(candidates, size, replace=False))
+            if len(picked) < k and size < candidates.size:
+                picked = self.dedup_by_name(rng.permutation(candidates))
+            return self.ids[picked[:k]].tolist()
+
+    def search_ids(self, message, terms, time_filters=None, serving_size=None, limit=5):
+        """
+        이름/재료 검색 후 관련도 순으로 이름 중복 없이 limit개 id 반환
+        - 메시지 전체가 이름에 포함: 4점, 단어가 이름에 포함: 2점, 단어가 재료에 포함: 1점
+        """
+        with self._lock:
+            self._prepare()
+            scores = np.zeros(len(self.ids), dtype=np.int32)
+            scores += 4 * self._name_row_mask(message)
+            for term in terms:
+                if len(term) < 2:  # 너무 짧은 검색어 건너뛰기
+                    continue
+                scores += 2 * self._name_row_mask(term)
+                scores += self._ingredient_row_mask(self._term_ingredient_pks(term))
+
+            scores[~self.filter_mask(time_filters, serving_size)] = 0
+            candidates = np.flatnonzero(scores)
+            if candidates.size == 0:
+                return []
+
+            ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+            return self.ids[self.dedup_by_name(ranked)[:limit]].tolist()
+
+
+catalog = RecipeCatalog()
+
+
+_load_lock = threading.Lock()
+
+
+def get_catalog():
+    """
+    카탈로그 반환 (비활성화되었거나 적재에 실패하면 None - DB 조회로 대체)
+    - 처음 사용할 때 적재 (앱 시작 시 DB를 조회하지 않으므로 migrate/check에 영향 없음)
+    - 서버는 warm_catalog()로 요청을 받기 전에 미리 적재
+    """
+    if not getattr(settings, "RECIPE_CATALOG_ENABLED", False):
+        return None
+    if not catalog.loaded:
+        with _load_lock:
+            if not catalog.loaded:
+                try:
+                    catalog.load()
+                except DatabaseError as e:
+                    # 마이그레이션 전 등 테이블이 없으면 DB 조회로 동작
+                    print(f"레시피 카탈로그 적재 실패: {str(e)}")
+                    return None
+    return catalog
+
+
+def warm_catalog():
+    """서버 시작 시(WSGI/ASGI) 카탈로그 미리 적재 (RECIPE_CATALOG_WARM_ON_START)"""
+    if getattr(settings, "RECIPE_CATALOG_WARM_ON_START", False):
+        get_catalog()
@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+
+from .models import Recipe
+from .serializers import RecipeDetailSerializer
+
+CACHE_KEY = "recipick:recipe-detail:{}"
+
+
+def _cache_key(recipe_id):
+    return CACHE_KEY.format(recipe_id)
+
+
+def get_recipe_detail(recipe_id):
+    """
+    레시피 상세 응답 read-through 캐시 - {"etag", "last_modified", "recipe"}
+    - ETag는 (id, updated_at)으로 만들어 내용이 바뀌면 달라짐
+    - 캐시가 없을 때만 DB 조회 + 직렬화 (없는 레시피는 Recipe.DoesNotExist)
+    """
+    entry = cache.get(_cache_key(recipe_id))
+    if entry is not None:
+        return entry
+
+    recipe = Recipe.objects.get(id=recipe_id)
+    updated_at = recipe.updated_at.timestamp()
+    entry = {
+        "etag": quote_etag(f"{recipe.pk}-{updated_at:.6f}"),
+        "last_modified": int(updated_at),
+        "recipe": dict(RecipeDetailSerializer(recipe).data),
+    }
+    cache.set(_cache_key(recipe_id), entry, settings.RECIPE_DETAIL_CACHE_TTL)
+    return entry
+
+
+def invalidate_recipe_detail(recipe_ids):
+    """레시피 저장/삭제 시 상세 응답 캐시 삭제"""
+    cache.delete_many([_cache_key(recipe_id) for recipe_id in recipe_ids])
+
+
+def detail_headers(entry):
+    # no-cache: 브라우저/클라이언트가 매번 If-None-Match로 다시 확인 (변경 없으면 304)
+    return {
+        "ETag": entry["etag"],
+        "Last-Modified": http_date(entry["last_modified"]),
+        "Cache-Control": "no-cache",
+    }
+
+
+def is_not_modified(request, entry):
+    """If-None-Match(우선) 또는 If-Modified-Since가 캐시된 응답과 같으면 True"""
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        etags = [etag.removeprefix("W/") for etag in parse_etags(if_none_match)]
+        return "*" in etags or entry["etag"] in etags
+
+    if_modified_since = parse_http_date_safe(request.headers.get("If-Modified-Since"))
+    return if_modified_since is not None and entry["last_modified"] <= if_modified_since
@@ -0,0 +1,81 @@
+from django.db.models import Q
+
+# UI 필터 버킷 -> (최소, 최대) 범위 (None은 제한 없음)
+TIME_BUCKETS = {
+    "5분 이내": (None, 5),
+    "5~15분": (5, 15),
+    "15~30분": (15, 30),
+    "30분 이상": (30, None),
+}
+
+SERVING_BUCKETS = {
+    "1인분": (1, 1),
+    "2인분": (2, 2),
+    "4인분": (4, 4),
+    "6인분 이상": (6, None),
+}
+
+
+def _range_q(field, bounds):
+    """(최소, 최대) 범위를 인덱스를 탈 수 있는 범위 조건(Q)으로 변환"""
+    low, high = bounds
+    if low is not None and low == high:
+        return Q(**{field: low})
+
+    conditions = Q()
+    if low is not None:
+        conditions &= Q(**{f"{field}__gte": low})
+    if high is not None:
+        conditions &= Q(**{f"{field}__lte": high})
+    return conditions
+
+
+def parse_range(value):
+    """
+    "최소-최대" 문자열을 (최소, 최대) 범위로 변환 ("30-", "-15", "2"도 허용)
+    - 숫자가 아니거나 최소 > 최대이면 ValueError
+    """
+    low, sep, high = value.strip().partition("-")
+    low = int(low) if low.strip() else None
+    high = int(high) if high.strip() else None
+    if not sep:
+        high = low
+    if low is None and high is None:
+        raise ValueError("빈 범위입니다.")
+    if low is not None and high is not None and low > high:
+        raise ValueError("최소값이 최대값보다 큽니다.")
+    return low, high
+
+
+def range_filter_q(field, value):
+    """쿼리 파라미터 범위 문자열을 cook_minutes/serving_count 범위 조건으로 변환"""
+    return _range_q(field, parse_range(value))
+
+
+def time_filter_q(time_filters):
+    """선택된 조리시간 버킷들을 cook_minutes 범위 조건으로 변환 (OR)"""
+    conditions = Q()
+    for time_filter in time_filters or []:
+        bounds = TIME_BUCKETS.get(time_filter)
+        if bounds:
+            conditions |= _range_q("cook_minutes", bounds)
+    return conditions
+
+
+def serving_filter_q(serving_size):
+    """선택된 인분 버킷을 serving_count 범위 조건으로 변환"""
+    bounds = SERVING_BUCKETS.get(serving_size)
+    if not bounds:
+        return Q()
+    return _range_q("serving_count", bounds)
+
+
+def apply_recipe_filters(queryset, time_filters, serving_size):
+    """조리시간/인분 필터 적용"""
+    if time_filters:
+        queryset = queryset.filter(time_filter_q(time_filters))
+
+    if serving_size:
+        queryset = queryset.filter(serving_filter_q(serving_size))
+
+    return queryset
@@ -0,0 +1,432 @@
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from . import llm
+from .filters import apply_recipe_filters
+from .indexing import index_recipes
+from .listing import LIST_FIELDS
+from .models import Recipe
+from .singleflight import instruction_flight
+
+# 일괄 생성 응답에서 필수/선택 필드
+BATCH_REQUIRED_FIELDS = ("CKG_NM", "CKG_MTRL_CN")
+BATCH_OPTIONAL_FIELDS = ("CKG_INBUN_NM", "CKG_TIME_NM", "CKG_METHOD_CN")
+
+# 조리 방법 생성 파라미터
+INSTRUCTIONS_PARAMS = {"temperature": 0.7, "max_tokens": 1000}
+
+
+def parse_recipe_response(ai_recipe):
+    """'KEY: value' 형식의 AI 응답을 딕셔너리로 변환"""
+    recipe_data = {}
+
+    # 줄별로 처리하여 필드 추출
+    for line in ai_recipe.strip().split("\n"):
+        if ":" in line:
+            key, value = line.split(":", 1)
+            recipe_data[key.strip()] = value.strip()
+
+    return recipe_data
+
+
+def build_instructions_prompt(recipe):
+    """조리 방법 생성 프롬프트"""
+    return f"""
+    레시피 이름: {recipe.CKG_NM}
+    필요한 재료: {recipe.CKG_MTRL_CN}
+    조리 시간: {recipe.CKG_TIME_NM}
+    인분: {recipe.CKG_INBUN_NM}
+
+    위 레시피의 상세한 조리 방법을 단계별로 설명해주세요.
+    """
+
+
+def _request_recipe(prompt):
+    """레시피 1개 생성 (작업 스레드에서 실행, DB 접근 없음)"""
+    # 같은 프롬프트로 여러 개를 만들기 때문에 캐시하지 않음 (매번 다른 레시피 필요)
+    result = llm.chat(
+        use_cache=False,
+        messages=[
+            {"role": "system", "content": settings.SYSTEM_RECIPE_EXPERT},
+            {"role": "user", "content": prompt},
+        ],
+        temperature=0.7,
+        max_tokens=500,
+    )
+    return parse_recipe_response(result.content)
+
+
+def instructions_messages(recipe):
+    """조리 방법 생성 메시지 (일반/스트리밍 호출이 같은 캐시 키를 쓰도록 공유)"""
+    return [
+        {"role": "system", "content": settings.SYSTEM_RECIPE_EXPERT},
+        {"role": "user", "content": build_instructions_prompt(recipe)},
+    ]
+
+
+def _request_instructions(recipe):
+    """조리 방법 생성 (작업 스레드에서 실행, DB 접근 없음)"""
+    return llm.chat(instructions_messages(recipe), **INSTRUCTIONS_PARAMS).content
+
+
+def load_stored_instructions(recipe):
+    """DB에 저장된 최신 조리 방법 (다른 요청/프로세스가 저장했을 수 있음)"""
+    return (
+        Recipe.objects.filter(id=recipe.id)
+        .values_list("CKG_METHOD_CN", flat=True)
+        .first()
+    )
+
+
+def get_or_generate_instructions(recipe):
+    """
+    조리 방법 반환, 없으면 생성 후 CKG_METHOD_CN만 저장 - (조리 방법, "database" | "ai")
+    - 같은 레시피의 동시 요청은 하나만 LLM을 호출하고, 나머지는 잠금 해제 후 저장된 결과를 사용
+    """
+    if recipe.CKG_METHOD_CN:
+        return recipe.CKG_METHOD_CN, "database"
+
+    # 잠금 대기 시간이 초과되면 직접 생성 (응답이 무한정 늦어지지 않도록)
+    with instruction_flight.lock(recipe.id, timeout=settings.INSTRUCTION_LOCK_TIMEOUT):
+        stored = load_stored_instructions(recipe)
+        if stored:
+            recipe.CKG_METHOD_CN = stored
+            return stored, "database"
+
+        recipe.CKG_METHOD_CN = _request_instructions(recipe)
+        recipe.save(update_fields=["CKG_METHOD_CN", "updated_at"])
+        return recipe.CKG_METHOD_CN, "ai"
+
+
+def generate_recipes(
+    prompt, count, selected_names, default_time, default_servings, fallback_name
+):
+    """
+    부족한 레시피를 AI로 동시에 생성하여 DB에 저장
+    - 레시피/조리방법 생성은 스레드 풀에서 병렬 실행 (요청당 AI_RECIPE_MAX_CONCURRENCY개까지)
+    - 완료되는 순서대로 이름 중복을 확인하고 저장 (DB 작업은 요청 스레드에서만 수행)
+    - AI_RECIPE_DEADLINE 초가 지나면 끝나지 않은 생성은 버리고 그때까지의 결과만 반환
+    """
+    if count <= 0:
+        return []
+
+    deadline = time.monotonic() + settings.AI_RECIPE_DEADLINE
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(count, settings.AI_RECIPE_MAX_CONCURRENCY))
+    )
+
+    created = []
+    recipe_futures = {
+        executor.submit(_request_recipe, prompt): index for index in range(count)
+    }
+    instruction_futures = {}
+    pending = set(recipe_futures)
+
+    try:
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print(f"레시피 생성 시간 초과: {len(pending)}건 미완료")
+                break
+
+            done, pending = wait(
+                pending, timeout=remaining, return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                if future in recipe_futures:
+                    recipe = _save_generated_recipe(
+                        future,
+                        selected_names,
+                        default_time,
+                        default_servings,
+                        fallback_name(recipe_futures[future]),
+                    )
+                    if recipe is None:
+                        continue
+
+                    created.append(recipe)
+                    # 조리 방법 생성도 같은 풀에서 이어서 실행
+                    instructions = executor.submit(_request_instructions, recipe)
+                    instruction_futures[instructions] = recipe
+                    pending.add(instructions)
+                else:
+                    _save_generated_instructions(future, instruction_futures[future])
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return created
+
+
+def _save_generated_recipe(
+    future, selected_names, default_time, default_servings, fallback_name
+):
+    """생성된 레시피를 이름 중복이 아니면 DB에 저장"""
+    try:
+        recipe_data = future.result()
+    except Exception as e:
+        print(f"레시피 생성 실패: {str(e)}")
+        return None
+
+    # 레시피 이름 중복 확인
+    recipe_name = recipe_data.get("CKG_NM", fallback_name)
+    if recipe_name in selected_names:
+        return None
+
+    recipe = Recipe.objects.create(
+        CKG_NM=recipe_name,
+        CKG_MTRL_CN=recipe_data.get("CKG_MTRL_CN", ""),
+        CKG_INBUN_NM=recipe_data.get("CKG_INBUN_NM", default_servings),
+        CKG_TIME_NM=recipe_data.get("CKG_TIME_NM", default_time),
+        RCP_IMG_URL=settings.DEFAULT_RECIPE_IMAGE_PATH,
+    )
+    selected_names.add(recipe_name)
+    return recipe
+
+
+def _save_generated_instructions(future, recipe):
+    """생성된 조리 방법 저장"""
+    try:
+        recipe.CKG_METHOD_CN = future.result()
+    except Exception as e:
+        print(f"조리 방법 생성 실패: {str(e)}")
+        return
+
+    recipe.save(update_fields=["CKG_METHOD_CN", "updated_at"])
+
+
+def build_batch_prompt(
+    user_message, count, default_time, default_servings, exclude_names, instructions
+):
+    """N개 레시피를 JSON 배열 하나로 받기 위한 프롬프트"""
+    fields = {
+        "CKG_NM": "요리 이름",
+        "CKG_MTRL_CN": "사용된 재료 목록과 양, 각 재료는 세로 막대(|)로 구분",
+        "CKG_INBUN_NM": default_servings,
+        "CKG_TIME_NM": default_time,
+    }
+    if instructions:
+        fields["CKG_METHOD_CN"] = "단계별 조리 방법"
+
+    excluded = ", ".join(sorted(name for name in exclude_names if name))
+    return f"""
+    '{user_message}'와 관련된 맛있는 음식 레시피를 서로 다른 요리로 {count}개 생성해주세요.
+
+    조건:
+    - 조리 시간은 {default_time} 이내여야 합니다.
+    - 인분 수는 정확히 {default_servings}으로 설정해주세요.
+    - 다음 요리와 이름이 겹치면 안 됩니다: {excluded or "없음"}
+
+    다음 JSON 형식으로만 응답해 주세요:
+    {{"recipes": [{json.dumps(fields, ensure_ascii=False)}, ...]}}
+    """
+
+
+def parse_recipe_batch(content):
+    """
+    일괄 생성 응답(JSON)을 레시피 딕셔너리 목록으로 변환
+    - 형식이 어긋나면 ValueError (호출 측에서 개별 생성으로 대체)
+    """
+    text = content.strip()
+    if text.startswith("```"):
+        text = text.strip("`").removeprefix("json").strip()
+
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"JSON 파싱 실패: {str(e)}")
+
+    if isinstance(data, dict):
+        data = data.get("recipes")
+    if not isinstance(data, list) or not data:
+        raise ValueError("레시피 배열이 없습니다.")
+
+    recipes = []
+    for item in data:
+        if not isinstance(item, dict):
+            raise ValueError("레시피 항목이 객체가 아닙니다.")
+
+        recipe_data = {}
+        for field in BATCH_REQUIRED_FIELDS + BATCH_OPTIONAL_FIELDS:
+            value = item.get(field)
+            if isinstance(value, list):
+                separator = "\n" if field == "CKG_METHOD_CN" else "|"
+                value = separator.join(str(part).strip() for part in value)
+            if value is not None and not isinstance(value, (str, int, float)):
+                raise ValueError(f"{field} 값 형식이 잘못되었습니다.")
+            if value is not None and str(value).strip():
+                recipe_data[field] = str(value).strip()
+
+        missing = [f for f in BATCH_REQUIRED_FIELDS if f not in recipe_data]
+        if missing:
+            raise ValueError(f"필수 필드 누락: {', '.join(missing)}")
+        recipes.append(recipe_data)
+
+    return recipes
+
+
+def bulk_create_recipes(recipes):
+    """
+    레시피 일괄 저장 후 PK 확보 및 검색 색인 갱신
+    - INSERT 결과로 PK를 돌려주는 DB(PostgreSQL, SQLite)는 bulk_create 한 번으로 저장
+    - MySQL은 bulk_create 후 PK를 돌려주지 않으므로 한 트랜잭션 안에서 한 건씩 저장
+      (이름/생성 시각으로 다시 조회하면 같은 이름의 다른 레시피 id를 가져올 수 있음)
+    """
+    if not connection.features.can_return_rows_from_bulk_insert:
+        with transaction.atomic():
+            for recipe in recipes:
+                # save()가 post_save 신호로 검색 색인 갱신
+                recipe.save(force_insert=True)
+        return recipes
+
+    for recipe in recipes:
+        recipe.normalize_fields()
+
+    created = Recipe.objects.bulk_create(recipes)
+    index_recipes(created)
+    return created
+
+
+def _existing_recipes(names, time_filters, serving_size):
+    """
+    이미 저장된 같은 이름의 레시피 - ({이름: 필터에 맞는 가장 먼저 저장된 레시피}, DB에 있는 이름 집합)
+    - 이름 인덱스로 id만 조회한 뒤, 필터에 맞는 레시피만 목록 컬럼으로 불러옴
+    """
+    ids = {}
+    for recipe_id, name in (
+        Recipe.objects.filter(CKG_NM__in=names)
+        .order_by("id")
+        .values_list("id", "CKG_NM")
+    ):
+        ids.setdefault(name, recipe_id)
+    if not ids:
+        return {}, set()
+
+    recipes = apply_recipe_filters(
+        Recipe.objects.filter(id__in=list(ids.values())), time_filters, serving_size
+    ).only(*LIST_FIELDS)
+    return {recipe.CKG_NM: recipe for recipe in recipes}, set(ids)
+
+
+def generate_recipes_batch(
+    user_message,
+    count,
+    selected_names,
+    default_time,
+    default_servings,
+    instructions=True,
+    time_filters=None,
+    serving_size=None,
+):
+    """
+    LLM 호출 한 번으로 레시피 count개(선택적으로 조리 방법 포함)를 생성하여 bulk_create로 저장
+    - 이미 같은 이름의 레시피가 DB에 있으면 새로 저장하지 않고 기존 레시피 반환
+      (기존 레시피가 조리시간/인분 필터에 맞지 않으면 그 이름은 제외)
+    - 응답 형식이 잘못되면 ValueError
+    """
+    prompt = build_batch_prompt(
+        user_message,
+        count,
+        default_time,
+        default_servings,
+        selected_names,
+        instructions,
+    )
+    # 같은 메시지라도 매번 새 레시피가 필요하므로 캐시하지 않음 (캐시된 응답을 다시 저장하지 않도록)
+    result = llm.chat(
+        use_cache=False,
+        messages=[
+            {"role": "system", "content": settings.SYSTEM_RECIPE_EXPERT},
+            {"role": "user", "content": prompt},
+        ],
+        temperature=0.7,
+        max_tokens=count * (1200 if instructions else 300),
+        response_format={"type": "json_object"},
+        validate=parse_recipe_batch,
+    )
+
+    recipes_data = parse_recipe_batch(result.content)
+    existing, taken_names = _existing_recipes(
+        [recipe_data["CKG_NM"] for recipe_data in recipes_data],
+        time_filters,
+        serving_size,
+    )
+
+    recipes = []
+    new_recipes = []
+    for recipe_data in recipes_data:
+        recipe_name = recipe_data["CKG_NM"]
+        if recipe_name in selected_names or len(recipes) >= count:
+            continue
+
+        if recipe_name in existing:
+            selected_names.add(recipe_name)
+            recipes.append(existing[recipe_name])
+            continue
+        if recipe_name in taken_names:
+            # 같은 이름의 레시피가 있지만 필터에 맞지 않음 (같은 이름으로 또 저장하지 않음)
+            continue
+
+        selected_names.add(recipe_name)
+
+        recipe = Recipe(
+            CKG_NM=recipe_name,
+            CKG_MTRL_CN=recipe_data["CKG_MTRL_CN"],
+            CKG_INBUN_NM=recipe_data.get("CKG_INBUN_NM", default_servings),
+            CKG_TIME_NM=recipe_data.get("CKG_TIME_NM", default_time),
+            CKG_METHOD_CN=recipe_data.get("CKG_METHOD_CN"),
+            RCP_IMG_URL=settings.DEFAULT_RECIPE_IMAGE_PATH,
+        )
+        new_recipes.append(recipe)
+        recipes.append(recipe)
+
+    if new_recipes:
+        bulk_create_recipes(new_recipes)
+    return recipes
+
+
+def generate_missing_recipes(
+    prompt,
+    user_message,
+    count,
+    selected_names,
+    default_time,
+    default_servings,
+    fallback_name,
+    time_filters=None,
+    serving_size=None,
+):
+    """
+    부족한 추천 레시피 생성
+    - AI_RECIPE_BATCH_GENERATION이면 한 번의 호출로 일괄 생성
+    - 일괄 응답이 잘못되었거나 중복으로 모자라면 나머지는 개별 생성(generate_recipes)으로 채움
+    """
+    created = []
+    if settings.AI_RECIPE_BATCH_GENERATION and count > 0:
+        try:
+            created = generate_recipes_batch(
+                user_message,
+                count,
+                selected_names,
+                default_time,
+                default_servings,
+                time_filters=time_filters,
+                serving_size=serving_size,
+            )
+        except Exception as e:
+            print(f"레시피 일괄 생성 실패, 개별 생성으로 대체: {str(e)}")
+
+    remaining = count - len(created)
+    if remaining > 0:
+        created += generate_recipes(
+            prompt,
+            remaining,
+            selected_names,
+            default_time,
+            default_servings,
+            fallback_name,
+        )
+    return created
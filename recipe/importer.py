@@ -0,0 +1,129 @@
+import codecs
+import time
+
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+
+from .indexing import index_recipes
+from .models import Recipe
+from .parsers import clean_text, recipe_content_hash
+
+# 공공 레시피 CSV에서 가져올 컬럼
+CSV_COLUMNS = ["CKG_NM", "CKG_MTRL_CN", "CKG_INBUN_NM", "CKG_TIME_NM", "RCP_IMG_URL"]
+# 인코딩 판별에 사용할 파일 앞부분 크기
+ENCODING_SAMPLE_SIZE = 1024 * 1024
+
+
+def detect_encoding(path, sample_size=ENCODING_SAMPLE_SIZE):
+    """CSV 인코딩 판별: BOM이 있으면 utf-8-sig, UTF-8로 읽히면 utf-8, 아니면 cp949"""
+    with open(path, "rb") as f:
+        sample = f.read(sample_size)
+
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        sample.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # 샘플 끝에서 잘린 멀티바이트 문자는 UTF-8 오류로 보지 않음
+        if e.start < len(sample) - 3:
+            return "cp949"
+    return "utf-8"
+
+
+def _max_lengths():
+    return {column: Recipe._meta.get_field(column).max_length for column in CSV_COLUMNS}
+
+
+def _chunk_recipes(chunk, max_lengths):
+    """DataFrame 청크를 Recipe 목록으로 변환 (요리 이름 없는 행, 청크 내 중복 제외)"""
+    recipes = {}
+    invalid = 0
+    for row in chunk.itertuples(index=False):
+        fields = {
+            column: clean_text(getattr(row, column, None), max_lengths[column])
+            for column in CSV_COLUMNS
+        }
+        if not fields["CKG_NM"]:
+            invalid += 1
+            continue
+        content_hash = recipe_content_hash(fields)
+        if content_hash not in recipes:
+            recipes[content_hash] = Recipe(content_hash=content_hash, **fields)
+    return recipes, invalid
+
+
+def _save_chunk(recipes):
+    """이미 있는 해시를 제외하고 저장 후 검색 색인 생성 - 저장한 수 반환"""
+    existing = set(
+        Recipe.objects.filter(content_hash__in=recipes.keys()).values_list(
+            "content_hash", flat=True
+        )
+    )
+    new_recipes = [
+        recipe
+        for content_hash, recipe in recipes.items()
+        if content_hash not in existing
+    ]
+    if not new_recipes:
+        return 0
+
+    for recipe in new_recipes:
+        recipe.normalize_fields()
+
+    with transaction.atomic():
+        # 동시에 같은 파일을 가져오는 경우를 대비해 충돌은 무시
+        Recipe.objects.bulk_create(new_recipes, ignore_conflicts=True)
+        # MySQL은 bulk_create 후 PK를 돌려주지 않으므로 해시로 다시 조회
+        ids = dict(
+            Recipe.objects.filter(
+                content_hash__in=[recipe.content_hash for recipe in new_recipes]
+            ).values_list("content_hash", "id")
+        )
+        for recipe in new_recipes:
+            recipe.pk = ids.get(recipe.content_hash)
+        index_recipes(new_recipes)
+    return len(new_recipes)
+
+
+def import_recipes_csv(path, chunk_size=None, encoding=None, log=print):
+    """
+    공공 레시피 CSV를 청크 단위로 스트리밍하여 가져오기 (파일 크기와 관계없이 메모리 일정)
+    - 청크마다 트랜잭션 하나: 중복(content_hash) 제외 후 bulk_create + 검색 색인
+    - 반환: (읽은 행 수, 저장한 레시피 수, 중복 수, 요리 이름 없는 행 수)
+    """
+    if chunk_size is None:
+        chunk_size = settings.RECIPE_IMPORT_CHUNK_SIZE
+    if encoding is None:
+        encoding = detect_encoding(path)
+    log(f"인코딩: {encoding}")
+
+    max_lengths = _max_lengths()
+    rows = created = duplicates = invalid = 0
+    start = time.monotonic()
+
+    chunks = pd.read_csv(
+        path,
+        encoding=encoding,
+        usecols=lambda column: column.strip() in CSV_COLUMNS,
+        dtype=str,
+        keep_default_na=False,
+        chunksize=chunk_size,
+        on_bad_lines="warn",
+    )
+    for chunk in chunks:
+        chunk.columns = [column.strip() for column in chunk.columns]
+        recipes, chunk_invalid = _chunk_recipes(chunk, max_lengths)
+        chunk_created = _save_chunk(recipes)
+
+        rows += len(chunk)
+        created += chunk_created
+        invalid += chunk_invalid
+        duplicates += len(chunk) - chunk_invalid - chunk_created
+        elapsed = time.monotonic() - start
+        log(
+            f"{rows}행 처리: {created}개 저장, {duplicates}개 중복 "
+            f"({rows / elapsed if elapsed else 0:.0f}행/초)"
+        )
+
+    return rows, created, duplicates, invalid
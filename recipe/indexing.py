@@ -0,0 +1,72 @@
+from django.db import transaction
+
+from .models import Ingredient, RecipeIngredient, RecipeNameGram
+from .parsers import name_ngrams, parse_ingredients
+
+
+def index_recipe_ingredients(recipes):
+    """레시피의 재료 문자열(CKG_MTRL_CN)을 파싱하여 재료 역색인 갱신"""
+    recipes = [recipe for recipe in recipes if recipe.pk is not None]
+    if not recipes:
+        return
+
+    parsed = {recipe.pk: parse_ingredients(recipe.CKG_MTRL_CN) for recipe in recipes}
+    all_names = {name for names in parsed.values() for name in names}
+
+    with transaction.atomic():
+        # 새 재료명만 추가 (동시 요청으로 이미 생긴 재료는 무시)
+        Ingredient.objects.bulk_create(
+            [Ingredient(name=name) for name in all_names], ignore_conflicts=True
+        )
+        ingredient_ids = dict(
+            Ingredient.objects.filter(name__in=all_names).values_list("name", "id")
+        )
+
+        RecipeIngredient.objects.filter(recipe_id__in=parsed.keys()).delete()
+        RecipeIngredient.objects.bulk_create(
+            [
+                RecipeIngredient(
+                    recipe_id=recipe_id, ingredient_id=ingredient_ids[name]
+                )
+                for recipe_id, names in parsed.items()
+                for name in names
+                if name in ingredient_ids
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def index_recipe_name_grams(recipes):
+    """요리 이름(CKG_NM)의 bigram 색인 갱신 (FULLTEXT 인덱스를 쓰는 경우 생략)"""
+    from .search import use_fulltext_search
+
+    if use_fulltext_search():
+        return
+
+    recipes = [recipe for recipe in recipes if recipe.pk is not None]
+    if not recipes:
+        return
+
+    with transaction.atomic():
+        RecipeNameGram.objects.filter(
+            recipe_id__in=[recipe.pk for recipe in recipes]
+        ).delete()
+        RecipeNameGram.objects.bulk_create(
+            [
+                RecipeNameGram(recipe_id=recipe.pk, gram=gram)
+                for recipe in recipes
+                for gram in name_ngrams(recipe.CKG_NM)
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def index_recipes(recipes):
+    """새로 저장되었거나 이름/재료가 바뀐 레시피의 검색 색인 갱신"""
+    from .catalog import catalog
+    from .pools import add_to_recipe_pools
+
+    index_recipe_ingredients(recipes)
+    index_recipe_name_grams(recipes)
+    catalog.refresh([recipe.pk for recipe in recipes if recipe.pk is not None])
+    add_to_recipe_pools([recipe.pk for recipe in recipes])
@@ -0,0 +1,40 @@
+from django.conf import settings
+
+from .models import Recipe
+from .serializers import RecipeListSerializer
+
+# RecipeListSerializer와 같은 필드, 같은 순서 (조리 방법 CKG_METHOD_CN은 조회하지 않음)
+LIST_FIELDS = tuple(RecipeListSerializer.Meta.fields)
+
+
+def _build_item(values):
+    """RecipeListSerializer.to_representation과 같은 결과 (이미지가 없으면 기본 이미지)"""
+    item = {field: values[field] for field in LIST_FIELDS}
+    image = item["RCP_IMG_URL"]
+    if not image or not image.strip():
+        item["RCP_IMG_URL"] = settings.DEFAULT_RECIPE_IMAGE_PATH
+    return item
+
+
+def list_items_for_queryset(queryset):
+    """queryset 순서대로 목록 항목 반환 (목록 컬럼만 .values()로 조회)"""
+    return [_build_item(row) for row in queryset.values(*LIST_FIELDS)]
+
+
+def list_items_for_ids(ids):
+    """id 순서대로 목록 항목 반환 (없는 id는 제외, 쿼리 한 번)"""
+    ids = list(ids)
+    if not ids:
+        return []
+    rows = {
+        row["id"]: row for row in Recipe.objects.filter(id__in=ids).values(*LIST_FIELDS)
+    }
+    return [_build_item(rows[recipe_id]) for recipe_id in ids if recipe_id in rows]
+
+
+def list_items_for_recipes(recipes):
+    """이미 불러온(또는 방금 생성한) 레시피 인스턴스의 목록 항목"""
+    return [
+        _build_item({field: getattr(recipe, field) for field in LIST_FIELDS})
+        for recipe in recipes
+    ]
@@ -0,0 +1,183 @@
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+
+import httpx
+import openai
+from django.conf import settings
+
+from .llm_cache import LLMResponseCache, llm_cache
+
+# 재시도할 오류: 429(요청 한도), 5xx, 연결 실패/타임아웃
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.InternalServerError,
+    openai.APIConnectionError,
+)
+
+
+@dataclass
+class LLMResult:
+    """LLM 호출 결과"""
+
+    content: str
+    model: str
+    cached: bool = False
+    attempts: int = 0  # 실제 API 호출 횟수 (캐시 적중이면 0)
+    latency: float = 0.0  # 초
+    usage: dict = field(default_factory=dict)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    프로세스 전역 OpenAI 클라이언트 (처음 사용할 때 생성)
+    - HTTP 연결 풀을 공유하여 요청마다 연결/TLS 핸드셰이크를 반복하지 않음
+    - 재시도는 call_with_retry에서 직접 처리하므로 SDK 자체 재시도는 끔
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = openai.OpenAI(
+                    api_key=settings.OPENAI_API_KEY,
+                    base_url=settings.OPENAI_BASE_URL,
+                    timeout=httpx.Timeout(
+                        settings.LLM_TIMEOUT, connect=settings.LLM_CONNECT_TIMEOUT
+                    ),
+                    max_retries=0,
+                    http_client=openai.DefaultHttpxClient(
+                        limits=httpx.Limits(
+                            max_connections=settings.LLM_MAX_CONNECTIONS,
+                            max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                            keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY,
+                        )
+                    ),
+                )
+    return _client
+
+
+def _retry_delay(error, attempt):
+    """재시도 대기 시간 - Retry-After 헤더 우선, 없으면 지수 백오프 + 지터"""
+    response = getattr(error, "response", None)
+    if response is not None:
+        try:
+            return min(
+                float(response.headers.get("retry-after")),
+                settings.LLM_RETRY_MAX_DELAY,
+            )
+        except (TypeError, ValueError):
+            pass
+
+    backoff = min(
+        settings.LLM_RETRY_BASE_DELAY * (2**attempt), settings.LLM_RETRY_MAX_DELAY
+    )
+    return random.uniform(0, backoff)
+
+
+def call_with_retry(request):
+    """
+    request()를 호출하고 일시적인 오류(429, 5xx, 연결/타임아웃)면 재시도
+    - (응답, 호출 횟수) 반환, 재시도를 모두 실패하면 마지막 오류를 그대로 발생
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return request(), attempt
+        except RETRYABLE_ERRORS as e:
+            if attempt > settings.LLM_MAX_RETRIES:
+                raise
+            delay = _retry_delay(e, attempt - 1)
+            print(
+                f"LLM 호출 실패, {delay:.1f}초 후 재시도 "
+                f"({attempt}/{settings.LLM_MAX_RETRIES}): {str(e)}"
+            )
+            time.sleep(delay)
+
+
+def _request_params(messages, model, params):
+    return {"model": model or settings.GPT_MODEL_NAME, "messages": messages, **params}
+
+
+def chat(messages, model=None, use_cache=True, validate=None, timeout=None, **params):
+    """
+    chat.completions 호출 (캐시, 타임아웃, 재시도 적용) - LLMResult 반환
+    - 같은 모델/메시지/파라미터 요청은 캐시된 응답 사용
+      (같은 프롬프트로 매번 다른 결과가 필요하면 use_cache=False)
+    - validate가 주어지면 예외 없이 통과한 응답만 캐시
+    - timeout: 이 호출에만 적용할 타임아웃 (초)
+    """
+    params = _request_params(messages, model, params)
+    use_cache = use_cache and settings.LLM_CACHE_ENABLED
+    key = LLMResponseCache.make_key(**params) if use_cache else None
+    if use_cache:
+        content = llm_cache.get(key)
+        if content is not None:
+            return LLMResult(content=content, model=params["model"], cached=True)
+
+    client = get_client()
+    started = time.monotonic()
+    response, attempts = call_with_retry(
+        lambda: client.chat.completions.create(
+            timeout=timeout or openai.NOT_GIVEN, **params
+        )
+    )
+    content = response.choices[0].message.content or ""
+    result = LLMResult(
+        content=content,
+        model=response.model or params["model"],
+        attempts=attempts,
+        latency=time.monotonic() - started,
+        usage=response.usage.model_dump() if response.usage else {},
+    )
+
+    if use_cache and content:
+        if validate is not None:
+            validate(content)
+        llm_cache.set(key, content)
+    return result
+
+
+def stream_chat(messages, model=None, use_cache=True, timeout=None, **params):
+    """
+    chat.completions 스트리밍 호출 - 생성되는 텍스트 조각을 yield
+    - 캐시에 있으면 전체 응답을 한 번에 yield
+    - 재시도는 스트림 연결 단계에서만 (토큰을 받기 시작한 뒤의 오류는 그대로 발생)
+    - 스트림이 끝까지 완료된 경우에만 캐시에 저장
+    """
+    params = _request_params(messages, model, params)
+    use_cache = use_cache and settings.LLM_CACHE_ENABLED
+    key = LLMResponseCache.make_key(**params) if use_cache else None
+    if use_cache:
+        content = llm_cache.get(key)
+        if content is not None:
+            yield content
+            return
+
+    client = get_client()
+    stream, _ = call_with_retry(
+        lambda: client.chat.completions.create(
+            stream=True, timeout=timeout or openai.NOT_GIVEN, **params
+        )
+    )
+
+    parts = []
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+    finally:
+        # 클라이언트가 중간에 연결을 끊어도 HTTP 연결을 풀에 반환
+        stream.close()
+
+    if use_cache and parts:
+        llm_cache.set(key, "".join(parts))
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from django.conf import settings
+
+
+class LLMResponseCache:
+    """
+    LLM 응답 캐시 (요청 내용 해시 -> 응답 텍스트)
+    - 메모리: 최대 max_entries개, LRU + TTL 만료
+    - 디스크: SQLite 파일에 같은 내용을 저장하여 재시작 후에도 유지 (path가 없으면 메모리만 사용)
+    """
+
+    # 디스크 저장 몇 번마다 만료 항목을 정리할지
+    PRUNE_EVERY = 200
+
+    def __init__(self, max_entries=1000, ttl=None, path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (만료 시각, 응답)
+        self._lock = threading.Lock()  # 메모리 LRU/통계
+        self._db_lock = threading.Lock()  # SQLite 연결 (디스크 조회/저장)
+        self._db = None
+        self._writes = 0
+
+    @staticmethod
+    def make_key(model, messages, **params):
+        """모델, 메시지, 샘플링 파라미터로 캐시 키 생성"""
+        payload = json.dumps(
+            {"model": model, "messages": messages, "params": params},
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _connection(self):
+        if self.path is None:
+            return None
+        if self._db is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache "
+                "(key TEXT PRIMARY KEY, content TEXT NOT NULL, expires_at REAL)"
+            )
+            self._db.commit()
+        return self._db
+
+    def _expires_at(self):
+        return time.time() + self.ttl if self.ttl else None
+
+    def _remember(self, key, expires_at, content):
+        self._entries[key] = (expires_at, content)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _is_fresh(self, entry, now):
+        return entry[0] is None or entry[0] > now
+
+    def get(self, key):
+        """
+        캐시된 응답 반환 (없거나 만료되면 None)
+        - 메모리 LRU는 잠금 안에서 확인하고, 디스크 조회는 잠금을 놓은 뒤 실행
+          (디스크를 읽는 동안 다른 스레드의 메모리 조회가 기다리지 않음)
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_fresh(entry, now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self._entries.pop(key, None)
+
+        if entry is None:
+            row = self._load(key)
+            if row is not None and self._is_fresh(row, now):
+                with self._lock:
+                    self._remember(key, *row)
+                    self.hits += 1
+                return row[1]
+            entry = row
+
+        if entry is not None:
+            # 만료된 항목 삭제
+            self._execute([("DELETE FROM llm_cache WHERE key = ?", (key,))])
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, content):
+        """응답 저장 (디스크 쓰기는 메모리 잠금 밖에서 실행)"""
+        expires_at = self._expires_at()
+        with self._lock:
+            self._remember(key, expires_at, content)
+            self._writes += 1
+            prune = self._writes % self.PRUNE_EVERY == 0
+        statements = [
+            (
+                "INSERT OR REPLACE INTO llm_cache (key, content, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, content, expires_at),
+            )
+        ]
+        if prune:
+            statements.append(
+                (
+                    "DELETE FROM llm_cache WHERE expires_at IS NOT NULL "
+                    "AND expires_at <= ?",
+                    (time.time(),),
+                )
+            )
+        self._execute(statements)
+
+    def _load(self, key):
+        """디스크에서 (만료 시각, 응답) 조회 - 디스크 오류는 캐시 미스로 취급"""
+        try:
+            with self._db_lock:
+                db = self._connection()
+                if db is None:
+                    return None
+                row = db.execute(
+                    "SELECT expires_at, content FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+            return tuple(row) if row is not None else None
+        except sqlite3.Error as e:
+            print(f"LLM 캐시 조회 실패: {str(e)}")
+            return None
+
+    def _execute(self, statements):
+        """디스크 쓰기 - 실패해도 요청은 계속 진행 (캐시는 보조 수단)"""
+        try:
+            with self._db_lock:
+                db = self._connection()
+                if db is None:
+                    return
+                for sql, params in statements:
+                    db.execute(sql, params)
+                db.commit()
+        except sqlite3.Error as e:
+            print(f"LLM 캐시 저장 실패: {str(e)}")
+
+    def clear(self):
+        """메모리/디스크 캐시와 통계 초기화"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+        self._execute([("DELETE FROM llm_cache", ())])
+
+    def stats(self):
+        """적중/실패 횟수와 적중률"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "memory_entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+llm_cache = LLMResponseCache(
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    ttl=settings.LLM_CACHE_TTL,
+    path=settings.LLM_CACHE_PATH,
+)
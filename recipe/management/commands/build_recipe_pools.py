@@ -0,0 +1,50 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from recipe.pools import build_recipe_pools, recipe_pools
+
+
+class Command(BaseCommand):
+    help = "추천 레시피 풀((조리시간 버킷, 인분 버킷)별 이름 중복 없는 레시피 id 목록)을 다시 만듭니다"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size", type=int, default=5000, help="한 번에 읽을 레시피 수"
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="풀을 만들지 않고 현재 풀의 크기와 생성 시각만 출력",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="종료하지 않고 주기적으로 다시 생성 (조리시간/인분이 수정된 레시피 반영, 워커 모드)",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=settings.RECIPE_POOL_REBUILD_INTERVAL,
+            help="워커 모드에서 다시 생성하는 주기 (초)",
+        )
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            self.stdout.write(
+                json.dumps(recipe_pools.stats(), ensure_ascii=False, indent=2)
+            )
+            return
+
+        while True:
+            sizes = build_recipe_pools(options["chunk_size"], log=self.stdout.write)
+            for (time_key, serving_key), size in sizes.items():
+                self.stdout.write(f"{time_key} / {serving_key}: {size}개")
+            self.stdout.write(
+                self.style.SUCCESS(f"추천 레시피 풀 생성 완료: 풀 {len(sizes)}개")
+            )
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from recipe.indexing import index_recipes
+from recipe.models import Recipe
+
+
+class Command(BaseCommand):
+    help = "레시피 검색 색인(재료 역색인, 요리 이름 bigram 색인)을 다시 만듭니다"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="한 번에 색인할 레시피 수"
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        recipes = Recipe.objects.only("id", "CKG_NM", "CKG_MTRL_CN").order_by("id")
+
+        batch = []
+        total = 0
+        for recipe in recipes.iterator(chunk_size=batch_size):
+            batch.append(recipe)
+            if len(batch) >= batch_size:
+                index_recipes(batch)
+                total += len(batch)
+                batch = []
+                self.stdout.write(f"{total}개 레시피 색인 완료")
+
+        if batch:
+            index_recipes(batch)
+            total += len(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"검색 색인 생성 완료: 총 {total}개 레시피")
+        )
@@ -1,5 +1,6 @@
+from django.conf import settings
 from django.core.management.base import BaseCommand
-from recipe.utils import load_recipes_from_csv
+from recipe.importer import import_recipes_csv
 
 
 class Command(BaseCommand):
@@ -7,8 +8,13 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('csv_file', type=str, help='CSV 파일 경로')
+        parser.add_argument('--chunk-size', type=int, default=settings.RECIPE_IMPORT_CHUNK_SIZE, help='한 번에 읽어서 저장할 행 수')
+        parser.add_argument('--encoding', default=None, help='CSV 인코딩 (기본: 자동 판별, cp949/utf-8/utf-8-sig)')
 
     def handle(self, *args, **options):
         file_path = options['csv_file']
-        load_recipes_from_csv(file_path)
+        rows, created, duplicates, invalid = import_recipes_csv(
+            file_path, options['chunk_size'], options['encoding'], log=self.stdout.write
+        )
+        self.stdout.write(f'{rows}행 중 {created}개 저장, {duplicates}개 중복, {invalid}개 요리 이름 없음')
         self.stdout.write(self.style.SUCCESS('CSV 파일에서 레시피를 성공적으로 불러왔습니다.'))
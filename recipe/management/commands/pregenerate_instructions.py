@@ -0,0 +1,63 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from recipe.pregeneration import pending_recipes, pregenerate_instructions
+
+
+class Command(BaseCommand):
+    help = "조리 방법(CKG_METHOD_CN)이 없는 레시피의 조리 방법을 미리 생성합니다"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.INSTRUCTION_PREGEN_CONCURRENCY,
+            help="동시 생성 수",
+        )
+        parser.add_argument(
+            "--rpm",
+            type=int,
+            default=settings.INSTRUCTION_PREGEN_RPM,
+            help="분당 최대 LLM 요청 수",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.INSTRUCTION_PREGEN_BATCH_SIZE,
+            help="한 번에 가져와 생성할 레시피 수",
+        )
+        parser.add_argument("--limit", type=int, default=None, help="최대 처리 수")
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="대상이 없어도 종료하지 않고 주기적으로 다시 확인 (워커 모드)",
+        )
+        parser.add_argument(
+            "--idle-sleep",
+            type=int,
+            default=60,
+            help="워커 모드에서 대상이 없을 때 대기할 시간 (초)",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"조리 방법 생성 대상: {pending_recipes().count()}개")
+
+        while True:
+            processed, saved, failed = pregenerate_instructions(
+                concurrency=options["concurrency"],
+                requests_per_minute=options["rpm"],
+                batch_size=options["batch_size"],
+                limit=options["limit"],
+                log=self.stdout.write,
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"조리 방법 생성 완료: {processed}개 처리, "
+                    f"{saved}개 저장, {failed}개 실패"
+                )
+            )
+            if not options["loop"]:
+                break
+            time.sleep(options["idle_sleep"])
@@ -1,6 +1,7 @@
 # Generated by Django 4.2.9 on 2025-02-21 12:19
 
 from django.db import migrations, models
+import django.utils.timezone
 
 
 class Migration(migrations.Migration):
@@ -10,32 +11,57 @@ class Migration(migrations.Migration):
     ]
 
     operations = [
-        """migrations.RemoveField(
-            model_name="recipe",
-            name="image",
-        )""",
         migrations.RemoveField(
             model_name="recipe",
             name="name",
         ),
+        migrations.RemoveField(
+            model_name="recipe",
+            name="instructions",
+        ),
         migrations.AddField(
             model_name="recipe",
-            name="image_url",
-            field=models.CharField(blank=True, max_length=500, null=True),
+            name="CKG_METHOD_CN",
+            field=models.TextField(null=True, verbose_name="조리 방법 (AI 생성)"),
         ),
         migrations.AddField(
             model_name="recipe",
-            name="recipe_name",
-            field=models.CharField(max_length=255, null=True, unique=True),
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True,
+                default=django.utils.timezone.now,
+                verbose_name="생성 날짜",
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="recipe",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, verbose_name="수정 날짜"),
+        ),
+        migrations.AlterField(
+            model_name="recipe",
+            name="CKG_NM",
+            field=models.CharField(max_length=255, null=True, verbose_name="요리 이름"),
+        ),
+        migrations.AlterField(
+            model_name="recipe",
+            name="CKG_MTRL_CN",
+            field=models.TextField(null=True, verbose_name="재료"),
+        ),
+        migrations.AlterField(
+            model_name="recipe",
+            name="CKG_INBUN_NM",
+            field=models.CharField(max_length=50, null=True, verbose_name="인분"),
         ),
         migrations.AlterField(
             model_name="recipe",
-            name="cook_time",
-            field=models.CharField(max_length=50),
+            name="CKG_TIME_NM",
+            field=models.CharField(max_length=50, null=True, verbose_name="조리 시간"),
         ),
         migrations.AlterField(
             model_name="recipe",
-            name="servings",
-            field=models.CharField(max_length=50),
+            name="RCP_IMG_URL",
+            field=models.TextField(null=True, verbose_name="이미지 URL"),
         ),
     ]
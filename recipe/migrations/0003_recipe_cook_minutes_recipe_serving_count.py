@@ -0,0 +1,53 @@
+# Generated by Django 4.2.9 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+from recipe.parsers import parse_cook_minutes, parse_servings
+
+BACKFILL_BATCH_SIZE = 2000
+
+
+def backfill_normalized_fields(apps, schema_editor):
+    """기존 레시피의 조리시간/인분 문자열을 파싱하여 숫자 컬럼 채우기"""
+    Recipe = apps.get_model("recipe", "Recipe")
+    batch = []
+    recipes = Recipe.objects.only("id", "CKG_TIME_NM", "CKG_INBUN_NM").order_by("id")
+
+    for recipe in recipes.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        recipe.cook_minutes = parse_cook_minutes(recipe.CKG_TIME_NM)
+        recipe.serving_count = parse_servings(recipe.CKG_INBUN_NM)
+        batch.append(recipe)
+
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            Recipe.objects.bulk_update(batch, ["cook_minutes", "serving_count"])
+            batch = []
+
+    if batch:
+        Recipe.objects.bulk_update(batch, ["cook_minutes", "serving_count"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipe", "0002_remove_recipe_image_remove_recipe_name_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recipe",
+            name="cook_minutes",
+            field=models.PositiveIntegerField(
+                db_index=True, null=True, verbose_name="조리 시간(분)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="recipe",
+            name="serving_count",
+            field=models.PositiveIntegerField(
+                db_index=True, null=True, verbose_name="인분 수(숫자)"
+            ),
+        ),
+        migrations.RunPython(
+            backfill_normalized_fields, reverse_code=migrations.RunPython.noop
+        ),
+    ]
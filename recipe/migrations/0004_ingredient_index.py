@@ -0,0 +1,82 @@
+# Generated by Django 4.2.9 on 2026-10-18 19:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipe", "0003_recipe_cook_minutes_recipe_serving_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Ingredient",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        max_length=100, unique=True, verbose_name="재료명"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "재료",
+                "verbose_name_plural": "재료",
+                "db_table": "ingredients",
+            },
+        ),
+        migrations.CreateModel(
+            name="RecipeIngredient",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "ingredient",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="recipe_links",
+                        to="recipe.ingredient",
+                        verbose_name="재료",
+                    ),
+                ),
+                (
+                    "recipe",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ingredient_links",
+                        to="recipe.recipe",
+                        verbose_name="레시피",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "레시피 재료",
+                "verbose_name_plural": "레시피 재료",
+                "db_table": "recipe_ingredients",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="recipeingredient",
+            constraint=models.UniqueConstraint(
+                fields=("ingredient", "recipe"), name="uniq_ingredient_recipe"
+            ),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 4.2.9 on 2026-10-18 19:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+FULLTEXT_INDEX_NAME = "recipes_ckg_nm_ngram_ft"
+
+
+def add_fulltext_index(apps, schema_editor):
+    """MySQL이면 CKG_NM에 ngram 파서 FULLTEXT 인덱스 생성"""
+    if schema_editor.connection.vendor != "mysql":
+        return
+    schema_editor.execute(
+        f"ALTER TABLE recipes ADD FULLTEXT INDEX {FULLTEXT_INDEX_NAME} "
+        "(CKG_NM) WITH PARSER ngram"
+    )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "mysql":
+        return
+    schema_editor.execute(f"ALTER TABLE recipes DROP INDEX {FULLTEXT_INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipe", "0004_ingredient_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipeNameGram",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("gram", models.CharField(max_length=2, verbose_name="bigram")),
+                (
+                    "recipe",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="name_grams",
+                        to="recipe.recipe",
+                        verbose_name="레시피",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "요리 이름 색인",
+                "verbose_name_plural": "요리 이름 색인",
+                "db_table": "recipe_name_grams",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="recipenamegram",
+            constraint=models.UniqueConstraint(
+                fields=("gram", "recipe"), name="uniq_gram_recipe"
+            ),
+        ),
+        migrations.RunPython(add_fulltext_index, reverse_code=drop_fulltext_index),
+    ]
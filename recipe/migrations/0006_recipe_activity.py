@@ -0,0 +1,30 @@
+# Generated by Django 4.2.9 on 2026-10-18 19:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipe", "0005_recipe_name_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recipe",
+            name="last_shown_at",
+            field=models.DateTimeField(null=True, verbose_name="최근 노출 시각"),
+        ),
+        migrations.AddField(
+            model_name="recipe",
+            name="view_count",
+            field=models.PositiveIntegerField(default=0, verbose_name="조회수"),
+        ),
+        migrations.AddIndex(
+            model_name="recipe",
+            index=models.Index(
+                fields=["-last_shown_at", "-view_count", "id"],
+                name="recipes_shown_views_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.9 on 2026-10-18 19:36
+
+from django.db import migrations, models
+
+from recipe.parsers import CONTENT_HASH_FIELDS, recipe_content_hash
+
+BACKFILL_BATCH_SIZE = 2000
+
+
+def backfill_content_hash(apps, schema_editor):
+    """기존 레시피의 내용 해시 채우기 (같은 내용이 여러 개면 id가 가장 작은 레시피에만)"""
+    Recipe = apps.get_model("recipe", "Recipe")
+    seen = set()
+    batch = []
+    recipes = Recipe.objects.only("id", *CONTENT_HASH_FIELDS).order_by("id")
+
+    for recipe in recipes.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        content_hash = recipe_content_hash(
+            {name: getattr(recipe, name) for name in CONTENT_HASH_FIELDS}
+        )
+        if content_hash in seen:
+            continue
+        seen.add(content_hash)
+        recipe.content_hash = content_hash
+        batch.append(recipe)
+
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            Recipe.objects.bulk_update(batch, ["content_hash"])
+            batch = []
+
+    if batch:
+        Recipe.objects.bulk_update(batch, ["content_hash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipe", "0006_recipe_activity"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recipe",
+            name="content_hash",
+            field=models.CharField(
+                editable=False,
+                max_length=64,
+                null=True,
+                unique=True,
+                verbose_name="내용 해시",
+            ),
+        ),
+        migrations.RunPython(
+            backfill_content_hash, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.9 on 2026-10-18 19:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipe", "0007_recipe_content_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipePool",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "time_bucket",
+                    models.CharField(max_length=20, verbose_name="조리시간 버킷"),
+                ),
+                (
+                    "serving_bucket",
+                    models.CharField(max_length=20, verbose_name="인분 버킷"),
+                ),
+                (
+                    "recipe_ids",
+                    models.BinaryField(default=b"", verbose_name="레시피 id 목록"),
+                ),
+                (
+                    "size",
+                    models.PositiveIntegerField(default=0, verbose_name="레시피 수"),
+                ),
+                ("built_at", models.DateTimeField(verbose_name="전체 생성 시각")),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="수정 시각"),
+                ),
+            ],
+            options={
+                "verbose_name": "추천 레시피 풀",
+                "verbose_name_plural": "추천 레시피 풀",
+                "db_table": "recipe_pools",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="recipepool",
+            constraint=models.UniqueConstraint(
+                fields=("time_bucket", "serving_bucket"), name="uniq_pool_bucket"
+            ),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 4.2.9 on 2026-10-18 20:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipe", "0008_recipe_pools"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recipepool",
+            name="last_recipe_id",
+            field=models.BigIntegerField(
+                default=0, verbose_name="생성 시점의 마지막 레시피 id"
+            ),
+        ),
+        migrations.CreateModel(
+            name="RecipePoolMember",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "time_bucket",
+                    models.CharField(max_length=20, verbose_name="조리시간 버킷"),
+                ),
+                (
+                    "serving_bucket",
+                    models.CharField(max_length=20, verbose_name="인분 버킷"),
+                ),
+                (
+                    "recipe",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pool_members",
+                        to="recipe.recipe",
+                        verbose_name="레시피",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "추천 레시피 풀 추가분",
+                "verbose_name_plural": "추천 레시피 풀 추가분",
+                "db_table": "recipe_pool_members",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="recipepoolmember",
+            constraint=models.UniqueConstraint(
+                fields=("time_bucket", "serving_bucket", "recipe"),
+                name="uniq_pool_member",
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.9 on 2026-10-18 20:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipe", "0009_recipe_pool_members"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="recipe",
+            index=models.Index(fields=["CKG_NM", "id"], name="recipes_name_id_idx"),
+        ),
+    ]
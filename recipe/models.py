@@ -1,5 +1,8 @@
 from django.db import models
 
+from .parsers import parse_cook_minutes, parse_servings
+
+
 class Recipe(models.Model):
     # CSV 컬럼명과 매핑된 DB 필드
     CKG_NM = models.CharField(max_length=255, verbose_name="요리 이름", null=True)
@@ -10,15 +13,54 @@ class Recipe(models.Model):
     CKG_METHOD_CN = models.TextField(verbose_name="조리 방법 (AI 생성)", null=True)
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성 날짜")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="수정 날짜")
+    # 필터링용 정규화 컬럼 (CKG_TIME_NM, CKG_INBUN_NM에서 파싱, 인덱스 사용)
+    cook_minutes = models.PositiveIntegerField(
+        verbose_name="조리 시간(분)", null=True, db_index=True
+    )
+    serving_count = models.PositiveIntegerField(
+        verbose_name="인분 수(숫자)", null=True, db_index=True
+    )
+    # 조리 방법 사전 생성 우선순위용 (최근 노출, 조회수)
+    view_count = models.PositiveIntegerField(default=0, verbose_name="조회수")
+    last_shown_at = models.DateTimeField(null=True, verbose_name="최근 노출 시각")
+    # CSV 가져오기 중복 판별용 (요리 이름/재료/인분/조리시간 해시, 직접 추가한 레시피는 NULL)
+    content_hash = models.CharField(
+        max_length=64, unique=True, null=True, editable=False, verbose_name="내용 해시"
+    )
 
     class Meta:
         db_table = "recipes"
+        indexes = [
+            models.Index(
+                fields=["-last_shown_at", "-view_count", "id"],
+                name="recipes_shown_views_idx",
+            ),
+            # 이름별 가장 먼저 저장된 레시피 조회 (추천 풀 추가, 같은 이름 레시피 재사용)
+            models.Index(fields=["CKG_NM", "id"], name="recipes_name_id_idx"),
+        ]
         verbose_name = "레시피"
         verbose_name_plural = "레시피"
 
     def __str__(self):
         return self.CKG_NM if self.CKG_NM else "레시피 이름 없음"
 
+    def save(self, *args, **kwargs):
+        self.normalize_fields()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if update_fields & {"CKG_TIME_NM", "CKG_INBUN_NM"}:
+                update_fields |= {"cook_minutes", "serving_count"}
+            # 일부 필드만 저장해도 수정 날짜 갱신 (상세 응답 ETag/Last-Modified에 사용)
+            update_fields.add("updated_at")
+            kwargs["update_fields"] = update_fields
+        super().save(*args, **kwargs)
+
+    def normalize_fields(self):
+        """조리시간/인분 문자열을 정수 컬럼으로 변환 (bulk_create 전에도 호출)"""
+        self.cook_minutes = parse_cook_minutes(self.CKG_TIME_NM)
+        self.serving_count = parse_servings(self.CKG_INBUN_NM)
+
     # API 응답이나 Serializer에서 사용하기 위한 프로퍼티
     @property
     def name(self):
@@ -43,3 +85,128 @@ class Recipe(models.Model):
     @property
     def instructions(self):
         return self.CKG_METHOD_CN
+
+
+class Ingredient(models.Model):
+    """정규화된 재료명 (CKG_MTRL_CN 파싱 결과)"""
+
+    name = models.CharField(max_length=100, unique=True, verbose_name="재료명")
+
+    class Meta:
+        db_table = "ingredients"
+        verbose_name = "재료"
+        verbose_name_plural = "재료"
+
+    def __str__(self):
+        return self.name
+
+
+class RecipeIngredient(models.Model):
+    """재료 -> 레시피 역색인 (posting)"""
+
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name="ingredient_links",
+        verbose_name="레시피",
+    )
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.CASCADE,
+        related_name="recipe_links",
+        verbose_name="재료",
+    )
+
+    class Meta:
+        db_table = "recipe_ingredients"
+        verbose_name = "레시피 재료"
+        verbose_name_plural = "레시피 재료"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ingredient", "recipe"], name="uniq_ingredient_recipe"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.recipe_id} - {self.ingredient_id}"
+
+
+class RecipeNameGram(models.Model):
+    """요리 이름 bigram -> 레시피 역색인 (MySQL FULLTEXT를 쓸 수 없는 환경용)"""
+
+    gram = models.CharField(max_length=2, verbose_name="bigram")
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name="name_grams",
+        verbose_name="레시피",
+    )
+
+    class Meta:
+        db_table = "recipe_name_grams"
+        verbose_name = "요리 이름 색인"
+        verbose_name_plural = "요리 이름 색인"
+        constraints = [
+            models.UniqueConstraint(fields=["gram", "recipe"], name="uniq_gram_recipe")
+        ]
+
+    def __str__(self):
+        return f"{self.gram} - {self.recipe_id}"
+
+
+class RecipePool(models.Model):
+    """
+    추천용 레시피 풀 - (조리시간 버킷, 인분 버킷)마다 이름 중복 없는 레시피 id 목록
+    - recipe_ids: int64 little-endian으로 이어 붙인 바이트 (풀마다 한 행, 전체 생성 시에만 기록)
+    """
+
+    time_bucket = models.CharField(max_length=20, verbose_name="조리시간 버킷")
+    serving_bucket = models.CharField(max_length=20, verbose_name="인분 버킷")
+    recipe_ids = models.BinaryField(default=b"", verbose_name="레시피 id 목록")
+    size = models.PositiveIntegerField(default=0, verbose_name="레시피 수")
+    # 이 id 이후에 저장된 레시피는 RecipePoolMember에 추가됨
+    last_recipe_id = models.BigIntegerField(
+        default=0, verbose_name="생성 시점의 마지막 레시피 id"
+    )
+    built_at = models.DateTimeField(verbose_name="전체 생성 시각")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="수정 시각")
+
+    class Meta:
+        db_table = "recipe_pools"
+        verbose_name = "추천 레시피 풀"
+        verbose_name_plural = "추천 레시피 풀"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["time_bucket", "serving_bucket"], name="uniq_pool_bucket"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.time_bucket} / {self.serving_bucket} ({self.size})"
+
+
+class RecipePoolMember(models.Model):
+    """풀을 만든 뒤 저장된 레시피 (추가만 하는 행, 다음 전체 생성 때 비움)"""
+
+    time_bucket = models.CharField(max_length=20, verbose_name="조리시간 버킷")
+    serving_bucket = models.CharField(max_length=20, verbose_name="인분 버킷")
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name="pool_members",
+        verbose_name="레시피",
+    )
+
+    class Meta:
+        db_table = "recipe_pool_members"
+        verbose_name = "추천 레시피 풀 추가분"
+        verbose_name_plural = "추천 레시피 풀 추가분"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["time_bucket", "serving_bucket", "recipe"],
+                name="uniq_pool_member",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.time_bucket} / {self.serving_bucket} - {self.recipe_id}"
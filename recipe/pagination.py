@@ -0,0 +1,53 @@
+import base64
+import binascii
+import json
+
+
+def encode_cursor(last_id):
+    """마지막으로 반환한 id를 불투명 커서 문자열로 변환"""
+    payload = json.dumps({"after": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """커서 문자열 -> 마지막 id (형식이 잘못되면 ValueError)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_id = data["after"]
+    except (binascii.Error, UnicodeDecodeError, TypeError, KeyError, ValueError):
+        raise ValueError("잘못된 커서입니다.")
+    if isinstance(last_id, bool) or not isinstance(last_id, int):
+        raise ValueError("잘못된 커서입니다.")
+    return last_id
+
+
+def keyset_page(queryset, fields, after=None, limit=50):
+    """
+    id 기준 keyset 페이지 조회 - (행 dict 목록, 다음 커서 또는 None)
+    - OFFSET 없이 id > after 조건으로 PK 인덱스를 따라가므로 뒤쪽 페이지도 비용 일정
+    - limit + 1개를 조회하여 다음 페이지 존재 여부 판단
+    """
+    rows = list(_after(queryset, after).values(*fields)[: limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1]["id"])
+
+
+def iter_keyset_batches(queryset, fields, after=None, batch_size=1000):
+    """id 순서로 batch_size개씩 조회하여 행 dict 목록을 차례로 반환 (결과 크기와 관계없이 메모리 일정)"""
+    while True:
+        rows = list(_after(queryset, after).values(*fields)[:batch_size])
+        if rows:
+            yield rows
+        if len(rows) < batch_size:
+            return
+        after = rows[-1]["id"]
+
+
+def _after(queryset, after):
+    queryset = queryset.order_by("id")
+    if after is not None:
+        queryset = queryset.filter(id__gt=after)
+    return queryset
@@ -0,0 +1,136 @@
+import hashlib
+import re
+import unicodedata
+
+# "2시간 30분", "1시간이상", "90분 이내" 등의 표기에서 숫자를 추출
+HOUR_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*시간")
+MINUTE_PATTERN = re.compile(r"(\d+)\s*분")
+SERVING_PATTERN = re.compile(r"(\d+)\s*인분")
+NUMBER_PATTERN = re.compile(r"\d+")
+
+
+def parse_cook_minutes(value):
+    """조리시간 문자열("30분", "2시간 이내", "1시간 30분")을 분 단위 정수로 변환"""
+    if value is None:
+        return None
+
+    text = str(value).strip()
+    if not text:
+        return None
+
+    hours = HOUR_PATTERN.search(text)
+    minutes = MINUTE_PATTERN.search(text)
+
+    if hours or minutes:
+        total = 0
+        if hours:
+            total += round(float(hours.group(1)) * 60)
+        if minutes:
+            total += int(minutes.group(1))
+        return total
+
+    # 단위 없이 숫자만 있는 경우 분으로 간주 (예: AI 응답 "30")
+    number = NUMBER_PATTERN.search(text)
+    return int(number.group()) if number else None
+
+
+def parse_servings(value):
+    """인분 문자열("4인분", "6인분 이상", "2")을 정수로 변환"""
+    if value is None:
+        return None
+
+    text = str(value).strip()
+    if not text:
+        return None
+
+    match = SERVING_PATTERN.search(text) or NUMBER_PATTERN.search(text)
+    if not match:
+        return None
+
+    servings = int(match.group(1) if match.re is SERVING_PATTERN else match.group())
+    return servings or None
+
+
+# 재료 목록("[재료] 어묵 2개| 당근 1/2개| 소금 약간")에서 수량/단위를 제거하기 위한 패턴
+SECTION_PATTERN = re.compile(r"\[[^\]]*\]")
+PAREN_PATTERN = re.compile(r"\([^)]*\)")
+QUANTITY_TOKEN_PATTERN = re.compile(
+    r"^[\d./~\-+½⅓¼]+|^(한|두|세|네|반)(개|줌|꼬집|컵|큰술|작은술|스푼|숟가락|장|쪽|톨|대|봉|모)$"
+)
+TRAILING_QUANTITY_PATTERN = re.compile(r"[\d./~\-+½⅓¼]+\S*$")
+QUANTITY_WORDS = {"약간", "조금", "적당량", "적당히", "소량", "많이", "듬뿍", "취향껏"}
+INGREDIENT_NAME_MAX_LENGTH = 100
+
+
+def normalize_ingredient_name(value):
+    """재료명 정규화 (공백 제거, 소문자화) - 검색어와 색인 모두 같은 규칙 사용"""
+    return "".join(str(value).split()).lower()[:INGREDIENT_NAME_MAX_LENGTH]
+
+
+def parse_ingredients(value):
+    """'|'로 구분된 재료 문자열에서 수량과 단위를 제거한 재료명 목록 반환 (중복 제거, 순서 유지)"""
+    if value is None:
+        return []
+
+    # "[재료]", "[양념]" 같은 구분 표시도 항목 구분자로 취급
+    text = SECTION_PATTERN.sub("|", str(value))
+    names = []
+
+    for item in text.split("|"):
+        tokens = PAREN_PATTERN.sub(" ", item).split()
+        if not tokens:
+            continue
+
+        # 첫 수량 토큰("2개", "1/2 큰술", "약간")부터 뒤는 모두 제거
+        for position, token in enumerate(tokens[1:], 1):
+            if token in QUANTITY_WORDS or QUANTITY_TOKEN_PATTERN.match(token):
+                tokens = tokens[:position]
+                break
+
+        # 붙어 있는 수량 제거 ("돼지고기300g")
+        tokens[-1] = TRAILING_QUANTITY_PATTERN.sub("", tokens[-1])
+        name = normalize_ingredient_name(" ".join(tokens))
+        if name and name not in QUANTITY_WORDS and name not in names:
+            names.append(name)
+
+    return names
+
+
+NAME_GRAM_SIZE = 2
+
+
+def name_ngrams(value, size=NAME_GRAM_SIZE):
+    """요리 이름/검색어를 단어별 n-gram(기본 bigram) 집합으로 변환 (한 글자 단어는 그대로)"""
+    if value is None:
+        return set()
+
+    grams = set()
+    for token in str(value).lower().split():
+        if len(token) < size:
+            grams.add(token)
+            continue
+        for start in range(len(token) - size + 1):
+            grams.add(token[start : start + size])
+    return grams
+
+
+# 같은 레시피인지 판단하는 컬럼 (이미지 URL은 제외)
+CONTENT_HASH_FIELDS = ("CKG_NM", "CKG_MTRL_CN", "CKG_INBUN_NM", "CKG_TIME_NM")
+
+
+def clean_text(value, max_length=None):
+    """공백 정리 + 유니코드 정규화 (NFC, 조합형 한글 통일), 빈 값은 None"""
+    if value is None:
+        return None
+    text = unicodedata.normalize("NFC", str(value)).strip()
+    if not text:
+        return None
+    return text[:max_length] if max_length else text
+
+
+def recipe_content_hash(fields):
+    """요리 이름/재료/인분/조리시간으로 만든 레시피 내용 해시 (CSV 가져오기 중복 판별용)"""
+    payload = "\x1f".join(
+        clean_text(fields.get(name)) or "" for name in CONTENT_HASH_FIELDS
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
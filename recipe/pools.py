@@ -0,0 +1,300 @@
+import random
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .filters import SERVING_BUCKETS, TIME_BUCKETS
+from .models import Recipe, RecipePool, RecipePoolMember
+
+# 어느 버킷에도 속하지 않는 레시피 (값 없음, 3인분 등) - 필터를 선택하지 않았을 때만 사용
+OTHER_BUCKET = "기타"
+TIME_KEYS = (*TIME_BUCKETS, OTHER_BUCKET)
+SERVING_KEYS = (*SERVING_BUCKETS, OTHER_BUCKET)
+# 풀에 저장하는 id 형식 (int64 little-endian)
+ID_DTYPE = np.dtype("<i8")
+
+
+def _in_bounds(value, bounds):
+    low, high = bounds
+    if value is None:
+        return False
+    return (low is None or value >= low) and (high is None or value <= high)
+
+
+def _bucket_keys(value, buckets):
+    """값이 속하는 버킷 이름들 (경계값은 두 버킷 모두, 없으면 기타)"""
+    keys = [name for name, bounds in buckets.items() if _in_bounds(value, bounds)]
+    return keys or [OTHER_BUCKET]
+
+
+def recipe_pool_keys(cook_minutes, serving_count):
+    """레시피가 들어갈 (조리시간 버킷, 인분 버킷) 풀 목록"""
+    return [
+        (time_key, serving_key)
+        for time_key in _bucket_keys(cook_minutes, TIME_BUCKETS)
+        for serving_key in _bucket_keys(serving_count, SERVING_BUCKETS)
+    ]
+
+
+def selected_pool_keys(time_filters=None, serving_size=None):
+    """사이드바 필터에 해당하는 풀 목록 (선택하지 않은 쪽은 기타를 포함한 전체)"""
+    time_keys = [f for f in time_filters or [] if f in TIME_BUCKETS] or TIME_KEYS
+    serving_keys = [serving_size] if serving_size in SERVING_BUCKETS else SERVING_KEYS
+    return [
+        (time_key, serving_key)
+        for time_key in time_keys
+        for serving_key in serving_keys
+    ]
+
+
+def _pack(ids):
+    return np.asarray(ids, dtype=ID_DTYPE).tobytes()
+
+
+def _unpack(data):
+    return np.frombuffer(bytes(data), dtype=ID_DTYPE)
+
+
+def build_recipe_pools(chunk_size=5000, log=print):
+    """
+    전체 레시피로 풀을 다시 만듦 (풀마다 이름별로 가장 먼저 저장된 레시피 하나)
+    - 레시피를 id 순서로 한 번 훑고, 풀 행 교체와 추가분(RecipePoolMember) 삭제는 트랜잭션 하나로 처리
+    - 조리시간/인분이 바뀐 레시피도 이때 새 풀로 옮겨짐
+    - 풀별 레시피 수 {(조리시간 버킷, 인분 버킷): 수} 반환
+    """
+    members = {key: {} for key in selected_pool_keys()}
+    last_recipe_id = 0
+    rows = Recipe.objects.order_by("id").values_list(
+        "id", "CKG_NM", "cook_minutes", "serving_count"
+    )
+    for count, (recipe_id, name, cook_minutes, serving_count) in enumerate(
+        rows.iterator(chunk_size=chunk_size), 1
+    ):
+        for key in recipe_pool_keys(cook_minutes, serving_count):
+            members[key].setdefault(name, recipe_id)
+        last_recipe_id = recipe_id
+        if count % (chunk_size * 20) == 0:
+            log(f"{count}개 레시피 처리")
+
+    built_at = timezone.now()
+    with transaction.atomic():
+        RecipePool.objects.all().delete()
+        RecipePoolMember.objects.filter(recipe_id__lte=last_recipe_id).delete()
+        RecipePool.objects.bulk_create(
+            [
+                RecipePool(
+                    time_bucket=time_key,
+                    serving_bucket=serving_key,
+                    recipe_ids=_pack(list(names.values())),
+                    size=len(names),
+                    last_recipe_id=last_recipe_id,
+                    built_at=built_at,
+                )
+                for (time_key, serving_key), names in members.items()
+            ]
+        )
+    recipe_pools.reset()
+    return {key: len(names) for key, names in members.items()}
+
+
+def add_to_recipe_pools(recipe_ids):
+    """
+    풀을 만든 뒤 새로 저장된 레시피를 풀 추가분(RecipePoolMember)에 기록 (풀을 만든 적이 없으면 무시)
+    - 풀 행은 건드리지 않고 추가분 행만 INSERT (잠금이나 id 목록 재기록 없음, 대량 가져오기에도 청크 크기에 비례)
+    - 같은 풀에 같은 이름의 더 먼저 저장된 레시피가 있으면 추가하지 않음
+    - 풀 생성 이전 레시피(재색인, 조리시간/인분 수정)는 다음 전체 생성(build_recipe_pools --loop)에서 반영
+    """
+    recipe_ids = [recipe_id for recipe_id in recipe_ids if recipe_id is not None]
+    if not recipe_ids:
+        return
+    last_recipe_id = RecipePool.objects.aggregate(last=Max("last_recipe_id"))["last"]
+    if last_recipe_id is None:
+        return
+    recipe_ids = [recipe_id for recipe_id in recipe_ids if recipe_id > last_recipe_id]
+    if not recipe_ids:
+        return
+
+    rows = list(
+        Recipe.objects.filter(id__in=recipe_ids).values_list(
+            "id", "CKG_NM", "cook_minutes", "serving_count"
+        )
+    )
+    names = {name for _, name, _, _ in rows}
+    # 풀, 이름마다 가장 작은 id가 풀에 들어갈 레시피
+    first = {}
+    same_names = Recipe.objects.filter(CKG_NM__in=names).values_list(
+        "id", "CKG_NM", "cook_minutes", "serving_count"
+    )
+    for recipe_id, name, cook_minutes, serving_count in same_names.order_by("id"):
+        for key in recipe_pool_keys(cook_minutes, serving_count):
+            first.setdefault((key, name), recipe_id)
+
+    additions = [
+        RecipePoolMember(
+            time_bucket=time_key, serving_bucket=serving_key, recipe_id=recipe_id
+        )
+        for recipe_id, name, cook_minutes, serving_count in rows
+        for time_key, serving_key in recipe_pool_keys(cook_minutes, serving_count)
+        if first.get(((time_key, serving_key), name)) == recipe_id
+    ]
+    if not additions:
+        return
+
+    RecipePoolMember.objects.bulk_create(additions, ignore_conflicts=True)
+    # 이 프로세스는 다음 조회 때 바로 반영
+    recipe_pools.invalidate()
+
+
+class RecipePoolCache:
+    """
+    추천 레시피 풀의 프로세스별 메모리 사본 (풀마다 NumPy id 배열)
+    - RECIPE_POOL_SYNC_INTERVAL마다 풀 행의 수정 시각을 확인하여 다시 생성된 경우에만 id 목록 적재
+    - 그 사이 추가분은 마지막으로 읽은 추가분 id 이후 행만 읽어 배열 뒤에 붙임
+    - 선택한 풀들의 합집합에서 크기 비례로 풀을 고르고 임의 위치의 id를 꺼내므로 한 번 뽑는 데 O(1)
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        """다음 조회 시 DB에서 다시 적재"""
+        with self._lock:
+            self.pools = {}
+            self.versions = {}
+            self.built_at = None
+            self.loaded_at = None
+            self.synced_at = None
+            self.last_member_id = 0
+            self.added = 0
+
+    def invalidate(self):
+        """다음 조회 시 바뀐 풀 확인 (동기화 주기를 기다리지 않음)"""
+        self.synced_at = None
+
+    def sync(self):
+        """풀이 다시 생성되었으면 전체 적재, 아니면 새 추가분만 반영 (풀 행이 모두 없으면 비움)"""
+        with self._lock:
+            versions = dict(
+                ((time_key, serving_key), updated_at)
+                for time_key, serving_key, updated_at in RecipePool.objects.values_list(
+                    "time_bucket", "serving_bucket", "updated_at"
+                )
+            )
+            if versions != self.versions:
+                self.pools = {}
+                self.built_at = None
+                self.last_member_id = 0
+                self.added = 0
+                for pool in RecipePool.objects.all():
+                    self.pools[(pool.time_bucket, pool.serving_bucket)] = _unpack(
+                        pool.recipe_ids
+                    )
+                    self.built_at = pool.built_at
+                self.versions = versions
+                self.loaded_at = timezone.now()
+
+            if self.pools:
+                self._append_members()
+            self.synced_at = time.monotonic()
+
+    def _append_members(self):
+        added = {}
+        members = (
+            RecipePoolMember.objects.filter(id__gt=self.last_member_id)
+            .order_by("id")
+            .values_list("id", "time_bucket", "serving_bucket", "recipe_id")
+        )
+        for member_id, time_key, serving_key, recipe_id in members:
+            added.setdefault((time_key, serving_key), []).append(recipe_id)
+            self.last_member_id = member_id
+        for key, ids in added.items():
+            if key in self.pools:
+                self.pools[key] = np.concatenate(
+                    (self.pools[key], np.asarray(ids, dtype=ID_DTYPE))
+                )
+                self.added += len(ids)
+
+    def _prepare(self):
+        interval = getattr(settings, "RECIPE_POOL_SYNC_INTERVAL", 30)
+        if self.synced_at is None or time.monotonic() - self.synced_at >= interval:
+            self.sync()
+
+    def is_built(self):
+        with self._lock:
+            self._prepare()
+            return bool(self.pools)
+
+    def sample_ids(self, count, time_filters=None, serving_size=None):
+        """
+        선택한 풀들의 합집합에서 중복 없이 최대 count개 id 추출
+        - 풀 사이에는 이름이 겹칠 수 있으므로 호출 측에서 필요한 수보다 넉넉히 뽑아 이름 중복 제거
+        - 경계값(5분, 15분, 30분) 레시피는 두 풀에 있어 조금 더 자주 뽑힐 수 있음
+        """
+        with self._lock:
+            self._prepare()
+            pools = [
+                self.pools[key]
+                for key in selected_pool_keys(time_filters, serving_size)
+                if key in self.pools and self.pools[key].size
+            ]
+        total = sum(pool.size for pool in pools)
+        if total == 0 or count <= 0:
+            return []
+        if total <= count:
+            return list(dict.fromkeys(np.concatenate(pools).tolist()))
+
+        offsets = np.cumsum([pool.size for pool in pools])
+        picked = {}
+        for _ in range(count * 4):
+            position = random.randrange(total)
+            index = int(np.searchsorted(offsets, position, side="right"))
+            start = offsets[index - 1] if index else 0
+            picked.setdefault(int(pools[index][position - start]))
+            if len(picked) >= count:
+                break
+        return list(picked)
+
+    def stats(self):
+        """풀별 크기, 생성 시각/경과 시간, 생성 후 추가된 레시피 수"""
+        with self._lock:
+            self._prepare()
+            age = (
+                (timezone.now() - self.built_at).total_seconds()
+                if self.built_at
+                else None
+            )
+            return {
+                "built": bool(self.pools),
+                "built_at": self.built_at.isoformat() if self.built_at else None,
+                "age_seconds": round(age, 1) if age is not None else None,
+                "rebuild_due": (
+                    age is not None and age >= settings.RECIPE_POOL_REBUILD_INTERVAL
+                ),
+                "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None,
+                "total_size": sum(int(ids.size) for ids in self.pools.values()),
+                "added_since_build": self.added,
+                "pools": [
+                    {
+                        "time_bucket": time_key,
+                        "serving_bucket": serving_key,
+                        "size": int(ids.size),
+                    }
+                    for (time_key, serving_key), ids in self.pools.items()
+                ],
+            }
+
+
+recipe_pools = RecipePoolCache()
+
+
+def get_recipe_pools():
+    """만들어진 풀 반환 (build_recipe_pools를 실행하기 전이면 None - 카탈로그/DB 샘플링으로 대체)"""
+    if not recipe_pools.is_built():
+        return None
+    return recipe_pools
@@ -0,0 +1,238 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .detail_cache import invalidate_recipe_detail
+from .generation import _request_instructions
+from .models import Recipe
+from .singleflight import instruction_flight
+
+# 조리 방법이 비어 있는 레시피
+MISSING_INSTRUCTIONS = Q(CKG_METHOD_CN__isnull=True) | Q(CKG_METHOD_CN="")
+
+
+class RateLimiter:
+    """분당 요청 수 제한 (토큰 버킷, 여러 스레드에서 공유)"""
+
+    def __init__(self, requests_per_minute):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(1.0, min(requests_per_minute, 10))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """요청 1건을 보낼 수 있을 때까지 대기"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+
+
+def pending_recipes():
+    """
+    조리 방법 생성 대상 (우선순위 순)
+    - 최근 노출된 레시피 -> 조회수 많은 레시피 -> id 순
+    - 상태는 DB 자체(CKG_METHOD_CN이 비었는지)이므로 중단 후 다시 실행하면 이어서 처리
+    """
+    return (
+        Recipe.objects.filter(MISSING_INSTRUCTIONS)
+        .only("id", "CKG_NM", "CKG_MTRL_CN", "CKG_TIME_NM", "CKG_INBUN_NM")
+        .order_by(
+            F("last_shown_at").desc(nulls_last=True), F("view_count").desc(), "id"
+        )
+    )
+
+
+def save_instructions_batch(results):
+    """
+    생성된 조리 방법을 한 트랜잭션으로 저장
+    - 아직 비어 있는 경우에만 갱신 (그 사이 사용자 요청으로 생성된 값은 덮어쓰지 않음)
+    - 저장된 건수 반환
+    """
+    if not results:
+        return 0
+
+    now = timezone.now()
+    saved = 0
+    with transaction.atomic():
+        for recipe_id, instructions in results.items():
+            saved += Recipe.objects.filter(MISSING_INSTRUCTIONS, id=recipe_id).update(
+                CKG_METHOD_CN=instructions, updated_at=now
+            )
+    # update()는 post_save 신호를 보내지 않으므로 상세 응답 캐시를 직접 삭제
+    invalidate_recipe_detail(results.keys())
+    return saved
+
+
+def _generate(limiter, recipe):
+    limiter.acquire()
+    return _request_instructions(recipe)
+
+
+def _claim(recipes):
+    """
+    레시피별 생성 잠금을 기다리지 않고 획득 (해당 레시피를 저장할 때까지 유지)
+    - 사용자 요청이 생성 중이거나 그 사이 저장된 레시피는 제외
+    - ({레시피 id: 잠금 해제용 ExitStack}, 생성할 레시피, 건너뛴 레시피 id) 반환
+    """
+    locks = {}
+    try:
+        for recipe in recipes:
+            stack = ExitStack()
+            if stack.enter_context(instruction_flight.lock(recipe.id, timeout=0)):
+                locks[recipe.id] = stack
+            else:
+                stack.close()
+
+        still_missing = set(
+            Recipe.objects.filter(MISSING_INSTRUCTIONS, id__in=list(locks)).values_list(
+                "id", flat=True
+            )
+        )
+    except BaseException:
+        _release_all(locks)
+        raise
+
+    for recipe_id in list(locks):
+        if recipe_id not in still_missing:
+            locks.pop(recipe_id).close()
+    claimed = [recipe for recipe in recipes if recipe.id in locks]
+    skipped = {recipe.id for recipe in recipes if recipe.id not in locks}
+    return locks, claimed, skipped
+
+
+def _release_all(locks):
+    for stack in locks.values():
+        stack.close()
+    locks.clear()
+
+
+def _flush_results(results, locks):
+    """모아 둔 조리 방법을 한 트랜잭션으로 저장한 뒤 해당 레시피들의 잠금 해제 - 저장된 건수 반환"""
+    if not results:
+        return 0
+    try:
+        return save_instructions_batch(results)
+    finally:
+        for recipe_id in results:
+            locks.pop(recipe_id).close()
+        results.clear()
+
+
+def _generate_batch(executor, limiter, recipes, locks, failed_ids):
+    """
+    레시피들의 조리 방법을 동시에 생성하고, 끝난 결과를 모아서 저장 후 그 레시피들의 잠금 해제
+    - INSTRUCTION_PREGEN_SAVE_BATCH_SIZE건이 모이거나 가장 먼저 끝난 결과가
+      INSTRUCTION_PREGEN_SAVE_INTERVAL초 기다렸으면 저장 (배치 전체가 끝날 때까지 잡아 두지 않음)
+    - 저장된 건수 반환
+    """
+    save_batch_size = settings.INSTRUCTION_PREGEN_SAVE_BATCH_SIZE
+    save_interval = settings.INSTRUCTION_PREGEN_SAVE_INTERVAL
+    futures = {
+        executor.submit(_generate, limiter, recipe): recipe for recipe in recipes
+    }
+    saved = 0
+    results = {}
+    first_result_at = None
+    pending = set(futures)
+    while pending:
+        timeout = None
+        if results:
+            timeout = max(0.0, first_result_at + save_interval - time.monotonic())
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            recipe = futures[future]
+            try:
+                instructions = future.result()
+            except Exception as e:
+                print(f"조리 방법 생성 실패 (레시피 {recipe.id}): {str(e)}")
+                instructions = None
+            if instructions and instructions.strip():
+                if not results:
+                    first_result_at = time.monotonic()
+                results[recipe.id] = instructions
+                if len(results) >= save_batch_size:
+                    saved += _flush_results(results, locks)
+            else:
+                # 저장할 것이 없으므로 바로 잠금 해제
+                failed_ids.add(recipe.id)
+                locks.pop(recipe.id).close()
+
+        if results and time.monotonic() - first_result_at >= save_interval:
+            saved += _flush_results(results, locks)
+
+    saved += _flush_results(results, locks)
+    return saved
+
+
+def pregenerate_instructions(
+    concurrency=None,
+    requests_per_minute=None,
+    batch_size=None,
+    limit=None,
+    stop_event=None,
+    log=print,
+):
+    """
+    조리 방법이 없는 레시피를 우선순위 순으로 미리 생성
+    - concurrency개 스레드로 동시 생성, 분당 requests_per_minute건으로 제한
+    - batch_size건씩 대상을 가져와 생성, 끝난 결과는 조금씩 모아서 저장
+    - 생성 중인 레시피는 저장할 때까지 잠금을 유지하여 사용자 요청과 중복 생성하지 않음
+    - 실패한 레시피는 이번 실행에서 다시 시도하지 않음
+    - (처리 건수, 저장 건수, 실패 건수) 반환
+    """
+    concurrency = concurrency or settings.INSTRUCTION_PREGEN_CONCURRENCY
+    requests_per_minute = requests_per_minute or settings.INSTRUCTION_PREGEN_RPM
+    batch_size = batch_size or settings.INSTRUCTION_PREGEN_BATCH_SIZE
+
+    limiter = RateLimiter(requests_per_minute)
+    failed_ids = set()
+    skipped_ids = set()
+    processed = saved = 0
+    started = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while limit is None or processed < limit:
+            if stop_event is not None and stop_event.is_set():
+                break
+
+            size = batch_size if limit is None else min(batch_size, limit - processed)
+            recipes = list(
+                pending_recipes().exclude(id__in=failed_ids | skipped_ids)[:size]
+            )
+            if not recipes:
+                break
+
+            locks, claimed, skipped = _claim(recipes)
+            skipped_ids |= skipped
+            try:
+                saved += _generate_batch(executor, limiter, claimed, locks, failed_ids)
+            finally:
+                # 중단된 경우 아직 끝나지 않은 레시피의 잠금 해제
+                _release_all(locks)
+
+            processed += len(recipes)
+            elapsed = time.monotonic() - started
+            log(
+                f"{processed}개 처리, {saved}개 저장, {len(failed_ids)}개 실패 "
+                f"({processed / elapsed * 60:.1f}건/분)"
+            )
+
+    return processed, saved, len(failed_ids)
@@ -0,0 +1,54 @@
+import random
+
+from django.db.models import Max, Min
+
+from .models import Recipe
+
+# 임의 지점에서 한 번에 조회할 행 수 (이 중 하나를 무작위로 선택)
+PROBE_SIZE = 8
+# 탐색 횟수 상한 (k와 관계없이 쿼리 수가 이 값에 비례)
+MAX_PROBES = 15
+
+
+def sample_recipe_ids(queryset, k, probe_size=PROBE_SIZE, max_probes=MAX_PROBES):
+    """
+    필터가 적용된 queryset에서 이름 중복 없이 레시피 id 최대 k개를 무작위로 추출
+
+    - 테이블 전체를 불러오지 않고, 임의의 id 지점부터 PK 인덱스를 따라 probe_size개씩 조회(id 범위 탐색)
+    - 이미 뽑힌 이름은 쿼리 단계에서 제외하여 이름 중복을 DB에서 걸러냄
+    - 탐색은 최대 min(k * 3, max_probes)번, 탐색마다 쿼리 1번(끝을 넘으면 2번)이므로
+      조회 횟수와 메모리 사용량은 테이블 크기와 무관
+    - id 간격 바로 뒤의 행은 조금 더 자주 뽑힘 (조회한 probe_size개 중에서 고르므로 간격 하나의 영향은 줄어듦)
+    """
+    if k <= 0:
+        return []
+
+    bounds = Recipe.objects.aggregate(min_id=Min("id"), max_id=Max("id"))
+    if bounds["min_id"] is None:
+        return []
+
+    picked = {}  # 이름 -> id
+    candidates = queryset.order_by("id").values_list("id", "CKG_NM")
+
+    for _ in range(min(k * 3, max_probes)):
+        if len(picked) >= k:
+            break
+
+        pivot = random.randint(bounds["min_id"], bounds["max_id"])
+        probe = candidates
+        if picked:
+            probe = probe.exclude(CKG_NM__in=list(picked))
+
+        rows = list(probe.filter(id__gte=pivot)[:probe_size])
+        if len(rows) < probe_size:
+            # 마지막 id를 넘어가면 앞쪽에서 이어서 탐색
+            rows += list(probe.filter(id__lt=pivot)[: probe_size - len(rows)])
+
+        if not rows:
+            # 조건에 맞는 레시피를 모두 뽑음
+            break
+
+        recipe_id, recipe_name = random.choice(rows)
+        picked[recipe_name] = recipe_id
+
+    return list(picked.values())
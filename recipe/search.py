@@ -0,0 +1,156 @@
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, Count, IntegerField, Max, Min, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+from .filters import apply_recipe_filters
+from .models import Ingredient, Recipe, RecipeIngredient, RecipeNameGram
+from .parsers import name_ngrams, normalize_ingredient_name
+
+# 관련도 점수: 메시지 전체가 이름에 포함 / 단어가 이름에 포함 / 단어가 재료에 포함
+PHRASE_SCORE = 4
+NAME_TERM_SCORE = 2
+INGREDIENT_TERM_SCORE = 1
+# 이보다 짧은 단어는 점수 계산에서 제외
+MIN_TERM_LENGTH = 2
+
+# 검색어 끝에 붙는 조사 ("김치로", "감자랑")
+JOSA_SUFFIXES = ("으로", "하고", "이랑", "로", "랑", "와", "과", "을", "를", "이", "가")
+
+
+def _josa_stem(name):
+    """끝의 조사를 뗀 형태 (조사가 없거나 MIN_TERM_LENGTH자보다 짧아지면 None)"""
+    for suffix in JOSA_SUFFIXES:
+        if name.endswith(suffix):
+            stem = name[: -len(suffix)]
+            return stem if len(stem) >= MIN_TERM_LENGTH else None
+    return None
+
+
+def ingredient_search_term(term, has_prefix):
+    """
+    재료 검색에 사용할 정규화된 검색어
+    - 검색어로 시작하는 재료가 없을 때만 끝의 조사를 뗀 형태 사용 ("김치로" -> "김치", "오이"는 그대로)
+    - 조사를 뗀 형태가 MIN_TERM_LENGTH자보다 짧으면 떼지 않음
+    - has_prefix(접두어): 그 접두어로 시작하는 재료가 있는지 확인하는 함수
+    """
+    name = normalize_ingredient_name(term)
+    stem = _josa_stem(name) if name else None
+    if stem is not None and not has_prefix(name):
+        return stem
+    return name
+
+
+def resolve_ingredient_terms(terms):
+    """
+    검색어들의 재료 검색어를 한 번에 결정 (ingredient_search_term 참고)
+    - 조사로 끝나는 검색어가 재료명의 접두어인지 재료명 인덱스로 쿼리 한 번에 확인 (검색어 수와 무관)
+    """
+    names = sorted(
+        {
+            name
+            for name in map(normalize_ingredient_name, terms)
+            if name and _josa_stem(name) is not None
+        }
+    )
+    matched = set()
+    if names:
+        any_prefix = Q()
+        for name in names:
+            any_prefix |= Q(name__startswith=name)
+        counts = Ingredient.objects.filter(any_prefix).aggregate(
+            **{
+                f"prefix_{index}": Count("id", filter=Q(name__startswith=name))
+                for index, name in enumerate(names)
+            }
+        )
+        matched = {
+            name for index, name in enumerate(names) if counts[f"prefix_{index}"]
+        }
+    return [ingredient_search_term(term, matched.__contains__) for term in terms]
+
+
+def use_fulltext_search():
+    """요리 이름 검색에 MySQL FULLTEXT(ngram) 인덱스를 사용할지 여부"""
+    backend = getattr(settings, "RECIPE_NAME_SEARCH_BACKEND", "auto")
+    if backend == "auto":
+        return connection.vendor == "mysql"
+    return backend == "fulltext"
+
+
+def _fulltext_score(message):
+    """CKG_NM FULLTEXT(ngram) 인덱스의 MATCH ... AGAINST 점수 (MySQL)"""
+    table = Recipe._meta.db_table
+    return RawSQL(
+        f"MATCH({table}.CKG_NM) AGAINST (%s IN NATURAL LANGUAGE MODE)", (message,)
+    )
+
+
+def _name_candidate_ids(message):
+    """이름이 메시지와 겹칠 수 있는 레시피 id 서브쿼리 (FULLTEXT 또는 bigram 색인 사용)"""
+    if use_fulltext_search():
+        return (
+            Recipe.objects.annotate(match=_fulltext_score(message))
+            .filter(match__gt=0)
+            .values("id")
+        )
+
+    grams = name_ngrams(message)
+    if not grams:
+        return None
+    return RecipeNameGram.objects.filter(gram__in=grams).values("recipe_id")
+
+
+def _score_when(condition, score):
+    return Case(
+        When(condition, then=Value(score)),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def rank_recipe_ids(message, terms, time_filters=None, serving_size=None, limit=5):
+    """
+    이름/재료 검색을 쿼리 한 번으로 처리 - 관련도 순, 이름 중복 없이 limit개 id 반환
+    - 후보: 이름 색인(bigram/FULLTEXT) 또는 재료 역색인에 걸린 레시피 (+ 조리시간/인분 필터)
+    - 점수: 메시지 전체가 이름에 포함 4점, 단어가 이름에 포함 2점, 단어가 재료에 포함 1점
+    - 같은 이름은 SQL에서 묶어 최고 점수와 가장 작은 id 하나만 사용
+    """
+    terms = [term for term in terms if len(term) >= MIN_TERM_LENGTH]
+    phrase = message.strip()
+
+    candidates = Q()
+    name_ids = _name_candidate_ids(message)
+    if name_ids is not None:
+        candidates |= Q(id__in=name_ids)
+
+    score = Value(0, output_field=IntegerField())
+    if phrase:
+        score += _score_when(Q(CKG_NM__icontains=phrase), PHRASE_SCORE)
+    for term, ingredient_term in zip(terms, resolve_ingredient_terms(terms)):
+        score += _score_when(Q(CKG_NM__icontains=term), NAME_TERM_SCORE)
+        if ingredient_term:
+            in_ingredients = Q(
+                id__in=RecipeIngredient.objects.filter(
+                    ingredient_id__in=Ingredient.objects.filter(
+                        name__startswith=ingredient_term
+                    ).values("id")
+                ).values("recipe_id")
+            )
+            candidates |= in_ingredients
+            score += _score_when(in_ingredients, INGREDIENT_TERM_SCORE)
+
+    if not candidates:
+        return []
+
+    queryset = apply_recipe_filters(
+        Recipe.objects.filter(candidates), time_filters, serving_size
+    )
+    rows = (
+        queryset.annotate(score=score)
+        .filter(score__gt=0)
+        .values("CKG_NM")
+        .annotate(best_score=Max("score"), first_id=Min("id"))
+        .order_by("-best_score", "first_id")[:limit]
+    )
+    return [row["first_id"] for row in rows]
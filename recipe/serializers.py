@@ -83,7 +83,8 @@ class RecipeDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Recipe
-        fields = "__all__"  # 모든 필드 추가
+        # 모든 필드 (노출/조회 기록, 가져오기 해시 같은 내부 관리용 필드 제외)
+        exclude = ["view_count", "last_shown_at", "content_hash"]
 
 
 class RefreshRecommendationSerializer(serializers.Serializer):
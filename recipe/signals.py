@@ -0,0 +1,28 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .catalog import catalog
+from .detail_cache import invalidate_recipe_detail
+from .indexing import index_recipes
+from .models import Recipe
+
+# 이 필드가 바뀐 경우에만 색인을 다시 만듦
+INDEXED_FIELDS = {"CKG_NM", "CKG_MTRL_CN"}
+
+
+@receiver(post_save, sender=Recipe)
+def update_recipe_indexes(sender, instance, created, update_fields=None, **kwargs):
+    """레시피 저장 시 검색 색인 갱신 (bulk_create는 index_recipes를 직접 호출)"""
+    if kwargs.get("raw"):
+        return
+    invalidate_recipe_detail([instance.pk])
+    catalog.refresh([instance.pk])
+    if update_fields is not None and not (set(update_fields) & INDEXED_FIELDS):
+        return
+    index_recipes([instance])
+
+
+@receiver(post_delete, sender=Recipe)
+def invalidate_deleted_recipe(sender, instance, **kwargs):
+    """삭제된 레시피의 상세 응답 캐시 삭제"""
+    invalidate_recipe_detail([instance.pk])
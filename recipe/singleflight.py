@@ -0,0 +1,149 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.db import connection
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 스레드 잠금만 사용
+    fcntl = None
+
+# 잠금 파일 대기 중 재시도 간격 (초)
+FILE_LOCK_POLL_INTERVAL = 0.05
+
+
+class SingleFlight:
+    """
+    키별 단일 실행 잠금 - 같은 키의 작업은 스레드/프로세스를 통틀어 한 번에 하나만 실행
+    - 같은 프로세스: 키별 threading.Lock
+    - 프로세스 간: MySQL이면 GET_LOCK/RELEASE_LOCK, 그 외에는 임시 디렉터리의 잠금 파일(fcntl)
+    """
+
+    def __init__(self, namespace):
+        self.namespace = namespace
+        self._locks = {}  # key -> [threading.Lock, 사용 중인 스레드 수]
+        self._guard = threading.Lock()
+        self._lock_dir = Path(tempfile.gettempdir()) / "recipick-locks"
+
+    @contextmanager
+    def lock(self, key, timeout=None):
+        """
+        키 잠금 획득 후 실행, 획득 여부(bool)를 yield
+        - timeout=None: 무기한 대기, 0: 대기하지 않음
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        local = self._acquire_local(key, timeout)
+        try:
+            if not local:
+                yield False
+                return
+
+            release = self._acquire_process(key, deadline)
+            try:
+                yield release is not None
+            finally:
+                if release is not None:
+                    release()
+        finally:
+            self._release_local(key, local)
+
+    def _acquire_local(self, key, timeout):
+        with self._guard:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+
+        if timeout is None:
+            acquired = entry[0].acquire()
+        else:
+            acquired = entry[0].acquire(timeout=max(timeout, 0))
+        return acquired
+
+    def _release_local(self, key, acquired):
+        with self._guard:
+            entry = self._locks[key]
+            if acquired:
+                entry[0].release()
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[key]
+
+    def _remaining(self, deadline):
+        return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+    def _acquire_process(self, key, deadline):
+        """프로세스 간 잠금 획득 - 성공하면 해제 함수, 시간 초과면 None"""
+        if connection.vendor == "mysql":
+            return self._acquire_mysql(key, deadline)
+        if fcntl is not None:
+            return self._acquire_file(key, deadline)
+        return lambda: None
+
+    def _acquire_mysql(self, key, deadline):
+        # MySQL 잠금 이름은 64자 제한
+        name = f"{self.namespace}:{key}"[:64]
+        remaining = self._remaining(deadline)
+        # GET_LOCK 타임아웃: 음수면 무기한 대기
+        wait_seconds = -1 if remaining is None else int(remaining)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT GET_LOCK(%s, %s)", [name, wait_seconds])
+            if cursor.fetchone()[0] != 1:
+                return None
+
+        def release():
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", [name])
+
+        return release
+
+    def _acquire_file(self, key, deadline):
+        """
+        키별 잠금 파일에 flock - 해제할 때 파일을 삭제하여 키마다 파일이 쌓이지 않음
+        - 잠근 뒤 경로의 파일이 그대로인지(inode) 확인하여, 다른 프로세스가 삭제한 파일을 잠근 경우 다시 시도
+        """
+        self._lock_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha1(f"{self.namespace}:{key}".encode("utf-8")).hexdigest()
+        path = self._lock_dir / f"{digest}.lock"
+        while True:
+            handle = open(path, "a+")
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                handle.close()
+                remaining = self._remaining(deadline)
+                if remaining is not None and remaining <= 0:
+                    return None
+                time.sleep(
+                    FILE_LOCK_POLL_INTERVAL
+                    if remaining is None
+                    else min(FILE_LOCK_POLL_INTERVAL, remaining)
+                )
+                continue
+
+            try:
+                current = os.stat(path).st_ino
+            except FileNotFoundError:
+                current = None
+            if current == os.fstat(handle.fileno()).st_ino:
+                break
+            # 잠금을 기다리는 사이 이전 소유자가 파일을 삭제함
+            handle.close()
+
+        def release():
+            # 잠금을 쥔 채로 삭제해야 다음 소유자가 새 파일을 만들어 잠금
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            fcntl.flock(handle, fcntl.LOCK_UN)
+            handle.close()
+
+        return release
+
+
+# 레시피별 조리 방법 생성 잠금
+instruction_flight = SingleFlight("recipick:instructions")
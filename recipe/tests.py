@@ -1,3 +1,555 @@
-from django.test import TestCase
+import json
+import tempfile
+from io import StringIO
+import threading
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import httpx
+import numpy as np
+import openai
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from . import llm, pregeneration
+from .activity import flush_activity
+from .catalog import RecipeCatalog, warm_catalog
+from .filters import apply_recipe_filters, parse_range
+from .generation import bulk_create_recipes, parse_recipe_batch
+from .importer import detect_encoding, import_recipes_csv
+from .llm_cache import LLMResponseCache
+from .models import Recipe
+from .pagination import decode_cursor, encode_cursor
+from .parsers import parse_cook_minutes, parse_ingredients, parse_servings
+from .pools import build_recipe_pools, recipe_pools
+from .sampling import MAX_PROBES, sample_recipe_ids
+from .search import rank_recipe_ids, resolve_ingredient_terms
+from .singleflight import SingleFlight, instruction_flight
+
+
+def create_recipe(name, cook_time="20분", servings="2인분", ingredients="두부 1모"):
+    return Recipe.objects.create(
+        CKG_NM=name,
+        CKG_MTRL_CN=ingredients,
+        CKG_TIME_NM=cook_time,
+        CKG_INBUN_NM=servings,
+    )
+
+
+class FilterPaginationTests(TestCase):
+    def setUp(self):
+        self.recipes = [create_recipe(f"레시피 {i}") for i in range(7)]
+        self.recipes.append(create_recipe("오래 걸리는 레시피", cook_time="2시간"))
+
+    def get_page(self, **params):
+        response = self.client.get("/api/recipes/filter/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cursor_round_trip(self):
+        """next 커서를 따라가면 조건에 맞는 레시피를 id 순서로 빠짐없이 한 번씩 반환"""
+        ids = []
+        params = {"cook_time": "-30", "limit": 3}
+        while True:
+            page = self.get_page(**params)
+            ids += [row["id"] for row in page["filtered_recipes"]]
+            if page["next"] is None:
+                break
+            params["cursor"] = page["next"]
+
+        self.assertEqual(ids, [recipe.id for recipe in self.recipes[:7]])
+
+    def test_cursor_encoding(self):
+        self.assertEqual(decode_cursor(encode_cursor(12345)), 12345)
+        for cursor in ["", "not-a-cursor", encode_cursor("12")]:
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
+    def test_invalid_cursor_returns_400(self):
+        response = self.client.get("/api/recipes/filter/", {"cursor": "잘못된커서"})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get("/api/recipes/filter/", {"limit": 0})
+        self.assertEqual(response.status_code, 400)
+
+    def test_ndjson_stream(self):
+        response = self.client.get(
+            "/api/recipes/filter/", {"format": "ndjson", "cook_time": "-30"}
+        )
+        self.assertEqual(response.status_code, 200)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            [json.loads(line)["id"] for line in lines],
+            [recipe.id for recipe in self.recipes[:7]],
+        )
+
+
+class RecipeDetailCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # 조회수는 모아서 저장하므로 테스트 DB가 남아 있을 때 반영
+        self.addCleanup(flush_activity)
+        self.recipe = create_recipe("된장찌개")
+        self.url = f"/api/recipes/{self.recipe.id}/"
+
+    def test_etag_not_modified(self):
+        """같은 ETag로 다시 요청하면 304, 레시피가 바뀌면 새 ETag로 200"""
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        etag = first["ETag"]
+
+        second = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b"")
+
+        self.recipe.CKG_NM = "차돌 된장찌개"
+        self.recipe.save()
+        third = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(third.status_code, 200)
+        self.assertNotEqual(third["ETag"], etag)
+        self.assertEqual(third.json()["recipe"]["CKG_NM"], "차돌 된장찌개")
+
+    def test_missing_recipe_returns_404(self):
+        response = self.client.get(f"/api/recipes/{self.recipe.id + 1}/")
+        self.assertEqual(response.status_code, 404)
+
+
+class RecipePoolTests(TestCase):
+    def setUp(self):
+        recipe_pools.reset()
+        self.addCleanup(recipe_pools.reset)
+        self.quick = create_recipe("계란후라이", cook_time="5분", servings="1인분")
+        self.slow = create_recipe("갈비찜", cook_time="2시간", servings="4인분")
+
+    def test_pools_are_not_used_before_build(self):
+        self.assertFalse(recipe_pools.is_built())
+
+    def test_sample_after_build(self):
+        build_recipe_pools(log=lambda message: None)
+        self.assertEqual(
+            set(recipe_pools.sample_ids(10)), {self.quick.id, self.slow.id}
+        )
+        self.assertEqual(recipe_pools.sample_ids(10, ["5분"], "1인분"), [self.quick.id])
+
+    def test_new_recipe_is_added_to_pools(self):
+        """풀을 만든 뒤 저장된 레시피는 다시 만들지 않아도 샘플링 대상에 포함"""
+        build_recipe_pools(log=lambda message: None)
+        added = create_recipe("간장계란밥", cook_time="5분", servings="1인분")
+        duplicate = create_recipe("계란후라이", cook_time="5분", servings="1인분")
+
+        sampled = recipe_pools.sample_ids(10, ["5분"], "1인분")
+        self.assertCountEqual(sampled, [self.quick.id, added.id])
+        self.assertNotIn(duplicate.id, sampled)
+
+
+class SingleFlightTests(TestCase):
+    def setUp(self):
+        self.flight = SingleFlight("recipick:test")
+
+    def try_lock_in_thread(self, key):
+        result = []
+
+        def attempt():
+            with self.flight.lock(key, timeout=0) as acquired:
+                result.append(acquired)
+
+        thread = threading.Thread(target=attempt)
+        thread.start()
+        thread.join()
+        return result[0]
+
+    def test_same_key_runs_once(self):
+        """같은 키는 잠금을 가진 쪽이 끝날 때까지 다른 스레드가 획득하지 못함"""
+        with self.flight.lock(1) as acquired:
+            self.assertTrue(acquired)
+            self.assertFalse(self.try_lock_in_thread(1))
+            self.assertTrue(self.try_lock_in_thread(2))
+        self.assertTrue(self.try_lock_in_thread(1))
+
+    def test_lock_file_is_removed(self):
+        """잠금 파일은 해제할 때 삭제되어 키마다 쌓이지 않음"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.flight._lock_dir = Path(directory.name)
+        for key in range(3):
+            with self.flight.lock(key) as acquired:
+                self.assertTrue(acquired)
+                self.assertEqual(len(list(self.flight._lock_dir.iterdir())), 1)
+        self.assertEqual(list(self.flight._lock_dir.iterdir()), [])
+
+
+@override_settings(
+    INSTRUCTION_PREGEN_SAVE_BATCH_SIZE=2, INSTRUCTION_PREGEN_SAVE_INTERVAL=60
+)
+class PregenerationTests(TestCase):
+    def test_results_are_saved_in_batches(self):
+        """끝난 결과를 모아서 저장하고, 저장한 레시피의 잠금은 바로 해제"""
+        recipes = [create_recipe(f"레시피 {i}") for i in range(5)]
+        save = pregeneration.save_instructions_batch
+        saved_batches = []
+
+        def checked_save(results):
+            saved_batches.append(sorted(results))
+            return save(results)
+
+        with mock.patch.object(
+            pregeneration,
+            "_request_instructions",
+            side_effect=lambda recipe: f"1. {recipe.CKG_NM} 만들기",
+        ), mock.patch.object(
+            pregeneration, "save_instructions_batch", side_effect=checked_save
+        ):
+            result = pregeneration.pregenerate_instructions(
+                concurrency=1, requests_per_minute=6000, log=lambda message: None
+            )
+
+        self.assertEqual(result, (5, 5, 0))
+        self.assertEqual([len(batch) for batch in saved_batches], [2, 2, 1])
+        self.assertFalse(Recipe.objects.filter(pregeneration.MISSING_INSTRUCTIONS))
+        for recipe in recipes:
+            with instruction_flight.lock(recipe.id, timeout=0) as acquired:
+                self.assertTrue(acquired)
+
+
+class SampleRecipeIdsTests(TestCase):
+    def test_names_are_unique_and_probes_are_capped(self):
+        """이름이 3개뿐이면 3개만 반환하고, 쿼리 수는 탐색 횟수 상한을 넘지 않음"""
+        Recipe.objects.bulk_create(
+            [
+                Recipe(CKG_NM=f"레시피 {i % 3}", CKG_MTRL_CN="두부 1모")
+                for i in range(300)
+            ]
+        )
+        with CaptureQueriesContext(connection) as context:
+            ids = sample_recipe_ids(Recipe.objects.all(), 5)
+
+        names = Recipe.objects.filter(id__in=ids).values_list("CKG_NM", flat=True)
+        self.assertEqual(len(ids), 3)
+        self.assertEqual(len(set(names)), 3)
+        self.assertLessEqual(len(context.captured_queries), 1 + 2 * MAX_PROBES)
+
+    def test_filtered_queryset(self):
+        recipe = create_recipe("갈비찜", cook_time="2시간")
+        create_recipe("계란후라이", cook_time="5분")
+        queryset = Recipe.objects.filter(cook_minutes__gte=60)
+        self.assertEqual(sample_recipe_ids(queryset, 5), [recipe.id])
+
+
+class LLMResponseCacheTests(TestCase):
+    def test_lru_eviction(self):
+        """가장 오래 사용하지 않은 항목부터 메모리에서 제거"""
+        cache = LLMResponseCache(max_entries=2)
+        cache.set("a", "A")
+        cache.set("b", "B")
+        self.assertEqual(cache.get("a"), "A")
+        cache.set("c", "C")
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "A")
+        self.assertEqual(cache.get("c"), "C")
+        self.assertEqual(cache.stats()["memory_entries"], 2)
+
+    def test_ttl_expiry(self):
+        cache = LLMResponseCache(ttl=60)
+        with mock.patch("recipe.llm_cache.time.time", return_value=1000.0):
+            cache.set("a", "A")
+        with mock.patch("recipe.llm_cache.time.time", return_value=1059.0):
+            self.assertEqual(cache.get("a"), "A")
+        with mock.patch("recipe.llm_cache.time.time", return_value=1061.0):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_disk_read_without_memory_lock(self):
+        """디스크에 저장된 응답은 재시작 후에도 조회되고, 디스크를 읽는 동안 메모리 잠금을 잡지 않음"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / "llm_cache.sqlite3"
+        LLMResponseCache(path=path).set("a", "A")
+
+        cache = LLMResponseCache(path=path)
+        load = cache._load
+        locked = []
+
+        def checked_load(key):
+            locked.append(cache._lock.locked())
+            return load(key)
+
+        with mock.patch.object(cache, "_load", side_effect=checked_load):
+            self.assertEqual(cache.get("a"), "A")
+            self.assertEqual(cache.get("a"), "A")
+        # 두 번째 조회는 메모리에서 처리
+        self.assertEqual(locked, [False])
+
+
+class RankRecipeIdsTests(TestCase):
+    def setUp(self):
+        self.kimchi = create_recipe("김치찌개", ingredients="김치 1컵|두부 1모")
+        self.tofu = create_recipe("두부조림", ingredients="두부 1모|간장 2큰술")
+        self.potato = create_recipe("감자볶음", ingredients="감자 2개")
+
+    def test_ranking_by_name_and_ingredients(self):
+        """이름에 포함된 단어가 재료에만 포함된 단어보다 높은 점수"""
+        ids = rank_recipe_ids("두부", ["두부"])
+        self.assertEqual(ids, [self.tofu.id, self.kimchi.id])
+
+    def test_query_count_does_not_grow_with_terms(self):
+        """조사가 붙은 검색어가 여러 개여도 재료 확인 쿼리 1번 + 검색 쿼리 1번"""
+        terms = ["김치랑", "두부를", "감자와", "간장이"]
+        with self.assertNumQueries(2):
+            ids = rank_recipe_ids(" ".join(terms), terms)
+        self.assertCountEqual(ids, [self.kimchi.id, self.tofu.id, self.potato.id])
+
+
+class RecipeCatalogTests(TestCase):
+    def setUp(self):
+        self.kimchi = create_recipe("김치찌개", ingredients="김치 1컵|두부 1모")
+        self.tofu = create_recipe("두부조림", cook_time="5분", ingredients="두부 1모")
+        self.duplicate = create_recipe(
+            "두부조림", cook_time="5분", ingredients="두부 1모"
+        )
+        self.squid = create_recipe("오징어볶음", ingredients="오징어 1마리")
+        self.catalog = RecipeCatalog()
+        self.catalog.load()
+
+    def test_sample_applies_filters_and_dedups_names(self):
+        [sampled] = self.catalog.sample_ids(5, ["5분 이내"])
+        self.assertIn(sampled, [self.tofu.id, self.duplicate.id])
+        self.assertEqual(len(self.catalog.sample_ids(5)), 3)
+
+    def test_search_matches_db_ranking(self):
+        """카탈로그 검색은 DB 검색(rank_recipe_ids)과 같은 순서"""
+        for message in ["두부", "김치로 찌개", "오이"]:
+            terms = message.split()
+            self.assertEqual(
+                self.catalog.search_ids(message, terms),
+                rank_recipe_ids(message, terms),
+            )
+
+    def test_refresh_replaces_ingredients_in_place(self):
+        """재료가 바뀐 레시피는 다시 적재하지 않고 해당 행만 교체"""
+        self.kimchi.CKG_MTRL_CN = "김치 1컵|돼지고기 200g"
+        self.kimchi.save()
+        self.catalog.refresh([self.kimchi.id])
+
+        with mock.patch.object(self.catalog, "load") as load:
+            self.assertEqual(
+                self.catalog.search_ids("", ["돼지고기"]), [self.kimchi.id]
+            )
+            self.assertEqual(self.catalog.search_ids("", ["두부"]), [self.tofu.id])
+        load.assert_not_called()
+        self.assertEqual(len(self.catalog), 4)
+        self.assertEqual(self.catalog.ingredient_pks.dtype, np.int64)
+
+    @override_settings(RECIPE_CATALOG_ENABLED=True, RECIPE_CATALOG_WARM_ON_START=True)
+    def test_warm_catalog_loads_before_first_request(self):
+        catalog = RecipeCatalog()
+        with mock.patch("recipe.catalog.catalog", catalog):
+            warm_catalog()
+        self.assertTrue(catalog.loaded)
+        self.assertEqual(len(catalog), 4)
+
+
+class NumericParserTests(TestCase):
+    def test_parse_cook_minutes(self):
+        cases = {
+            "30분": 30,
+            "2시간 이내": 120,
+            "1시간 30분": 90,
+            "1.5시간": 90,
+            "90분 이내": 90,
+            "30": 30,
+            "약간": None,
+            "": None,
+            None: None,
+        }
+        for value, expected in cases.items():
+            self.assertEqual(parse_cook_minutes(value), expected, value)
+
+    def test_parse_servings(self):
+        cases = {"4인분": 4, "6인분 이상": 6, "2": 2, "0": None, "여러명": None}
+        for value, expected in cases.items():
+            self.assertEqual(parse_servings(value), expected, value)
+
+    def test_parse_range(self):
+        self.assertEqual(parse_range("15-30"), (15, 30))
+        self.assertEqual(parse_range("30-"), (30, None))
+        self.assertEqual(parse_range("-15"), (None, 15))
+        self.assertEqual(parse_range("2"), (2, 2))
+        for value in ["", "30-15", "abc"]:
+            with self.assertRaises(ValueError):
+                parse_range(value)
+
+    def test_filters_use_parsed_columns(self):
+        """저장 시 채워진 cook_minutes/serving_count로 버킷 필터 적용"""
+        quick = create_recipe("계란후라이", cook_time="5분", servings="1인분")
+        create_recipe("갈비찜", cook_time="2시간", servings="4인분")
+        self.assertEqual((quick.cook_minutes, quick.serving_count), (5, 1))
+
+        queryset = apply_recipe_filters(Recipe.objects.all(), ["5분 이내"], "1인분")
+        self.assertEqual(list(queryset), [quick])
+
+
+class IngredientParsingTests(TestCase):
+    def test_parse_ingredients_strips_quantities(self):
+        value = "[재료] 어묵 2개| 당근 1/2개| 소금 약간| 돼지고기300g| 대파 (흰 부분) 1대| 어묵 1개"
+        self.assertEqual(
+            parse_ingredients(value), ["어묵", "당근", "소금", "돼지고기", "대파"]
+        )
+
+    def test_recipe_ingredients_are_indexed(self):
+        recipe = create_recipe("된장찌개", ingredients="된장 2큰술|애호박 1/2개")
+        self.assertCountEqual(
+            recipe.ingredient_links.values_list("ingredient__name", flat=True),
+            ["된장", "애호박"],
+        )
+
+    def test_josa_is_stripped_only_when_no_ingredient_matches(self):
+        """조사를 뗀 형태는 검색어로 시작하는 재료가 없을 때만 사용"""
+        create_recipe("김치볶음밥", ingredients="김치 1컵|감자가루 1큰술|무 1토막")
+        self.assertEqual(
+            resolve_ingredient_terms(["김치로", "감자가", "무를", "오이", "두부랑"]),
+            ["김치", "감자가", "무를", "오이", "두부"],
+        )
+
+
+class RecipeBatchParsingTests(TestCase):
+    def test_parse_recipe_batch(self):
+        """코드 블록/배열 값도 허용하고, 빈 선택 필드는 제외"""
+        content = """```json
+        {"recipes": [
+            {"CKG_NM": "두부조림", "CKG_MTRL_CN": ["두부 1모", "간장 2큰술"],
+             "CKG_TIME_NM": "20분", "CKG_METHOD_CN": ["두부를 썬다", "조린다"]},
+            {"CKG_NM": "계란찜", "CKG_MTRL_CN": "계란 3개", "CKG_INBUN_NM": ""}
+        ]}
+        ```"""
+        self.assertEqual(
+            parse_recipe_batch(content),
+            [
+                {
+                    "CKG_NM": "두부조림",
+                    "CKG_MTRL_CN": "두부 1모|간장 2큰술",
+                    "CKG_TIME_NM": "20분",
+                    "CKG_METHOD_CN": "두부를 썬다\n조린다",
+                },
+                {"CKG_NM": "계란찜", "CKG_MTRL_CN": "계란 3개"},
+            ],
+        )
+
+    def test_invalid_batch_raises_value_error(self):
+        for content in [
+            "레시피입니다",
+            '{"recipes": []}',
+            '["두부조림"]',
+            '[{"CKG_NM": "두부조림"}]',
+            '[{"CKG_NM": "두부조림", "CKG_MTRL_CN": {"두부": 1}}]',
+        ]:
+            with self.assertRaises(ValueError):
+                parse_recipe_batch(content)
+
+    def test_bulk_create_recipes_indexes_ingredients(self):
+        recipes = bulk_create_recipes(
+            [
+                Recipe(CKG_NM="두부조림", CKG_MTRL_CN="두부 1모", CKG_TIME_NM="20분"),
+                Recipe(CKG_NM="계란찜", CKG_MTRL_CN="계란 3개"),
+            ]
+        )
+        self.assertTrue(all(recipe.id for recipe in recipes))
+        self.assertEqual(recipes[0].cook_minutes, 20)
+        self.assertEqual(rank_recipe_ids("", ["계란"]), [recipes[1].id])
+
+
+def api_error(error_class, status, headers=None):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status, headers=headers, request=request)
+    return error_class("오류", response=response, body=None)
+
+
+@override_settings(LLM_MAX_RETRIES=2, LLM_RETRY_BASE_DELAY=0.5, LLM_RETRY_MAX_DELAY=8)
+class LLMRetryTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch("recipe.llm.time.sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_retries_transient_errors_with_retry_after(self):
+        request = mock.Mock(
+            side_effect=[
+                api_error(openai.RateLimitError, 429, {"retry-after": "3"}),
+                openai.APIConnectionError(request=httpx.Request("POST", "https://x")),
+                "응답",
+            ]
+        )
+        self.assertEqual(llm.call_with_retry(request), ("응답", 3))
+        self.assertEqual(self.sleep.call_count, 2)
+        # Retry-After 헤더가 있으면 그 값만큼 대기
+        self.assertEqual(self.sleep.call_args_list[0], mock.call(3.0))
+
+    def test_gives_up_after_max_retries(self):
+        error = api_error(openai.InternalServerError, 503)
+        request = mock.Mock(side_effect=error)
+        with self.assertRaises(openai.InternalServerError):
+            llm.call_with_retry(request)
+        self.assertEqual(request.call_count, 3)
+
+    def test_client_errors_are_not_retried(self):
+        request = mock.Mock(side_effect=api_error(openai.BadRequestError, 400))
+        with self.assertRaises(openai.BadRequestError):
+            llm.call_with_retry(request)
+        request.assert_called_once()
+        self.sleep.assert_not_called()
+
+    def test_backoff_is_capped(self):
+        """헤더가 없으면 0 ~ min(기본값 * 2^시도, 최대값) 사이의 지터"""
+        error = api_error(openai.InternalServerError, 500)
+        with mock.patch("recipe.llm.random.uniform", side_effect=lambda a, b: b):
+            delays = [llm._retry_delay(error, attempt) for attempt in range(6)]
+        self.assertEqual(delays, [0.5, 1.0, 2.0, 4.0, 8, 8])
+        with_header = api_error(openai.RateLimitError, 429, {"retry-after": "60"})
+        self.assertEqual(llm._retry_delay(with_header, 0), 8)
+
+
+class RecipeImportTests(TestCase):
+    CSV = (
+        "RCP_SNO,CKG_NM,CKG_MTRL_CN,CKG_INBUN_NM,CKG_TIME_NM,RCP_IMG_URL\n"
+        "1,김치찌개,김치 1컵|두부 1모,2인분,30분,a.jpg\n"
+        "2,김치찌개 ,김치 1컵|두부 1모,2인분,30분,b.jpg\n"
+        "3,,두부 1모,1인분,5분,\n"
+        "4,계란찜,계란 3개,1인분,15분,\n"
+        "5,김치찌개,김치 1컵|두부 1모,2인분,30분,c.jpg\n"
+    )
+
+    def write_csv(self, encoding):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / "recipes.csv"
+        path.write_text(self.CSV, encoding=encoding)
+        return path
+
+    def test_chunked_import_skips_duplicates_across_chunks(self):
+        """청크가 달라도 같은 내용(이미지 URL 제외)의 레시피는 한 번만 저장"""
+        path = self.write_csv("cp949")
+        self.assertEqual(detect_encoding(path), "cp949")
+
+        result = import_recipes_csv(path, chunk_size=2, log=lambda message: None)
+        self.assertEqual(result, (5, 2, 2, 1))
+        self.assertCountEqual(
+            Recipe.objects.values_list("CKG_NM", flat=True), ["김치찌개", "계란찜"]
+        )
+        self.assertEqual(
+            rank_recipe_ids("", ["계란"]), [Recipe.objects.get(CKG_NM="계란찜").id]
+        )
+
+    def test_reimport_is_idempotent(self):
+        path = self.write_csv("utf-8-sig")
+        self.assertEqual(detect_encoding(path), "utf-8-sig")
+        call_command("import_recipes", str(path), chunk_size=3, stdout=StringIO())
+
+        output = StringIO()
+        call_command("import_recipes", str(path), stdout=output)
+        self.assertIn(
+            "5행 중 0개 저장, 4개 중복, 1개 요리 이름 없음", output.getvalue()
+        )
+        self.assertEqual(Recipe.objects.count(), 2)
@@ -9,9 +9,16 @@ urlpatterns = [
     path("filter/", views.filter_recipes, name="recipe-filter"),
     path("<int:recipe_id>/", views.recipe_detail, name="recipe-detail"),
     path("recommend/refresh/", views.refresh_recommendations, name="recipe-refresh"),
+    path("llm-cache/stats/", views.llm_cache_stats, name="llm-cache-stats"),
+    path("pools/stats/", views.recipe_pool_stats, name="recipe-pool-stats"),
     path(
         "generate-instructions/<int:recipe_id>/",
         views.GenerateInstructionsView.as_view(),
         name="generate-instructions",
     ),
+    path(
+        "generate-instructions/<int:recipe_id>/stream/",
+        views.GenerateInstructionsStreamView.as_view(),
+        name="generate-instructions-stream",
+    ),
 ]
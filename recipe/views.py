@@ -1,18 +1,39 @@
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.conf import settings
-from django.db.models import Q
-import openai
+import json
+from .activity import record_shown, record_view
+from .catalog import get_catalog
+from .detail_cache import detail_headers, get_recipe_detail, is_not_modified
+from .filters import apply_recipe_filters, range_filter_q
+from . import llm
+from .generation import (
+    INSTRUCTIONS_PARAMS,
+    generate_missing_recipes,
+    get_or_generate_instructions,
+    instructions_messages,
+    load_stored_instructions,
+)
+from .listing import (
+    list_items_for_ids,
+    list_items_for_queryset,
+    list_items_for_recipes,
+)
+from .llm_cache import llm_cache
 from .models import Recipe
+from .pools import get_recipe_pools, recipe_pools
+from .pagination import decode_cursor, iter_keyset_batches, keyset_page
+from .sampling import sample_recipe_ids
+from .singleflight import instruction_flight
 import random
 from .serializers import (
     RecipeInputSerializer,
-    RecipeListSerializer,
     FilteredRecipeSerializer,
-    RecipeDetailSerializer,
     RefreshRecommendationSerializer,
 )
 
@@ -48,60 +69,46 @@ def recommend_recipes(request):
         # user_message에 search_query를 할당
         user_message = search_query
 
-        # 전체 레시피 데이터 조회
-        all_recipes = Recipe.objects.all()
-
-        # 필터 적용
-        if time_filters:
-            time_conditions = Q()
-            for time_filter in time_filters:
-                if time_filter == "5분 이내":
-                    time_conditions |= Q(CKG_TIME_NM__icontains="5분") | Q(
-                        CKG_TIME_NM__regex=r"^[1-5]분$"
-                    )
-                elif time_filter == "5~15분":
-                    time_conditions |= Q(CKG_TIME_NM__regex=r"^(([5-9]|1[0-5]))분$")
-                elif time_filter == "15~30분":
-                    time_conditions |= Q(CKG_TIME_NM__regex=r"^(1[5-9]|2[0-9]|30)분$")
-                elif time_filter == "30분 이상":
-                    time_conditions |= Q(
-                        CKG_TIME_NM__regex=r"^([3-9][0-9]|[1-9][0-9]{2,})분$"
-                    )
-
-            all_recipes = all_recipes.filter(time_conditions)
-
-        if serving_size:
-            if serving_size == "1인분":
-                all_recipes = all_recipes.filter(CKG_INBUN_NM__icontains="1인분")
-            elif serving_size == "2인분":
-                all_recipes = all_recipes.filter(CKG_INBUN_NM__icontains="2인분")
-            elif serving_size == "4인분":
-                all_recipes = all_recipes.filter(CKG_INBUN_NM__icontains="4인분")
-            elif serving_size == "6인분 이상":
-                all_recipes = all_recipes.filter(
-                    Q(CKG_INBUN_NM__regex=r"^([6-9]|[1-9][0-9]+)인분$")
+        pools = get_recipe_pools()
+        catalog = get_catalog()
+        if pools is not None:
+            # 버킷별 추천 풀에서 샘플링 (풀 사이 이름 중복을 제거할 수 있도록 넉넉히)
+            sampled_ids = pools.sample_ids(10, time_filters, serving_size)
+            # 풀을 다시 만들기 전에 조리시간/인분이 바뀐 레시피는 조회하면서 제외
+            candidates = list_items_for_queryset(
+                apply_recipe_filters(
+                    Recipe.objects.filter(id__in=sampled_ids),
+                    time_filters,
+                    serving_size,
                 )
+            )
+            order = {recipe_id: index for index, recipe_id in enumerate(sampled_ids)}
+            candidates.sort(key=lambda item: order[item["id"]])
+        else:
+            if catalog is not None:
+                # 메모리 카탈로그에서 샘플링
+                sampled_ids = catalog.sample_ids(5, time_filters, serving_size)
+            else:
+                # 필터 적용 (정규화된 숫자 컬럼의 범위 조건)
+                all_recipes = apply_recipe_filters(
+                    Recipe.objects.all(), time_filters, serving_size
+                )
+                # 필터링된 레시피에서 랜덤 선택 (id 범위 탐색, 전체 테이블을 불러오지 않음)
+                sampled_ids = sample_recipe_ids(all_recipes, 5)
+            candidates = list_items_for_ids(sampled_ids)
 
-        # 추천할 레시피 목록 (ID와 이름 중복 방지)
-        selected_recipes = []
-        selected_ids = set()
+        # 추천할 레시피 목록 (최종 5개만 목록 컬럼으로 조회, ID와 이름 중복 방지)
+        recipe_list = []
         selected_names = set()
-
-        # 필터링된 레시피에서 랜덤 선택
-        all_recipe_list = list(all_recipes)
-        random.shuffle(all_recipe_list)
-
-        for recipe in all_recipe_list:
-            if recipe.id not in selected_ids and recipe.CKG_NM not in selected_names:
-                selected_recipes.append(recipe)
-                selected_ids.add(recipe.id)
-                selected_names.add(recipe.CKG_NM)
-
-                if len(selected_recipes) >= 5:
-                    break
+        for item in candidates:
+            if len(recipe_list) < 5 and item["CKG_NM"] not in selected_names:
+                recipe_list.append(item)
+                selected_names.add(item["CKG_NM"])
+        selected_ids = {item["id"] for item in recipe_list}
+        record_shown(selected_ids)
 
         # 부족한 레시피 수 계산
-        missing_count = 5 - len(selected_recipes)
+        missing_count = 5 - len(recipe_list)
 
         # AI로 새 레시피 생성 (필터 조건 반영)
         if missing_count > 0:
@@ -120,116 +127,37 @@ def recommend_recipes(request):
 
             default_servings = serving_size if serving_size else "2인분"
 
-            # AI 레시피 생성 로직
-            for i in range(missing_count):
-
-                # AI로 새 레시피 생성
-                client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
-
-                prompt = f"""
-                '{user_message}'와 관련된 맛있는 음식 레시피를 하나만 생성해주세요.
-
-                조건:
-                - 조리 시간은 {default_time} 이내여야 합니다.
-                - 인분 수는 정확히 {default_servings}인분으로 설정해주세요.
-                - 재료의 양은 {default_servings}인분에 맞게 조절해주세요.
-
-                다음 형식으로 응답해 주세요:
-
-                CKG_NM: [요리 이름]
-                CKG_MTRL_CN: [사용된 재료 목록과 정확한 양(g, ml 등 단위 포함), 각 재료는 세로 막대(|)로 구분]
-                CKG_INBUN_NM: {default_servings}
-                CKG_TIME_NM: {default_time}
-                """
-
-                try:
-                    response = client.chat.completions.create(
-                        model=settings.GPT_MODEL_NAME,
-                        messages=[
-                            {
-                                "role": "system",
-                                "content": settings.SYSTEM_RECIPE_EXPERT,
-                            },
-                            {"role": "user", "content": prompt},
-                        ],
-                        temperature=0.7,
-                        max_tokens=500,
-                    )
-
-                    # 생성된 응답 파싱
-                    ai_recipe = response.choices[0].message.content
-                    recipe_data = {}
-
-                    # 줄별로 처리하여 필드 추출
-                    for line in ai_recipe.strip().split("\n"):
-                        if ":" in line:
-                            key, value = line.split(":", 1)
-                            key = key.strip()
-                            value = value.strip()
-                            recipe_data[key] = value
-
-                    # 레시피 이름 중복 확인
-                    recipe_name = recipe_data.get("CKG_NM", f"AI 추천 레시피 {i+1}")
-
-                    # 이름이 중복되지 않는 경우에만 저장
-                    if recipe_name not in selected_names:
-                        # 기본 이미지 URL 설정
-                        default_image_url = settings.DEFAULT_RECIPE_IMAGE_PATH
-
-                        # DB에 저장
-                        new_recipe = Recipe.objects.create(
-                            CKG_NM=recipe_name,
-                            CKG_MTRL_CN=recipe_data.get("CKG_MTRL_CN", ""),
-                            CKG_INBUN_NM=recipe_data.get(
-                                "CKG_INBUN_NM", default_servings
-                            ),
-                            CKG_TIME_NM=recipe_data.get(
-                                "CKG_TIME_NM", default_time if default_time else "30분"
-                            ),
-                            RCP_IMG_URL=default_image_url,
-                        )
-
-                        # 조리 방법 생성 및 저장
-                        instructions_prompt = f"""
-                        레시피 이름: {new_recipe.CKG_NM}
-                        필요한 재료: {new_recipe.CKG_MTRL_CN}
-                        조리 시간: {new_recipe.CKG_TIME_NM}
-                        인분: {new_recipe.CKG_INBUN_NM}
-                        
-                        위 레시피의 상세한 조리 방법을 단계별로 설명해주세요.
-                        """
-
-                        instructions_response = client.chat.completions.create(
-                            model=settings.GPT_MODEL_NAME,
-                            messages=[
-                                {
-                                    "role": "system",
-                                    "content": settings.SYSTEM_RECIPE_EXPERT,
-                                },
-                                {"role": "user", "content": instructions_prompt},
-                            ],
-                            temperature=0.7,
-                            max_tokens=1000,
-                        )
-
-                        # 조리 방법 저장
-                        new_recipe.CKG_METHOD_CN = instructions_response.choices[
-                            0
-                        ].message.content
-                        new_recipe.save()
-
-                        # 결과 목록에 추가
-                        selected_recipes.append(new_recipe)
-                        selected_names.add(recipe_name)
-
-                except Exception as e:
-                    print(f"레시피 생성 실패: {str(e)}")
-                    continue
-
-        # 직렬화 및 반환
-        serializer = RecipeListSerializer(selected_recipes, many=True)
-
-        return Response({"status": settings.STATUS_SUCCESS, "recipes": serializer.data})
+            prompt = f"""
+            '{user_message}'와 관련된 맛있는 음식 레시피를 하나만 생성해주세요.
+
+            조건:
+            - 조리 시간은 {default_time} 이내여야 합니다.
+            - 인분 수는 정확히 {default_servings}인분으로 설정해주세요.
+            - 재료의 양은 {default_servings}인분에 맞게 조절해주세요.
+
+            다음 형식으로 응답해 주세요:
+
+            CKG_NM: [요리 이름]
+            CKG_MTRL_CN: [사용된 재료 목록과 정확한 양(g, ml 등 단위 포함), 각 재료는 세로 막대(|)로 구분]
+            CKG_INBUN_NM: {default_servings}
+            CKG_TIME_NM: {default_time}
+            """
+
+            # AI 레시피 생성 (한 번에 일괄 생성, 실패하면 개별 동시 생성 / 이름 중복 없이)
+            new_recipes = generate_missing_recipes(
+                prompt,
+                user_message,
+                missing_count,
+                selected_names,
+                default_time if default_time else "30분",
+                default_servings,
+                fallback_name=lambda i: f"AI 추천 레시피 {i+1}",
+                time_filters=time_filters,
+                serving_size=serving_size,
+            )
+            recipe_list.extend(list_items_for_recipes(new_recipes))
+
+        return Response({"status": settings.STATUS_SUCCESS, "recipes": recipe_list})
     except Exception as e:
         return Response(
             {
@@ -240,25 +168,63 @@ def recommend_recipes(request):
         )
 
 
+class NDJSONRenderer(BaseRenderer):
+    """format=ndjson 요청의 오류 응답(400 등)을 JSON 한 줄로 렌더링"""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return (json.dumps(data, ensure_ascii=False) + "\n").encode(self.charset)
+
+
+# FilteredRecipeSerializer와 같은 필드, 같은 순서 (.values()로 바로 응답 생성)
+FILTER_FIELDS = tuple(FilteredRecipeSerializer.Meta.fields)
+
+
 @api_view(["GET"])
+@renderer_classes([JSONRenderer, NDJSONRenderer])
 def filter_recipes(request):
-    """조리시간, 인분 기준 레시피 필터링"""
+    """
+    조리시간(분), 인분 범위로 레시피 필터링 (id 기준 커서 페이지네이션)
+    - cook_time=10-30, servings=2 또는 2-4 (범위 한쪽 생략 가능: 30-, -15)
+    - limit: 페이지 크기, cursor: 이전 응답의 next (마지막 페이지면 next는 null)
+    - format=ndjson: cursor 이후 결과 전체를 한 줄에 한 레시피씩 스트리밍 (limit 무시)
+    """
     try:
-        cook_time = request.query_params.get("cook_time")
-        servings = request.query_params.get("servings")
-
         recipes = Recipe.objects.all()
 
+        cook_time = request.query_params.get("cook_time")
         if cook_time:
-            min_time, max_time = map(int, cook_time.split("-"))
-            recipes = recipes.filter(cook_time__gte=min_time, cook_time__lte=max_time)
+            recipes = recipes.filter(range_filter_q("cook_minutes", cook_time))
 
+        servings = request.query_params.get("servings")
         if servings:
-            recipes = recipes.filter(servings=int(servings))
+            recipes = recipes.filter(range_filter_q("serving_count", servings))
+
+        cursor = request.query_params.get("cursor")
+        after = decode_cursor(cursor) if cursor else None
+
+        if request.accepted_renderer.format == "ndjson":
+            return StreamingHttpResponse(
+                _ndjson_lines(recipes, after), content_type=NDJSONRenderer.media_type
+            )
+
+        limit = int(request.query_params.get("limit", settings.RECIPE_FILTER_PAGE_SIZE))
+        if limit < 1:
+            raise ValueError("limit은 1 이상이어야 합니다.")
+        limit = min(limit, settings.RECIPE_FILTER_MAX_PAGE_SIZE)
 
-        serializer = FilteredRecipeSerializer(recipes, many=True)
+        rows, next_cursor = keyset_page(recipes, FILTER_FIELDS, after, limit)
         return Response(
-            {"status": settings.STATUS_SUCCESS, "filtered_recipes": serializer.data}
+            {
+                "status": settings.STATUS_SUCCESS,
+                "filtered_recipes": rows,
+                "next": next_cursor,
+            }
         )
 
     except ValueError:
@@ -268,13 +234,31 @@ def filter_recipes(request):
         )
 
 
+def _ndjson_lines(recipes, after):
+    """keyset 배치 단위로 조회하여 배치마다 NDJSON 줄을 한 번에 전송"""
+    for rows in iter_keyset_batches(
+        recipes, FILTER_FIELDS, after, settings.RECIPE_FILTER_STREAM_BATCH_SIZE
+    ):
+        yield "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+
 @api_view(["GET"])
 def recipe_detail(request, recipe_id):
-    """특정 레시피 상세 정보 조회"""
+    """
+    특정 레시피 상세 정보 조회
+    - 직렬화된 응답은 캐시 (레시피 저장 시 무효화), ETag/Last-Modified 헤더 전송
+    - If-None-Match/If-Modified-Since가 일치하면 본문 없이 304
+    """
     try:
-        recipe = get_object_or_404(Recipe, id=recipe_id)
-        serializer = RecipeDetailSerializer(recipe)
-        return Response({"status": settings.STATUS_SUCCESS, "recipe": serializer.data})
+        entry = get_recipe_detail(recipe_id)
+        record_view(recipe_id)
+        headers = detail_headers(entry)
+        if is_not_modified(request, entry):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(
+            {"status": settings.STATUS_SUCCESS, "recipe": entry["recipe"]},
+            headers=headers,
+        )
     except Recipe.DoesNotExist:
         return Response(
             {
@@ -306,13 +290,13 @@ def refresh_recommendations(request):
 
     try:
         user_id = serializer.validated_data["user_id"]
-        recipes = Recipe.objects.all()[:5]
+        recipes = list_items_for_queryset(Recipe.objects.all()[:5])
 
         return Response(
             {
                 "status": settings.STATUS_SUCCESS,
                 "message": "새로운 추천 리스트가 생성되었습니다.",
-                "recipes": RecipeListSerializer(recipes, many=True).data,
+                "recipes": recipes,
             }
         )
     except Exception as e:
@@ -330,51 +314,15 @@ class GenerateInstructionsView(APIView):
         try:
             recipe = get_object_or_404(Recipe, id=recipe_id)
 
-            # 1. 데이터베이스에서 조리 방법 확인
-            if recipe.CKG_METHOD_CN:
-                return Response(
-                    {
-                        "status": settings.STATUS_SUCCESS,
-                        "recipe_name": recipe.CKG_NM,
-                        "instructions": recipe.CKG_METHOD_CN,
-                        "source": "database",
-                    }
-                )
-
-            # 2. 데이터베이스에 없는 경우 GPT로 생성
-            client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
-
-            prompt = f"""
-            레시피 이름: {recipe.CKG_NM}
-            필요한 재료: {recipe.CKG_MTRL_CN}
-            조리 시간: {recipe.CKG_TIME_NM}
-            인분: {recipe.CKG_INBUN_NM}
-            
-            위 레시피의 상세한 조리 방법을 단계별로 설명해주세요.
-            """
-
-            response = client.chat.completions.create(
-                model=settings.GPT_MODEL_NAME,
-                messages=[
-                    {"role": "system", "content": settings.SYSTEM_RECIPE_EXPERT},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.7,
-                max_tokens=1000,
-            )
-
-            instructions = response.choices[0].message.content
-
-            # 생성된 레시피를 데이터베이스에 저장
-            recipe.CKG_METHOD_CN = instructions
-            recipe.save()
+            # 데이터베이스에 없으면 GPT로 생성 (같은 레시피 동시 요청은 한 번만 생성)
+            instructions, source = get_or_generate_instructions(recipe)
 
             return Response(
                 {
                     "status": settings.STATUS_SUCCESS,
                     "recipe_name": recipe.CKG_NM,
                     "instructions": instructions,
-                    "source": "ai",
+                    "source": source,
                 }
             )
 
@@ -393,6 +341,108 @@ class GenerateInstructionsView(APIView):
             )
 
 
+def sse_event(data, event=None):
+    """Server-Sent Events 메시지 한 건 (data는 JSON으로 인코딩하여 줄바꿈 보존)"""
+    message = f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+    if event:
+        message = f"event: {event}\n{message}"
+    return message
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Accept: text/event-stream 요청의 오류 응답(404 등)을 SSE 'error' 이벤트로 렌더링"""
+
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return sse_event(data, event="error").encode(self.charset)
+
+
+class GenerateInstructionsStreamView(APIView):
+    """
+    조리 방법 스트리밍 생성 (SSE)
+    - 모델이 토큰을 생성하는 대로 'data: {"delta": ...}' 이벤트로 전달
+    - 생성이 끝나면 CKG_METHOD_CN을 저장하고 'done' 이벤트로 전체 조리 방법 전달
+    - 이미 저장된 조리 방법이 있으면 'done' 이벤트만 바로 전달
+    """
+
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
+
+    def get(self, request, recipe_id):
+        recipe = get_object_or_404(Recipe, id=recipe_id)
+        response = StreamingHttpResponse(
+            self._stream(recipe), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # nginx 등 프록시의 응답 버퍼링 방지
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def _stream(self, recipe):
+        if not recipe.CKG_METHOD_CN:
+            # 같은 레시피를 다른 요청이 생성 중이면 끝날 때까지 기다렸다가 저장된 결과 사용
+            with instruction_flight.lock(
+                recipe.id, timeout=settings.INSTRUCTION_LOCK_TIMEOUT
+            ):
+                recipe.CKG_METHOD_CN = load_stored_instructions(recipe)
+                if not recipe.CKG_METHOD_CN:
+                    yield from self._stream_generated(recipe)
+                    return
+
+        yield sse_event(
+            {
+                "recipe_name": recipe.CKG_NM,
+                "instructions": recipe.CKG_METHOD_CN,
+                "source": "database",
+            },
+            event="done",
+        )
+
+    def _stream_generated(self, recipe):
+        parts = []
+        try:
+            for delta in llm.stream_chat(
+                instructions_messages(recipe), **INSTRUCTIONS_PARAMS
+            ):
+                parts.append(delta)
+                yield sse_event({"delta": delta})
+
+            # 스트림이 끝난 뒤 조리 방법만 저장
+            recipe.CKG_METHOD_CN = "".join(parts)
+            recipe.save(update_fields=["CKG_METHOD_CN", "updated_at"])
+        except Exception as e:
+            print(f"조리 방법 스트리밍 실패: {str(e)}")
+            yield sse_event(
+                {"status": settings.STATUS_ERROR, "message": str(e)}, event="error"
+            )
+            return
+
+        yield sse_event(
+            {
+                "recipe_name": recipe.CKG_NM,
+                "instructions": recipe.CKG_METHOD_CN,
+                "source": "ai",
+            },
+            event="done",
+        )
+
+
+@api_view(["GET"])
+def llm_cache_stats(request):
+    """LLM 응답 캐시 적중/실패 통계 (현재 프로세스 기준)"""
+    return Response({"status": settings.STATUS_SUCCESS, "cache": llm_cache.stats()})
+
+
+@api_view(["GET"])
+def recipe_pool_stats(request):
+    """추천 레시피 풀별 크기와 생성/수정 시각 (풀을 만들기 전이면 built: false)"""
+    return Response({"status": settings.STATUS_SUCCESS, "pools": recipe_pools.stats()})
+
+
 def get_recipe_image_url(recipe):
     """레시피의 이미지 URL을 반환, 없으면 기본 이미지 반환"""
     if recipe.RCP_IMG_URL and recipe.RCP_IMG_URL.strip():
@@ -1,20 +1,62 @@
+import json
 import requests
 import streamlit as st
 import re
 from django.conf import settings
 
 
+# 레시피 상세 API 호출 (이전에 받은 응답이 있으면 ETag로 확인하여 바뀌지 않았으면 재사용)
+def fetch_recipe_detail(recipe_id):
+    cache = st.session_state.setdefault("recipe_detail_cache", {})
+    cached = cache.get(recipe_id)
+    headers = {"If-None-Match": cached["etag"]} if cached else {}
+
+    response = requests.get(
+        f"http://localhost:8000/api/recipes/{recipe_id}/", headers=headers
+    )
+    if cached and response.status_code == 304:
+        return json.loads(cached["body"])
+    response.raise_for_status()
+    if response.headers.get("ETag"):
+        cache[recipe_id] = {"etag": response.headers["ETag"], "body": response.text}
+    return response.json()
+
+
 # 레시피 정보를 API로부터 가져오는 함수
 def get_recipe(recipe_id):
     try:
-        response = requests.get(f"http://localhost:8000/api/recipes/{recipe_id}/")
-        response.raise_for_status()
-        return response.json()  # JSON 형태로 응답 반환
+        return fetch_recipe_detail(recipe_id)  # JSON 형태로 응답 반환
     except requests.exceptions.RequestException as e:
         st.error(f"레시피를 불러오는 데 실패했습니다: {str(e)}")
         return None  # 실패 시 None 반환
 
 
+# 조리 방법을 SSE 스트림으로 받아 생성되는 대로 조각(텍스트)을 반환하는 함수
+def stream_instructions(recipe_id):
+    with requests.get(
+        f"http://localhost:8000/api/recipes/generate-instructions/{recipe_id}/stream/",
+        headers={"Accept": "text/event-stream"},
+        stream=True,
+    ) as response:
+        response.raise_for_status()
+        event = None
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event = line[len("event:") :].strip()
+            elif line.startswith("data:"):
+                data = json.loads(line[len("data:") :])
+                if event == "error":
+                    raise RuntimeError(data.get("message") or data.get("detail"))
+                if event == "done":
+                    # DB에 저장되어 있던 조리 방법은 한 번에 전달됨
+                    if data.get("source") == "database":
+                        yield data.get("instructions", "")
+                    return
+                yield data.get("delta", "")
+            elif not line:
+                event = None
+
+
 # 세션 상태 초기화 (메시지, 선택된 레시피 정보)
 if "messages" not in st.session_state:
     st.session_state.messages = []
@@ -100,25 +142,13 @@ for message_idx, message in enumerate(st.session_state.messages):
                     ):  # 컨테이너 너비 사용
                         with st.spinner("레시피 정보를 불러오는 중입니다..."):
                             try:
-                                recipe_response = requests.get(
-                                    f"http://localhost:8000/api/recipes/{recipe['id']}/"
-                                )
-                                recipe_response.raise_for_status()
-                                recipe_data = recipe_response.json()
+                                recipe_data = fetch_recipe_detail(recipe["id"])
 
                                 # recipe_data에서 실제 레시피 데이터 추출
                                 recipe_detail = recipe_data.get("recipe", {})
+                                recipe_detail.setdefault("id", recipe["id"])
 
-                                # AI로 조리방법 생성 요청
-                                instructions_response = requests.get(
-                                    f"http://localhost:8000/api/recipes/generate-instructions/{recipe['id']}/"
-                                )
-                                if instructions_response.status_code == 200:
-                                    instructions_data = instructions_response.json()
-                                    recipe_detail["CKG_METHOD_CN"] = (
-                                        instructions_data.get("instructions", "")
-                                    )
-
+                                # 조리 방법은 상세 화면에서 스트리밍으로 생성 (아래 참고)
                                 # 직접 recipe_detail 할당
                                 st.session_state.selected_recipe = recipe_detail
                                 st.experimental_rerun()
@@ -159,7 +189,14 @@ if st.session_state.selected_recipe:
     st.header("🔸 만드는 법")
     # DB 컬럼 CKG_METHOD_CN 사용 (조리 방법, AI 생성)
     instructions = recipe.get("CKG_METHOD_CN", "")
-    if instructions:
+    if not instructions and recipe.get("id"):
+        # 조리 방법이 없으면 AI가 생성하는 대로 바로 표시 (SSE 스트리밍)
+        try:
+            instructions = st.write_stream(stream_instructions(recipe["id"]))
+            recipe["CKG_METHOD_CN"] = instructions
+        except Exception as e:
+            st.error(f"조리 방법을 불러오는데 실패했습니다: {str(e)}")
+    elif instructions:
         lines = instructions.split("\n")
 
         for line in lines: